@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Benchmark: reading and writing big progress CSVs, DictReader/DictWriter (as
+# before the bulk path) vs flix2flix.csvio, with and without pyarrow. The bundled
+# CSVs (22-column export, 4-column progress file) are repeated up to --rows.
+#
+#   python3 benchmarks/bench_csvio.py [--rows 100000] [--lang es] [--repeat 3]
+import argparse, csv, filecmp, itertools, sys, tempfile, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from flix2flix import csvio, get_profile
+
+INPUTS = ["netflix_mylist.csv", "netflix_mylist_actualizado.csv"]
+
+def grow(src: Path, rows: int, dst: Path) -> Path:
+    with src.open("r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header, body = next(reader), list(reader)
+    with dst.open("w", encoding="utf-8-sig", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(itertools.islice(itertools.cycle(body), rows))
+    return dst
+
+# ---------- legacy implementation (DictReader + each profile's read_row) ----------
+def legacy_row_en(row):
+    return {
+        "title": row.get("title") or row.get("titulo", ""),
+        "id": row.get("id", ""),
+        "url": row.get("url", ""),
+        "seen": row.get("seen") or row.get("visto", ""),
+        "removed": row.get("removed") or row.get("eliminado", "")
+    }
+
+LEGACY_READ_ROW = {"en": legacy_row_en, "es": dict}
+
+def legacy_read(path: Path, profile) -> list:
+    read_row = LEGACY_READ_ROW[profile.lang]
+    with path.open("r", encoding="utf-8-sig", newline="") as f:
+        return [read_row(row) for row in csv.DictReader(f)]
+
+def legacy_write(items, path: Path, profile, fields):
+    with path.open("w", encoding=profile.csv_encoding, newline="") as f:
+        w = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        w.writeheader()
+        for it in items: w.writerow(it)
+
+def best(fn, repeat: int):
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t)
+    return min(times), result
+
+def main():
+    ap = argparse.ArgumentParser(description="Bulk CSV read/write benchmark")
+    ap.add_argument("--rows", type=int, default=100000)
+    ap.add_argument("--lang", default="es", choices=["en", "es"])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    profile = get_profile(args.lang)
+    arrow = csvio._arrow_columns
+    csvio.ARROW_MIN_BYTES = 0  # pyarrow on any size, to compare the two readers
+
+    print(f"{'input':<42}{'step':<14}{'legacy s':>10}{'csvio s':>10}{'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for name in INPUTS:
+            src = grow(ROOT / name, args.rows, tmp / name)
+            header = next(csv.reader(src.open(encoding="utf-8-sig", newline="")))
+            label = f"{name} ({len(header)} cols)"
+            old_t, old = best(lambda: legacy_read(src, profile), args.repeat)
+            for engine in ("pyarrow", "csv module"):
+                if engine == "csv module": csvio._arrow_columns = lambda *a: None
+                elif arrow(src, header, None, header) is None: continue  # not installed
+                new_t, new = best(lambda: csvio.read_items_from_csv(src, profile), args.repeat)
+                assert [{k: v for k, v in it.items() if k in r} for it, r in zip(new, old)] == old, "rows differ"
+                print(f"{label:<42}{'read ' + engine:<14}{old_t:>10.3f}{new_t:>10.3f}{old_t / new_t:>8.1f}x")
+            csvio._arrow_columns = arrow
+
+            fields = list(old[0])
+            old_t, _ = best(lambda: legacy_write(old, tmp / "legacy.csv", profile, fields), args.repeat)
+            new_t, _ = best(lambda: csvio.write_csv(old, tmp / "new.csv", profile, fields), args.repeat)
+            assert filecmp.cmp(tmp / "legacy.csv", tmp / "new.csv", shallow=False), "write_csv output differs"
+            print(f"{label:<42}{'write_csv':<14}{old_t:>10.3f}{new_t:>10.3f}{old_t / new_t:>8.1f}x")
+            columns = csvio.read_columns(src, profile)
+            new_t, _ = best(lambda: csvio.write_columns(columns, tmp / "cols.csv", profile, fields), args.repeat)
+            assert filecmp.cmp(tmp / "legacy.csv", tmp / "cols.csv", shallow=False), "write_columns output differs"
+            print(f"{label:<42}{'write_columns':<14}{old_t:>10.3f}{new_t:>10.3f}{old_t / new_t:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Micro-benchmark: per-card cost of ctx decoding + video-id + tctx extraction,
+# legacy inline re.search/urlparse/parse_qs code vs flix2flix.extract.
+#
+#   python3 benchmarks/bench_extract.py [--csv netflix_mylist.csv] [--dup 3] [--repeat 7]
+import argparse, csv, json, re, sys, timeit
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs, unquote, quote
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from flix2flix import extract as fast
+
+CTX_KEYS = ["list_id", "location", "rank", "row", "track_id", "request_id",
+            "lolomo_id", "image_key", "supp_video_id", "appView"]
+
+# ---------- legacy implementation (as in V3 of both scripts) ----------
+def legacy_parse_ctx(raw_ctx):
+    if not raw_ctx: return {}
+    try:
+        return json.loads(unquote(raw_ctx))
+    except Exception:
+        try:
+            return json.loads(unquote(unquote(raw_ctx)))
+        except Exception:
+            return {}
+
+def legacy_extract_video_id(href, unified_entity_id, ctx):
+    vid = str(ctx.get("video_id") or "").strip()
+    if vid.isdigit(): return vid
+    if unified_entity_id:
+        m = re.search(r":(\d+)$", unified_entity_id)
+        if m: return m.group(1)
+    if href:
+        m = re.search(r"/watch/(\d+)", href)
+        if m: return m.group(1)
+    return ""
+
+def legacy_card(raw, href, unified):
+    ctx = legacy_parse_ctx(raw)
+    vid = legacy_extract_video_id(href, unified, ctx)
+    try:
+        tctx = parse_qs(urlparse(href).query).get("tctx", [None])[0]
+    except Exception:
+        tctx = None
+    return vid, tctx
+
+def fast_card(raw, href, unified):
+    ctx = fast.parse_ctx(raw)
+    return fast.extract_video_id(href, unified, ctx), fast.extract_tctx(href)
+
+# ---------- inputs ----------
+def load_cards(csv_path: Path) -> list:
+    """Rebuild the per-card attribute values of a saved page from the bundled CSV."""
+    cards = []
+    with csv_path.open("r", encoding="utf-8-sig", newline="") as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            ctx = {k: row.get(k, "") for k in CTX_KEYS}
+            ctx["unifiedEntityId"] = row.get("unifiedEntityId", "")
+            if i % 3:  # a share of cards only carry the id in unifiedEntityId / href
+                ctx["video_id"] = int(row["id"]) if row.get("id", "").isdigit() else row.get("id", "")
+            raw = quote(json.dumps(ctx))
+            if i % 5 == 0: raw = quote(raw)  # double-encoded blobs take the slow path in legacy code
+            cards.append((raw, row.get("href_original", ""), ctx["unifiedEntityId"]))
+    return cards
+
+def bench(fn, cards, repeat, reset=None) -> float:
+    def run():
+        if reset: reset()
+        for raw, href, unified in cards:
+            fn(raw, href, unified)
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / len(cards) * 1e6
+
+def main():
+    ap = argparse.ArgumentParser(description="Per-card extraction micro-benchmark")
+    ap.add_argument("--csv", type=Path, default=ROOT / "netflix_mylist.csv")
+    ap.add_argument("--dup", type=int, default=3, help="Times each card repeats in the 'duplicated' run")
+    ap.add_argument("--repeat", type=int, default=7)
+    args = ap.parse_args()
+
+    cards = load_cards(args.csv)
+    for a, b in zip(map(lambda c: legacy_card(*c), cards), map(lambda c: fast_card(*c), cards)):
+        assert a == b, (a, b)
+
+    dup = cards * args.dup
+    rows = [
+        ("unique blobs", cards, bench(legacy_card, cards, args.repeat),
+         bench(fast_card, cards, args.repeat, reset=fast.parse_ctx.cache_clear)),
+        (f"each blob x{args.dup}", dup, bench(legacy_card, dup, args.repeat),
+         bench(fast_card, dup, args.repeat, reset=fast.parse_ctx.cache_clear)),
+    ]
+    print(f"{'input':<16}{'cards':>7}{'legacy us/card':>16}{'fast us/card':>14}{'speedup':>9}")
+    for name, cs, old, new in rows:
+        print(f"{name:<16}{len(cs):>7}{old:>16.2f}{new:>14.2f}{old / new:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
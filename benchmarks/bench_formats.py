@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Benchmark: size, write and read time of a big list in each --format (see
+# flix2flix/formats.py). The list is parsed from a synthetic page of --rows
+# titles (synth_mylist.py), so ids, request ids, image URLs... vary like in a
+# real export. Every format must read back the same rows as the CSV.
+#
+#   python3 benchmarks/bench_formats.py [--rows 100000] [--lang es] [--repeat 3]
+import argparse, sys, tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+import synth_mylist
+from bench_csvio import best
+from flix2flix import formats, get_profile, parse_html_file
+
+def main():
+    ap = argparse.ArgumentParser(description="List format size/speed benchmark")
+    ap.add_argument("--rows", type=int, default=100000)
+    ap.add_argument("--lang", default="es", choices=["en", "es"])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    profile = get_profile(args.lang)
+
+    print(f"{'format':<10}{'size MB':>9}{'vs csv':>8}{'write s':>9}{'read s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        synth_mylist.write_page(tmp / "list.html", args.rows)
+        items = parse_html_file(tmp / "list.html", lang=args.lang, engine="stream")
+        fields = profile.fields
+        csv_size = csv_rows = None
+        for fmt in formats.FORMATS:
+            if formats.missing_modules(fmt):
+                print(f"{fmt:<10}  (pip install {' '.join(formats.missing_modules(fmt))})")
+                continue
+            out = tmp / ("list" + formats.SUFFIXES[fmt])
+            write_t, _ = best(lambda: sum(1 for _ in formats.iter_write_items(items, out, profile, fields, fmt)),
+                              args.repeat)
+            read_t, back = best(lambda: formats.read_items(out, profile), args.repeat)
+            csv_rows = csv_rows or back
+            assert back == csv_rows, f"{fmt} reads back different rows"
+            size = out.stat().st_size
+            csv_size = csv_size or size
+            print(f"{fmt:<10}{size / 1e6:>9.1f}{size / csv_size:>8.2f}{write_t:>9.2f}{read_t:>8.2f}")
+
+if __name__ == "__main__":
+    main()
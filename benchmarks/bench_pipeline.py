@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# End-to-end pipeline benchmark on synthetic pages (synth_mylist.py): wall time,
+# peak RSS and items/sec of each stage (parse, write_csv, write_viewer_html),
+# per page size, profile and parser backend. Every case runs in a fresh
+# interpreter so peak RSS is its own; results go to stdout as a table and,
+# with --json, to a file that later runs can be compared against.
+#
+#   python3 benchmarks/bench_pipeline.py [--sizes 1000,10000,100000] [--json results.json] [--compare old.json]
+#   python3 benchmarks/bench_pipeline.py --sizes 1000 --filler-kb 8000 --backends stream,stream+prefilter
+import argparse, json, platform, subprocess, sys, tempfile, time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+import synth_mylist
+
+STAGES = ("parse", "write_csv", "write_viewer_html")
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def peak_rss_mb():
+    if resource is None: return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)  # bytes on macOS, KB elsewhere
+
+def available_backends() -> list:
+    from flix2flix import core
+    return ["stream"] + core.available_parsers()
+
+def iter_cards(page: Path, backend: str, profile):
+    from flix2flix import core
+    backend, _, option = backend.partition("+")
+    engine, parser = ("stream", "auto") if backend == "stream" else ("bs4", backend)
+    return core.iter_page_cards(page, engine=engine, parser=parser, watch_fallback=profile.watch_fallback,
+                                prefilter=option == "prefilter")
+
+def run_case(page: Path, backend: str, lang: str, out_dir: Path) -> dict:
+    """Runs in the child: every stage on its own, so their costs don't blur together."""
+    from flix2flix import csvio, get_profile, viewer
+    profile = get_profile(lang)
+    result = {"rss_start_mb": peak_rss_mb(), "stages": {}}
+
+    def timed(name, fn, n=None):
+        t = time.perf_counter()
+        value = fn()
+        secs = time.perf_counter() - t
+        n = len(value) if n is None else n
+        result["stages"][name] = {"seconds": round(secs, 4), "items_per_sec": round(n / secs) if secs else None,
+                                  "peak_rss_mb": peak_rss_mb()}
+        return value
+
+    items = timed("parse", lambda: list(profile.iter_items(iter_cards(page, backend, profile))))
+    timed("write_csv", lambda: csvio.write_csv(items, out_dir / f"{lang}.csv", profile), len(items))
+    timed("write_viewer_html", lambda: viewer.write_viewer_html(items, out_dir / f"{lang}.html", profile), len(items))
+    result["items"] = len(items)
+    return result
+
+def spawn_case(page: Path, backend: str, lang: str, out_dir: Path) -> dict:
+    cmd = [sys.executable, __file__, "--case", str(page), backend, lang, str(out_dir)]
+    r = subprocess.run(cmd, capture_output=True, text=True, cwd=ROOT)
+    if r.returncode != 0:
+        return {"error": r.stderr.strip().splitlines()[-1] if r.stderr.strip() else f"exit {r.returncode}"}
+    return json.loads(r.stdout)
+
+def compare(report: dict, baseline: dict, threshold: float):
+    """Stage times against an earlier --json run; slower than threshold x is flagged."""
+    key = lambda r: (r["titles"], r["lang"], r["backend"])
+    old = {key(r): r for r in baseline["results"] if "stages" in r}
+    print(f"\nvs {baseline.get('commit') or '?'} ({baseline.get('date', '?')}), time ratio new/old:")
+    for r in report["results"]:
+        if "stages" not in r or key(r) not in old: continue
+        ratios = [r["stages"][s]["seconds"] / max(old[key(r)]["stages"][s]["seconds"], 1e-9) for s in STAGES]
+        flag = "  <- slower" if max(ratios) > threshold else ""
+        print(f"{r['titles']:>7}  {r['lang']:<4} {r['backend']:<20}" + "".join(f"{x:>24.2f}" for x in ratios) + flag)
+
+def git_commit() -> str:
+    r = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=ROOT)
+    return r.stdout.strip() or None
+
+def main():
+    if sys.argv[1:2] == ["--case"]:
+        page, backend, lang, out_dir = sys.argv[2:6]
+        print(json.dumps(run_case(Path(page), backend, lang, Path(out_dir))))
+        return
+
+    ap = argparse.ArgumentParser(description="Pipeline benchmark on synthetic My List pages")
+    ap.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated title counts")
+    ap.add_argument("--backends", default=",".join(available_backends()),
+                    help="Comma-separated: stream and/or --parser names (html.parser, lxml, html5lib, selectolax), "
+                         "each optionally with +prefilter (e.g. stream+prefilter)")
+    ap.add_argument("--langs", default="en,es", help="Profiles to run")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--filler-kb", type=int, default=0, help="KB of inline scripts per page (real exports are mostly that)")
+    ap.add_argument("--json", type=Path, help="Write the results here as JSON")
+    ap.add_argument("--compare", type=Path, help="An earlier --json file to compare against")
+    ap.add_argument("--threshold", type=float, default=1.2, help="Flag stages slower than this ratio")
+    args = ap.parse_args()
+
+    from flix2flix import __version__
+    report = {"version": __version__, "commit": git_commit(), "python": platform.python_version(),
+              "platform": platform.platform(), "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+              "results": []}
+    backends, langs = args.backends.split(","), args.langs.split(",")
+    print(f"{'titles':>7} {'MB':>6}  {'lang':<4} {'backend':<20}" + "".join(f"{s:>24}" for s in STAGES))
+    print(f"{'':>7} {'':>6}  {'':<4} {'':<20}" + f"{'s / items/s / RSS MB':>24}" * len(STAGES))
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for n in map(int, args.sizes.split(",")):
+            page = tmp / f"mylist_{n}.html"
+            size = synth_mylist.write_page(page, n, seed=args.seed, filler_kb=args.filler_kb)
+            for lang in langs:
+                for backend in backends:
+                    case = spawn_case(page, backend, lang, tmp)
+                    report["results"].append({"titles": n, "bytes": size, "lang": lang, "backend": backend, **case})
+                    line = f"{n:>7} {size / 1e6:>6.1f}  {lang:<4} {backend:<20}"
+                    if "error" in case:
+                        print(line + f"  error: {case['error']}")
+                        continue
+                    for s in STAGES:
+                        st = case["stages"][s]
+                        line += f"{st['seconds']:>8.3f} {st['items_per_sec'] or 0:>8} {st['peak_rss_mb'] or 0:>6.0f}"
+                    print(line)
+    if args.compare:
+        compare(report, json.loads(args.compare.read_text(encoding="utf-8")), args.threshold)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"results -> {args.json}")
+
+if __name__ == "__main__":
+    main()
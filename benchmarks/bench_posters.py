@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Poster cache benchmark against a local HTTP stand-in for nflxso.net (no real
+# network): cold sequential vs cold concurrent download, then a warm re-run
+# that must only ask again for the posters that failed, and a refresh that gets
+# a 304 for every cached one.
+#
+#   python3 benchmarks/bench_posters.py [--posters 300] [--latency 0.03] [--jobs 8]
+import argparse, hashlib, io, random, sys, tempfile, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from flix2flix import posters
+
+def make_jpeg(seed: int, size=(1280, 720)) -> bytes:
+    """A full-size boxart stand-in (random bytes when Pillow is missing)."""
+    rnd = random.Random(seed)
+    if posters.Image is None:
+        return rnd.randbytes(150_000)
+    im = posters.Image.new("RGB", size, (rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)))
+    im.paste((rnd.randrange(256), 40, 90), (0, size[1] // 2, size[0] // 2, size[1]))
+    out = io.BytesIO()
+    im.save(out, "JPEG", quality=90)
+    return out.getvalue()
+
+class StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, images: dict, latency: float):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.images, self.latency = images, latency
+        self.requests = self.connections = self.not_modified = 0
+        self.lock = threading.Lock()
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse shows up in the counts
+
+    def setup(self):
+        super().setup()
+        with self.server.lock: self.server.connections += 1
+
+    def do_GET(self):
+        with self.server.lock: self.server.requests += 1
+        time.sleep(self.server.latency)
+        body = self.server.images.get(self.path.split("?")[0])
+        if body is None:
+            self.send_response(404); self.send_header("Content-Length", "0"); self.end_headers()
+            return
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+        if self.headers.get("If-None-Match") == etag:
+            with self.server.lock: self.server.not_modified += 1
+            self.send_response(304); self.send_header("ETag", etag); self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def run(server, items, cache_dir, jobs, refresh=False):
+    server.requests = server.connections = server.not_modified = 0
+    cache = posters.PosterCache(cache_dir, jobs=jobs, refresh=refresh)
+    t = time.perf_counter()
+    out = list(cache.localize([dict(it) for it in items], cache_dir.parent))
+    return time.perf_counter() - t, cache, out
+
+def main():
+    ap = argparse.ArgumentParser(description="Poster cache benchmark (local stand-in server)")
+    ap.add_argument("--posters", type=int, default=300)
+    ap.add_argument("--latency", type=float, default=0.03, help="Seconds the stand-in waits per request")
+    ap.add_argument("--jobs", type=int, default=posters.DEFAULT_JOBS)
+    ap.add_argument("--missing", type=int, default=5, help="Items whose poster 404s")
+    args = ap.parse_args()
+
+    base = [make_jpeg(i) for i in range(16)]  # a few distinct images, many URLs
+    images = {f"/dnm/api/v6/k/{i:06d}.jpg": base[i % len(base)] for i in range(args.posters)}
+    server = StandIn(images, args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    origin = f"http://127.0.0.1:{server.server_address[1]}"
+    items = [{"id": str(i), "image_url": f"{origin}{path}?r={i % 7}"} for i, path in enumerate(images)]
+    items += [{"id": f"x{i}", "image_url": f"{origin}/dnm/api/v6/k/missing{i}.jpg"} for i in range(args.missing)]
+    print(f"{len(items)} posters, {args.latency * 1000:.0f} ms per request, Pillow: {posters.Image is not None}")
+    print(f"{'run':<22}{'seconds':>9}{'requests':>10}{'conns':>7}  result")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = []
+        for name, jobs, cache_dir, refresh in (("cold, 1 worker", 1, "seq", False),
+                                               (f"cold, {args.jobs} workers", args.jobs, "par", False),
+                                               (f"warm, {args.jobs} workers", args.jobs, "par", False),
+                                               (f"refresh, {args.jobs} workers", args.jobs, "par", True)):
+            cache_dir = Path(tmp) / cache_dir / "posters"
+            secs, cache, out = run(server, items, cache_dir, jobs, refresh)
+            rows.append((name, secs, server.requests, server.connections, cache, out))
+            print(f"{name:<22}{secs:>9.2f}{server.requests:>10}{server.connections:>7}  {cache.summary()}")
+
+        # a refresh gets a 304 for every cached poster and downloads none
+        assert server.not_modified == args.posters and rows[-1][4].fetched == 0, "refresh re-downloaded posters"
+        _, _, warm_requests, _, warm, out = rows[-2]
+        # only the posters that failed before are asked for again
+        assert warm_requests == args.missing and warm.fetched == 0, "warm run re-downloaded cached posters"
+        local = [it for it in out if it.get("image_local")]
+        assert len(local) == args.posters and all((cache_dir.parent / it["image_local"]).exists() for it in local)
+        files = [p for p in cache_dir.iterdir() if p.name not in (posters.INDEX_NAME, posters.VALIDATORS_NAME)]
+        on_disk = sum(p.stat().st_size for p in files)
+        original = sum(len(b) for b in images.values())
+        print(f"{len(files)} files on disk (content-addressed), {on_disk / 1024:.0f} KB "
+              f"vs {original / 1024:.0f} KB of originals")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Startup benchmark: wall time of short CLI runs in fresh interpreters, showing
+# what the lazy imports of the flix2flix package save on the paths that do not
+# parse HTML. "eager" runs the same command with bs4 (+ lxml) imported up
+# front, like the scripts did before the package split.
+#
+#   python3 benchmarks/bench_startup.py [--runs 15]
+import argparse, statistics, subprocess, sys, tempfile, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS = {"en": ROOT / "netflix_mylist_to_csv_and_viewer.py", "es": ROOT / "netflix_mylist_to_csv_and_viewer_spanish.py"}
+EAGER = "import importlib.util, runpy, sys; import bs4\n" \
+        "if importlib.util.find_spec('lxml'): import lxml.etree\n" \
+        "sys.argv = sys.argv[1:]; runpy.run_path(sys.argv[0], run_name='__main__')"
+PROBE = "import runpy, sys; sys.argv = sys.argv[1:]\n" \
+        "try: runpy.run_path(sys.argv[0], run_name='__main__')\n" \
+        "except SystemExit: pass\n" \
+        "print(' '.join(m for m in ('bs4', 'lxml', 'sqlite3', 'multiprocessing', 'PIL', 'webbrowser') if m in sys.modules), file=sys.stderr)"
+
+def wall(cmd, runs) -> float:
+    times = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True, cwd=ROOT)
+        times.append(time.perf_counter() - t)
+    return statistics.median(times) * 1000
+
+def heavy_modules(argv) -> str:
+    r = subprocess.run([sys.executable, "-c", PROBE, *argv], capture_output=True, text=True, cwd=ROOT)
+    return r.stderr.strip().splitlines()[-1] if r.stderr.strip() else "-"
+
+def main():
+    ap = argparse.ArgumentParser(description="CLI startup benchmark")
+    ap.add_argument("--runs", type=int, default=15)
+    ap.add_argument("--csv", type=Path, default=ROOT / "netflix_mylist.csv")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'command':<34}{'lazy ms':>9}{'eager ms':>10}  heavy modules loaded (lazy)")
+        print(f"{'python -c pass':<34}{wall([sys.executable, '-c', 'pass'], args.runs):>9.1f}")
+        for lang, script in SCRIPTS.items():
+            cases = {
+                "--help": ["--help"],
+                "--csv-in (viewer only)": ["--csv-in", str(args.csv), "--out", f"{tmp}/{lang}.csv",
+                                           "--viewer-out", f"{tmp}/{lang}.html"],
+            }
+            for name, argv in cases.items():
+                argv = [str(script), *argv]
+                lazy = wall([sys.executable, *argv], args.runs)
+                eager = wall([sys.executable, "-c", EAGER, *argv], args.runs)
+                print(f"{lang + ' ' + name:<34}{lazy:>9.1f}{eager:>10.1f}  {heavy_modules(argv)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Check of the import script's scheduling (see flix2flix/importer.py), run under
+# Node against a mock Netflix title page: pages load with a random delay, some
+# titles are already on the list or unavailable, and opening more than --limit
+# pages per --window ms gets pages without buttons, as when Netflix throttles.
+# Timings are scaled down (ms instead of s). Checked:
+#   - every title ends added, already there or unavailable, each added once;
+#   - never more pages open at once than --concurrency;
+#   - the throttling is hit and backed off from, and the run still finishes;
+#   - a run interrupted halfway resumes from its checkpoint without reopening
+#     the titles already done.
+# Exits non-zero on the first failure, so it can run in CI.
+#
+#   python3 benchmarks/check_import.py [--titles 300] [--concurrency 4] [--lang es]
+import argparse, json, shutil, subprocess, sys, tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from flix2flix import get_profile
+from flix2flix.importer import build_import_script
+
+HARNESS = r"""
+const assert = require("assert");
+const api = require(process.argv[1]);
+const opts = JSON.parse(process.argv[2]);
+const cfg = api.CONFIG, ids = api.IDS;
+const present = new Set(ids.filter((_, i) => i % 5 === 1)), missing = new Set(ids.filter((_, i) => i % 17 === 3));
+let seed = 42;
+const random = () => (seed = (seed * 1103515245 + 12345) % 2147483648) / 2147483648;
+const sleep = ms => new Promise(r => setTimeout(r, ms));
+
+// window.open() of a browser whose title pages behave like Netflix's
+function mockBrowser() {
+  const onList = new Set(present), clicks = new Map(), opens = [], popups = {};
+  let throttled = 0;
+  function page(id, limited) {
+    const add = {click() { clicks.set(id, (clicks.get(id) || 0) + 1); setTimeout(() => onList.add(id), 2 + random() * 8); }};
+    const buttons = !limited && !missing.has(id);
+    return {readyState: "complete", querySelector(sel) {
+      if (!buttons) return null;
+      if (sel === cfg.removeSelector) return onList.has(id) ? {} : null;
+      return sel === cfg.addSelector && !onList.has(id) ? add : null;
+    }};
+  }
+  return {
+    clicks, onList, opens, get throttled() { return throttled; },
+    open(url, name) {
+      const id = url.slice(cfg.titleUrl.length), now = Date.now();
+      opens.push({id, at: now});
+      const limited = opens.filter(o => now - o.at < opts.window).length > opts.limit;
+      if (limited) throttled++;
+      const popup = popups[name] || (popups[name] = {close() {}});
+      popup.document = {readyState: "loading", querySelector: () => null};
+      setTimeout(() => { popup.document = page(id, limited); }, 5 + random() * 25);
+      return popup;
+    },
+  };
+}
+
+// localStorage stand-in; a closed tab (box.closed) writes nothing more
+function memoryStore(box) {
+  return {load: () => box.state ? JSON.parse(box.state) : null,
+          save(state) { if (!box.closed) box.state = JSON.stringify(state); }};
+}
+
+// One run of the script; with stopAfter, the tab is closed when the next page would open
+async function run(browser, box, stopAfter) {
+  const driver = api.pageDriver(cfg, browser);
+  let active = 0, peak = 0, calls = 0, close;
+  const closed = new Promise(r => { close = r; });
+  const env = {
+    sleep, now: () => Date.now(), store: memoryStore(box),
+    async open(id, slot) {
+      if (stopAfter && ++calls > stopAfter) {
+        box.closed = true;
+        close();
+        return new Promise(() => {});
+      }
+      peak = Math.max(peak, ++active);
+      try { return await driver.open(id, slot); } finally { active--; }
+    },
+  };
+  const t = Date.now();
+  const result = await Promise.race([api.runImport(ids, cfg, env), closed]);
+  return {result, peak, ms: Date.now() - t};
+}
+
+(async () => {
+  // a whole run
+  const browser = mockBrowser(), box = {};
+  const {result, peak, ms} = await run(browser, box, 0);
+  const state = JSON.parse(box.state).done;
+  for (const id of ids) {
+    const want = missing.has(id) ? "missing" : present.has(id) ? "present" : "added";
+    assert.strictEqual(state[id], want, `${id}: ${state[id]}, expected ${want}`);
+    assert.strictEqual(browser.clicks.get(id) || 0, want === "added" ? 1 : 0, `${id} clicked ${browser.clicks.get(id)}x`);
+  }
+  assert.strictEqual(result.failed, 0);
+  assert.ok(peak <= cfg.concurrency, `${peak} pages open at once`);
+  assert.ok(browser.throttled > 0, "the mock never throttled: raise --titles or lower --limit");
+  const best = Math.round(ids.length * opts.window / opts.limit);
+  console.log(`ok  full run: ${result.added} added, ${result.present} present, ${result.missing} missing ` +
+              `in ${ms} ms (the mock's limit allows ${best} ms at best); ${result.opens} opens for ` +
+              `${ids.length} titles, ${browser.throttled} throttled, peak ${peak} at once`);
+
+  // interrupted, then resumed
+  const box2 = {}, first = mockBrowser();
+  await run(first, box2, Math.floor(ids.length / 2));
+  await sleep(300);  // the pages still loading in the closed tab's popups may add their title yet
+  const saved = Object.keys(JSON.parse(box2.state || '{"done": {}}').done);
+  assert.ok(saved.length > 0, "nothing checkpointed before the interruption");
+  const second = mockBrowser();
+  for (const id of first.onList) second.onList.add(id);  // the titles added before stay on the list
+  const resumed = await run(second, {state: box2.state}, 0);
+  const reopened = second.opens.filter(o => saved.includes(o.id)).length;
+  assert.strictEqual(reopened, 0, `${reopened} checkpointed titles opened again`);
+  assert.strictEqual(resumed.result.skipped, saved.length);
+  console.log(`ok  resume: ${saved.length} titles checkpointed before the interruption, ` +
+              `${resumed.result.opens} opens to finish the other ${ids.length - saved.length}`);
+  process.exit(0);  // the closed run's workers are still waiting for their pages
+})().catch(e => { console.error(`FAIL ${e.message}`); process.exit(1); });
+"""
+
+def main():
+    ap = argparse.ArgumentParser(description="Check the import script's scheduling against a mock title page")
+    ap.add_argument("--titles", type=int, default=300)
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--limit", type=int, default=12, help="Pages the mock serves per --window ms before throttling")
+    ap.add_argument("--window", type=int, default=200)
+    ap.add_argument("--lang", default="en", choices=["en", "es"])
+    args = ap.parse_args()
+    node = shutil.which("node") or shutil.which("nodejs")
+    if node is None: raise SystemExit("node not found: the import script runs in a browser, checked with Node")
+
+    ids = [str(80000000 + i * 7) for i in range(args.titles)]
+    # mock pages show their buttons within ~30 ms, so every wait shrinks from seconds to ms
+    script = build_import_script(ids, get_profile(args.lang), concurrency=args.concurrency, delay=0.005,
+                                 max_delay=0.4, retries=3, timeout=0.15, title_url="https://mock.test/title/",
+                                 poll_ms=5)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "import.js"
+        path.write_text(script, encoding="utf-8")
+        opts = {"limit": args.limit, "window": args.window}
+        code = subprocess.run([node, "-e", HARNESS, str(path), json.dumps(opts)]).returncode
+    if code: raise SystemExit(code)
+
+if __name__ == "__main__":
+    main()
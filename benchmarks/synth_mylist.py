@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Synthetic saved "My List" pages for the benchmarks, with the same markup as a
+# real export: title-card wrappers, data-ui-tracking-context JSON (URL-encoded,
+# sometimes twice), data-unified-entity-id, /watch/ hrefs with tctx, boxart
+# images and fallback-text containers, plus the scripts/svgs a saved page carries.
+#
+#   python3 benchmarks/synth_mylist.py 10000 > list_10k.html
+import argparse, html, json, random, sys, uuid
+from urllib.parse import quote
+
+WORDS = ["Dark", "Money", "Heist", "Stranger", "Things", "Crown", "Witcher", "Night", "Agents", "Ocean",
+         "Kingdom", "Sakamoto", "Days", "Taxi", "Narcos", "Élite", "Casa", "Papel", "Señor", "Cielo",
+         "Niñas", "Corazón", "Último", "Año", "Dragón", "Café", "Mañana", "Lupin", "Alice", "Borderland"]
+FORMATS = ["{a} {b}", "The {a} {b}", "{a}: {b}", "{a} & {b}", "{a} {b} {c}", "{a}"]
+CTX_KEYS = ["list_id", "location", "rank", "row", "track_id", "request_id",
+            "lolomo_id", "image_key", "supp_video_id", "appView"]
+
+def title(rnd: random.Random) -> str:
+    a, b, c = rnd.sample(WORDS, 3)
+    return rnd.choice(FORMATS).format(a=a, b=b, c=c)
+
+def card_html(i: int, rnd: random.Random, dup_every: int = 0) -> str:
+    """One title card. Every fifth card varies the markup the way real pages do."""
+    vid = 80000000 + (i // 2 if dup_every and i % dup_every == 1 else i) * 7
+    t = html.escape(title(rnd))
+    ctx = {"list_id": f"NES_{uuid.UUID(int=rnd.getrandbits(128)).hex.upper()}_p_1755881223675",
+           "location": "MyListAsGallery", "rank": i, "row": 0, "track_id": 254761469,
+           "request_id": str(uuid.UUID(int=rnd.getrandbits(128))) + "-330443029", "lolomo_id": "unknown",
+           "image_key": f"sdp|{uuid.UUID(int=rnd.getrandbits(128))}|es|MVC", "supp_video_id": 1,
+           "appView": "boxArt", "video_id": vid, "unifiedEntityId": f"Video:{vid}"}
+    mode = i % 5
+    if mode == 3: ctx.pop("video_id")            # id only in the href / entity id
+    raw = quote(json.dumps(ctx, separators=(",", ":")))
+    if mode == 4: raw = quote(raw)               # double-encoded context
+    tctx = quote(f"0,{i},,,,,,,,Video:{vid},")
+    img = (f"https://occ-0-70-92.1.nflxso.net/dnm/api/v6/Qs00mKCpRvrkl3HZAN5KwEL1kpE/"
+           f"AAAAB{rnd.getrandbits(160):040x}.{'webp' if i % 2 else 'jpg'}?r={rnd.randrange(1000)}")
+    aria = f' aria-label="{t}"' if mode in (0, 1) else ""
+    fallback = t if mode != 2 else ""
+    alt = t if mode == 2 and i % 2 else ""
+    text = t if mode == 2 and not i % 2 else ""
+    return (f'<div class="title-card-container"><div id="title-card-0-{i}" class="title-card">'
+            f'<div class="ptrack-content" data-ui-tracking-context="{raw}" '
+            f'data-tracking-uuid="{uuid.UUID(int=rnd.getrandbits(128))}" data-unified-entity-id="Video:{vid}">'
+            f'<a href="/watch/{vid}?tctx={tctx}" role="link"{aria} tabindex="0">'
+            f'<div class="boxart-size-16x9 boxart-container"><img class="boxart-image boxart-image-in-padded-container" '
+            f'src="{img}" alt="{alt}"><div class="fallback-text-container" aria-hidden="true">'
+            f'<p class="fallback-text">{fallback}</p></div></div> {text} </a></div></div></div>')
+
+def filler_script(kb: int) -> str:
+    # the bulk of a real export: inline app state and bundles, about kb KB of them
+    return "<script>window.netflix.state=[" + ",".join(['{"k":"<div class=\\"title-card\\">"}'] * (kb * 32)) + "];</script>"
+
+def iter_page(n: int, seed: int = 1, dup_every: int = 0, filler_kb: int = 0):
+    """Chunks of a page with n cards (every dup_every-th card repeats an earlier id), plus filler_kb KB of scripts."""
+    rnd = random.Random(seed)
+    yield ('<!DOCTYPE html><html lang="es"><head><meta charset="utf-8"><title>Netflix</title>'
+           '<style>.title-card{display:inline-block}</style>'
+           '<script>window.netflix={"reactContext":"<div data-ui-tracking-context=1>"};</script>'
+           + (filler_script(filler_kb // 2) if filler_kb else '') + '</head>'
+           '<body><div id="appMountPoint"><div class="mainView"><div class="gallery"><div class="galleryContent">')
+    for i in range(n):
+        yield card_html(i, rnd, dup_every)
+        if i % 50 == 49:
+            yield '<svg viewBox="0 0 24 24"><path d="M0 0h24v24H0z"/></svg><script>/* lazy-load */</script>'
+    yield '</div></div></div></div>' + (filler_script(filler_kb - filler_kb // 2) if filler_kb else '') + '</body></html>'
+
+def write_page(path, n: int, seed: int = 1, dup_every: int = 0, filler_kb: int = 0) -> int:
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in iter_page(n, seed, dup_every, filler_kb):
+            f.write(chunk)
+        return f.tell()
+
+def main():
+    ap = argparse.ArgumentParser(description="Synthetic saved My List page")
+    ap.add_argument("titles", type=int)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--dup-every", type=int, default=0, help="Repeat an earlier id every N cards (0 = never)")
+    ap.add_argument("--filler-kb", type=int, default=0, help="KB of inline scripts around the cards, like a real export")
+    args = ap.parse_args()
+    sys.stdout.reconfigure(encoding="utf-8")
+    sys.stdout.writelines(iter_page(args.titles, args.seed, args.dup_every, args.filler_kb))
+
+if __name__ == "__main__":
+    main()
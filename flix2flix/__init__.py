@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Flix2Flix: Netflix "My List" HTML -> CSV + viewer.
+#
+#   from flix2flix import get_profile, iter_items_from_html, run_pipeline
+#   profile = get_profile("es")
+#   run_pipeline(iter_items_from_html(Path("list.html"), profile), Path("out.csv"), Path("viewer.html"), profile)
+#
+# Submodules are imported on first attribute access, so `import flix2flix`
+# stays cheap and heavy dependencies load only with the feature using them.
+from importlib import import_module
+
+__version__ = "3.1"
+
+_EXPORTS = {
+    "PROFILES": "profiles", "Profile": "profiles", "get_profile": "profiles",
+    "ENGINES": "core", "PARSERS": "core", "iter_page_cards": "core", "resolve_parser": "core",
+    "available_parsers": "core",
+    "iter_items_from_html": "pipeline", "parse_html": "pipeline", "parse_html_file": "pipeline",
+    "load_items": "pipeline", "dedupe_items": "pipeline", "run_pipeline": "pipeline",
+    "iter_items_from_csv": "csvio", "read_items_from_csv": "csvio", "iter_write_csv": "csvio", "write_csv": "csvio",
+    "read_columns": "csvio", "iter_items_from_columns": "csvio", "write_columns": "csvio",
+    "FORMATS": "formats", "read_items": "formats", "iter_write_items": "formats",
+    "write_viewer_html": "viewer",
+    "ColumnarPayload": "payload",
+    "ParseCache": "cache",
+    "expand_inputs": "batch", "parse_many": "batch",
+    "Deduper": "dedupe",
+    "merge_items": "merge", "write_merged": "merge",
+    "CatalogStore": "store",
+    "PosterCache": "posters",
+    "SyncServer": "serve",
+    "FolderWatch": "watch", "WatchState": "watch",
+    "write_import_script": "importer", "build_import_script": "importer",
+    "Membership": "accounts", "account_names": "accounts",
+    "main": "cli",
+}
+
+__all__ = sorted(_EXPORTS) + ["__version__"]
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
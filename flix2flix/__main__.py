@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# python -m flix2flix [--lang en|es] ...   (same options as the entry scripts)
+import sys
+from .cli import main
+
+argv = sys.argv[1:]
+lang = "en"
+if argv[:1] == ["--lang"] and len(argv) > 1:
+    lang, argv = argv[1], argv[2:]
+elif argv and argv[0].startswith("--lang="):
+    lang, argv = argv[0].split("=", 1)[1], argv[1:]
+main(lang, argv)
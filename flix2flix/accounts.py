@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Several profiles' lists side by side (`union` / `diff`), for consolidating
+# them into one account: which titles every profile has, which only one has.
+#
+# Each source (a saved list in any --format, or a "My List" page) is one
+# profile. They are loaded in parallel (batch.parse_many) and folded in order
+# into one dict keyed by title id, whose value holds the title's first row and
+# a bitmask of membership: bit k is set when profile k lists it. Rows flagged
+# removed don't count, and a title seen on any profile comes out seen.
+
+ACCOUNTS_FIELD = "accounts"     # names of the profiles listing the title, "|"-separated
+MASK_FIELD = "accounts_mask"    # the same as a bitmask, bit k = k-th source
+MAX_ACCOUNTS = 53               # masks stay exact as viewer (JS) numbers
+KEEP = ("all", "common", "partial", "unique")
+
+def account_names(sources) -> list:
+    """(name, path) per "NAME=PATH" or "PATH" source; the name defaults to the file stem, clashes get -2, -3..."""
+    from pathlib import Path
+    out, used = [], {}
+    for raw in sources:
+        name, sep, path = str(raw).partition("=")
+        if not sep or not name or Path(raw).exists(): name, path = "", str(raw)
+        path = Path(path)
+        name = name or path.stem
+        used[name] = used.get(name, 0) + 1
+        if used[name] > 1: name = f"{name}-{used[name]}"
+        out.append((name, path))
+    return out
+
+class Membership:
+    """Titles of several profiles with the bitmask of the profiles listing each one."""
+
+    def __init__(self, profile, names: list):
+        if len(names) > MAX_ACCOUNTS: raise ValueError(f"at most {MAX_ACCOUNTS} profiles, got {len(names)}")
+        self.profile, self.names = profile, list(names)
+        self.rows = {}  # key -> [first row, mask]
+        self.sizes = [0] * len(names)
+
+    @property
+    def full(self) -> int:
+        return (1 << len(self.names)) - 1
+
+    def key(self, it: dict) -> str:
+        return self.profile.dedupe_key(it) or (it.get(self.profile.title_field) or "").strip()
+
+    def add(self, k: int, items):
+        """Fold in the rows of the k-th profile."""
+        from .viewer import is_seen  # viewer imports ACCOUNTS_JS from here
+        bit, seen, removed, rows = 1 << k, self.profile.seen_field, self.profile.removed_field, self.rows
+        for it in items:
+            if is_seen(it.get(removed)): continue
+            key = self.key(it)
+            if not key: continue
+            entry = rows.get(key)
+            if entry is None:
+                rows[key] = entry = [dict(it), 0]
+            elif is_seen(it.get(seen)) and not is_seen(entry[0].get(seen)):
+                entry[0][seen] = it.get(seen)
+            if not entry[1] & bit:
+                entry[1] |= bit
+                self.sizes[k] += 1
+
+    def keeps(self, keep: str):
+        """Mask test of a --keep set: one of KEEP, or only=NAME (the titles no other profile has)."""
+        full = self.full
+        if keep.startswith("only="):
+            if keep[5:] not in self.names: raise ValueError(f"no profile named {keep[5:]!r}")
+            bit = 1 << self.names.index(keep[5:])
+            return lambda m: m == bit
+        if keep not in KEEP: raise ValueError(f"unknown set {keep!r}, expected one of {KEEP} or only=NAME")
+        return {"all": lambda m: True, "common": lambda m: m == full, "partial": lambda m: m != full,
+                "unique": lambda m: m & (m - 1) == 0}[keep]
+
+    def iter_items(self, keep: str = "all"):
+        """The titles keep asks for, in first-seen order, with the accounts and accounts_mask columns."""
+        test, names = self.keeps(keep), self.names
+        for it, mask in self.rows.values():
+            if not test(mask): continue
+            it[ACCOUNTS_FIELD] = "|".join(name for k, name in enumerate(names) if mask >> k & 1)
+            it[MASK_FIELD] = mask
+            yield it
+
+    def stats(self) -> dict:
+        """{"titles", "common", "sizes": per profile, "unique": per profile}"""
+        unique = [0] * len(self.names)
+        common = 0
+        for _, mask in self.rows.values():
+            if mask == self.full: common += 1
+            if mask & (mask - 1) == 0: unique[mask.bit_length() - 1] += 1
+        return {"titles": len(self.rows), "common": common, "sizes": list(self.sizes), "unique": unique}
+
+# makeAccountFilter(select, names, masks, labels) -> null without profiles, else
+#   {names(i) -> "a, b", test() -> null (every row) or i -> whether row i is shown};
+#   fills the <select> with: all, on every profile, and on / only on / not on each one.
+#   labels: {all, every, on, only, not}, the last three with a {name} placeholder.
+ACCOUNTS_JS = r"""
+  function makeAccountFilter(select, names, masks, labels) {
+    if (!names || !masks) return null;
+    const all = 2 ** names.length - 1;
+    const has = (m, k) => Math.floor(m / 2 ** k) % 2 === 1;  // masks may pass 32 bits
+    select.add(new Option(labels.all, 'all'));
+    select.add(new Option(labels.every, 'every'));
+    names.forEach((name, k) => {
+      for (const how of ['on', 'only', 'not']) select.add(new Option(labels[how].replace('{name}', name), how + ':' + k));
+    });
+    select.hidden = false;
+    return {
+      names(i) { return names.filter((_, k) => has(masks[i], k)).join(', '); },
+      test() {
+        const [how, arg] = select.value.split(':'), k = Number(arg);
+        if (how === 'every') return i => masks[i] === all;
+        if (how === 'on') return i => has(masks[i], k);
+        if (how === 'only') return i => masks[i] === 2 ** k;
+        if (how === 'not') return i => !has(masks[i], k);
+        return null;
+      },
+    };
+  }
+"""
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Batch helpers: expand many saved "My List" pages and parse them across cores.
+import glob, os
+from pathlib import Path
+
+HTML_SUFFIXES = (".html", ".htm")
+
+def expand_inputs(paths) -> list:
+    """Turn files, directories and glob patterns into a sorted, de-duplicated file list.
+
+    Order is deterministic: arguments are kept in the order given, and the
+    files matched by a directory or glob are sorted by name.
+    """
+    out, seen = [], set()
+    def add(p: Path):
+        key = p.resolve()
+        if key not in seen:
+            seen.add(key); out.append(p)
+    for raw in paths:
+        p = Path(raw)
+        if p.is_dir():
+            for f in sorted(p.iterdir()):
+                if f.is_file() and f.suffix.lower() in HTML_SUFFIXES: add(f)
+        elif not p.exists() and glob.has_magic(str(raw)):
+            for f in sorted(glob.glob(str(raw))):
+                if Path(f).is_file(): add(Path(f))
+        else:
+            add(p)
+    return out
+
+def parse_many(paths, parse_file, jobs=None, executor=None):
+    """Yield (path, items) for every path, in input order.
+
+    parse_file must be a picklable top-level callable (path -> list of items).
+    Files are parsed on a ProcessPoolExecutor with `jobs` workers (default: one
+    per CPU); with a single file or jobs=1 everything runs in-process. A
+    long-lived caller (watch) passes its own executor, reused across calls.
+    """
+    paths = list(paths)
+    jobs = jobs or os.cpu_count() or 1
+    if executor is not None and len(paths) > 1:
+        yield from zip(paths, executor.map(parse_file, paths))
+        return
+    if jobs == 1 or len(paths) <= 1:
+        for p in paths:
+            yield p, parse_file(p)
+        return
+    from concurrent.futures import ProcessPoolExecutor  # pulls in multiprocessing, only when needed
+    with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as ex:
+        # map() hands results back in submission order, so output is deterministic
+        yield from zip(paths, ex.map(parse_file, paths))
+
+def parse_or_error(parse_file, path):
+    """parse_file(path), or the exception it raised: one broken export must not stop the others."""
+    try:
+        return parse_file(path)
+    except Exception as e:
+        return e
+
+def per_file_outputs(paths, out_dir: Path, csv_suffix=".csv", viewer_suffix="_viewer.html") -> list:
+    """(csv_path, viewer_path) per input, named after the input's stem; clashes get -2, -3..."""
+    out, used = [], {}
+    for p in paths:
+        stem = p.stem
+        used[stem] = used.get(stem, 0) + 1
+        if used[stem] > 1: stem = f"{stem}-{used[stem]}"
+        out.append((out_dir / (stem + csv_suffix), out_dir / (stem + viewer_suffix)))
+    return out
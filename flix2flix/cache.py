@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# On-disk parse cache: re-running on an unchanged HTML export skips parsing entirely.
+#
+# Entries are keyed by the SHA-256 of the file's bytes plus a parser/engine
+# version string, stored as zlib-compressed pickles (one file per entry) and
+# evicted least-recently-used first once the folder grows past its size cap.
+import hashlib, os, pickle, zlib
+from pathlib import Path
+from . import profiling
+
+DEFAULT_MAX_MB = 64
+ENTRY_SUFFIX = ".pkl.z"
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "flix2flix"
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+class ParseCache:
+    def __init__(self, cache_dir=None, max_mb: float = DEFAULT_MAX_MB):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+    def key(self, path: Path, version: str) -> str:
+        """Content hash of the file, salted with the parser/engine version."""
+        return hashlib.sha256(f"{version}\0{file_digest(path)}".encode("utf-8")).hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / (key + ENTRY_SUFFIX)
+
+    def get(self, key: str):
+        """Cached item list for key, or None on a miss / unreadable entry."""
+        path = self._entry(key)
+        try:
+            items = pickle.loads(zlib.decompress(path.read_bytes()))
+        except FileNotFoundError:
+            return None
+        except Exception:
+            path.unlink(missing_ok=True)  # corrupt or from an incompatible version
+            return None
+        try:
+            os.utime(path)  # LRU: mark as recently used
+        except OSError:
+            pass
+        return items
+
+    def put(self, key: str, items: list):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._entry(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(zlib.compress(pickle.dumps(items, protocol=pickle.HIGHEST_PROTOCOL)))
+        os.replace(tmp, path)  # atomic, so parallel workers never see half an entry
+        self.evict()
+
+    def cached(self, key: str, produce):
+        """Yield the cached items for key, or the items of produce() while recording them.
+
+        The entry is only written once produce() has been fully consumed.
+        """
+        with profiling.span("cache read"):
+            items = self.get(key)
+        profiling.count("parse cache: hit" if items is not None else "parse cache: miss")
+        if items is not None:
+            yield from items
+            return
+        recorded = []
+        for it in produce():
+            recorded.append(dict(it))  # copy: downstream stages may add keys
+            yield it
+        self.put(key, recorded)
+
+    def _entries(self) -> list:
+        if not self.cache_dir.is_dir():
+            return []
+        return [p for p in self.cache_dir.iterdir() if p.name.endswith(ENTRY_SUFFIX)]
+
+    def evict(self):
+        """Drop least-recently-used entries until the folder fits in max_bytes."""
+        entries = []
+        for p in self._entries():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue  # removed by another worker
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> int:
+        removed = 0
+        for p in self._entries():
+            p.unlink(missing_ok=True)
+            removed += 1
+        return removed
@@ -0,0 +1,836 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Command line shared by both entry scripts; only the texts depend on the language.
+#
+# Keep the module-level imports light: bs4, sqlite3, multiprocessing, Pillow,
+# webbrowser... are imported by the code path that needs them, so e.g. the
+# --csv-in viewer-only path never loads BeautifulSoup.
+import argparse, json, sys
+from functools import partial
+from pathlib import Path
+from .core import ENGINES, PARSER_CHOICES, ParserUnavailable, resolve_parser
+from . import profiling
+from .csvio import read_items_from_csv
+from .formats import FORMATS, SUFFIXES, FormatUnavailable, check_format, format_of, read_items, sniff_format
+from .payload import DATA_MODES
+from .pipeline import iter_items_from_html, load_items, parse_html_file, run_pipeline
+from .profiles import DEFAULT_BASE_URL, get_profile
+from .viewer import write_viewer_html
+
+DEFAULT_ACCOUNT = "default"    # same as store.DEFAULT_ACCOUNT, without importing sqlite3
+DEFAULT_CACHE_MAX_MB = 64      # cache.DEFAULT_MAX_MB
+DEFAULT_POSTER_WIDTH = 342     # posters.DEFAULT_WIDTH
+DEFAULT_POSTER_JOBS = 8        # posters.DEFAULT_JOBS
+DEFAULT_DEDUPE_THRESHOLD = 0.8 # dedupe.DEFAULT_THRESHOLD
+DEFAULT_OUT_STEM = "netflix_mylist"
+FORMAT_LABELS = {"csv": "CSV", "csv.gz": "CSV", "csv.zst": "CSV", "jsonl": "JSON Lines", "parquet": "Parquet"}
+
+TEXT = {
+    "en": {
+        "description": None,
+        "html_file": "HTML from 'My List' (several files, a directory or a glob for batch mode)",
+        "csv_in": "Build viewer directly from a saved list (CSV, also gzip/zstd-compressed, JSON Lines or Parquet)",
+        "out": "Where to save the list (default: netflix_mylist + the --format suffix)",
+        "format": "Format of --out: csv, csv.gz / csv.zst (compressed), jsonl (JSON Lines) or parquet; "
+                  "default: from the --out suffix, else csv",
+        "format_missing": "The {fmt} format needs a package that is not installed: pip install {pip}",
+        "merge_into": "Sync the HTML into an existing progress CSV: keeps 'seen', appends new titles, flags removed ones",
+        "merge_metavar": "EXISTING_CSV",
+        "viewer_data": "Embed the title data in the viewer, or write it next to it as <name>.data.json "
+                       "(needs http(s), e.g. GitHub Pages)",
+        "db": "Keep the list in a SQLite catalog instead of rewriting the CSV every run",
+        "account": "Account/profile the input belongs to inside --db",
+        "export_csv": "With --db: also export the account's list to --out",
+        "posters": "Download the posters as local WebP thumbnails (with Pillow) and use them in the viewer",
+        "poster_dir": "Thumbnail folder (default: posters/)",
+        "poster_width": "Maximum thumbnail width in px",
+        "poster_jobs": "Simultaneous poster downloads",
+        "poster_refresh": "Ask again for the posters already cached; the ones that haven't changed (HTTP 304) aren't downloaded",
+        "dedupe": "Drop duplicate titles, keeping the first one (same id unless --dedupe-by says otherwise)",
+        "dedupe_by": "Comma-separated duplicate rules, any of: id, entity (same unifiedEntityId), supp (supp_video_id "
+                     "pointing to another title), title (same normalized title), fuzzy (near-identical titles). "
+                     "Implies --dedupe",
+        "dedupe_threshold": "Title similarity (0-1) from which --dedupe-by fuzzy counts two titles as one",
+        "dedupe_report": "Write the groups of merged duplicates to this CSV (implies --dedupe)",
+        "dedupe_unknown": "Unknown --dedupe-by rule {name!r}, use any of: {choices}",
+        "dedupe_done": "[OK] Dedupe: {dropped} duplicates dropped{detail}",
+        "dedupe_saved": " -> Duplicate report saved to {path} ({groups} groups)",
+        "engine": "bs4 = parse with --parser, stream = always the incremental low-memory parser",
+        "parser": "HTML parser backend; auto = fastest installed (selectolax, else the built-in stream parser)",
+        "parser_missing": "--parser {parser} is not installed: pip install {pip}",
+        "prefilter": "Hand the parser only the title-card parts of the page, found by a fast byte scan "
+                     "(the whole page when it finds none)",
+        "jobs": "Worker processes in batch mode (default: CPU count)",
+        "per_file": "Batch mode: one CSV + viewer per input instead of a merged one",
+        "out_dir": "Output folder for --per-file",
+        "no_cache": "Always re-parse the HTML, bypassing the parse cache",
+        "clear_cache": "Empty the parse cache before running",
+        "cache_dir": "Parse cache folder (default: ~/.cache/flix2flix)",
+        "cache_max_mb": "Parse cache size cap, oldest entries evicted first",
+        "profile": "Report time, CPU, peak memory and item counts per stage, and which title fallback each card used",
+        "profile_json": "Save the --profile report as JSON (implies --profile)",
+        "profile_no_memory": "Skip the tracemalloc peak-memory tracking of --profile, which slows parsing several times",
+        "profile_cprofile": "Save a cProfile dump of the parse stage (implies --profile; read it with python -m pstats FILE)",
+        "profile_title": "\n[profile]",
+        "profile_saved": " -> Profile saved to {path}",
+        "cache_cleared": "[OK] Parse cache cleared ({n} entries).",
+        "no_input": "Pass an HTML file or use --csv-in.",
+        "no_match": "No HTML files matched.",
+        "per_file_done": "[OK] {path}: {count} items -> {csv}, {viewer}",
+        "batch_failed": "[!] {path} skipped: {error}",
+        "batch_done": "[OK] {count} items processed from {files} files.",
+        "done": "[OK] {count} items processed.",
+        "csv_saved": " -> {kind} saved to {path}",
+        "viewer_saved": " -> Viewer saved to {path}",
+        "stats": "{added} added, {removed} removed, {unchanged} unchanged",
+        "restored": " ({restored} back on the list)",
+        "merge_done": "[OK] Merge: {stats} -> {path} {action}.",
+        "merge_actions": {"unchanged": "unchanged", "appended": "appended", "rewritten": "rewritten"},
+        "catalog_done": "[OK] Catalog {db} [{account}]: {stats}",
+        "posters_done": "[OK] Posters: {fetched} downloaded, {cached} already cached, {failed} failed -> {path}",
+        "serve_hint": "Run '%(prog)s serve -h' to host the viewer on a local server that saves 'seen' changes as you make them.",
+        "serve_description": "Host the viewer on a local server: 'seen' changes are saved straight into the progress CSV "
+                             "(or --db), and every open tab shares them",
+        "serve_csv": "Progress CSV to serve and update",
+        "serve_db": "Serve an account of this SQLite catalog instead of a CSV",
+        "serve_host": "Address to listen on (default: this computer only)",
+        "serve_port": "Port (0 = any free one)",
+        "serve_poster_dir": "Poster thumbnails (--posters) served under /posters/ (default: posters/ next to the list); "
+                            "nothing else of that folder is served",
+        "serve_missing": "{path} not found: create it first by running the script on your 'My List' HTML.",
+        "serve_listening": "[OK] Serving {path} at {url} (Ctrl+C to stop)",
+        "serve_stopped": "[OK] Stopped, {writes} saves to {path}.",
+        "watch_hint": "Run '%(prog)s watch -h' to reprocess the exports saved into a folder as they arrive.",
+        "watch_description": "Watch a folder and reprocess the 'My List' HTML saved into it: one CSV + viewer of the "
+                             "whole folder (or one per file with --per-file, or synced into a progress CSV with "
+                             "--merge-into), updated as files arrive, change or go away",
+        "watch_folder": "Folder to watch",
+        "watch_settle": "Seconds a file must stay unchanged before it is read, so half-saved pages are left alone",
+        "watch_poll": "Seconds between folder rescans (inotify, where available, reports changes sooner)",
+        "watch_state": "JSON file with the content hash of every processed export, so a restart skips them "
+                       "(default: .flix2flix-watch.json next to the output)",
+        "watch_once": "Process what the folder holds now and exit",
+        "watch_missing": "{path} is not a folder.",
+        "watch_started": "[OK] Watching {path} ({how} every {poll:g}s, Ctrl+C to stop)",
+        "watch_how": {"inotify": "inotify + rescans", "polling": "rescans"},
+        "watch_skipped": "[OK] {path}: already processed, skipped",
+        "watch_failed": "[watch] {path} failed: {error}",
+        "watch_done": "[OK] {files} files: {count} items -> {csv}, {viewer}",
+        "watch_stopped": "[OK] Stopped, {files} files processed.",
+        "import_hint": "Run '%(prog)s import-script -h' to write a script that adds a list to another account.",
+        "import_description": "Write a JS script that adds the titles of a list to the 'My List' of the account it "
+                              "is pasted into (browser console, on netflix.com): several pages at once, slowing down "
+                              "when Netflix does, and resuming where it stopped if run again",
+        "import_sources": "Saved lists (CSV, JSON Lines, Parquet...) or 'My List' HTML to import",
+        "import_out": "Script to write",
+        "import_present": "A list of the target account: its titles are already there and are left out (repeatable)",
+        "import_include_seen": "Also import the titles marked seen (left out by default, like removed ones)",
+        "import_concurrency": "Title pages open at once, at most",
+        "import_delay": "Seconds between two page opens at full speed (doubled each time a page doesn't answer)",
+        "import_max_delay": "Longest pause between page opens, in seconds",
+        "import_retries": "Attempts per title before giving up",
+        "import_timeout": "Seconds a title page has to show its buttons",
+        "import_missing": "{path} not found.",
+        "import_done": "[OK] Import script for {count} titles ({skipped} left out) -> {path}",
+        "compare_hint": "Run '%(prog)s union -h' or '%(prog)s diff -h' to compare the lists of several profiles.",
+        "union_description": "Merge the lists of several profiles into one list + viewer, each title tagged with "
+                             "the profiles that have it",
+        "diff_description": "The titles some of several profiles are missing (or --keep another set), each tagged "
+                            "with the profiles that have it, as a list + viewer",
+        "compare_sources": "One list per profile, as NAME=PATH or PATH (named after the file): saved lists "
+                           "(CSV, JSON Lines, Parquet...) or 'My List' HTML",
+        "compare_out": "Where to save the list (default: netflix_mylist_union / _diff + the --format suffix)",
+        "compare_keep": "Titles to keep: all, common (on every profile), partial (missing from some), "
+                        "unique (on a single one) or only=NAME (on that profile alone); default: %(default)s",
+        "compare_keep_unknown": "--keep {keep}: expected all, common, partial, unique or only=NAME with NAME one "
+                                "of {names}.",
+        "compare_jobs": "Parallel workers loading the sources (default: one per CPU)",
+        "compare_too_many": "At most {max} profiles can be compared, got {count}.",
+        "compare_done": "[OK] {titles} titles across {profiles} profiles, {common} on all of them; {count} kept ({keep})",
+        "compare_profile": "    {name}: {size} titles, {unique} only there",
+        "resolve_paths": False,
+    },
+    "es": {
+        "description": "HTML de Netflix → CSV + Viewer con 'visto' y export.",
+        "html_file": "HTML de 'Mi Lista' (opcional si usas --csv-in); varios ficheros, carpeta o glob = modo lote",
+        "csv_in": "Lista ya generada para construir solo el viewer (CSV, también comprimido con gzip/zstd, "
+                  "JSON Lines o Parquet)",
+        "out": "Dónde guardar la lista (por defecto netflix_mylist + la extensión de --format)",
+        "format": "Formato de --out: csv, csv.gz / csv.zst (comprimido), jsonl (JSON Lines) o parquet; "
+                  "por defecto según la extensión de --out, si no csv",
+        "format_missing": "El formato {fmt} necesita un paquete que no está instalado: pip install {pip}",
+        "merge_into": "Sincroniza el HTML con un CSV de progreso: conserva 'visto', añade títulos nuevos y marca los eliminados",
+        "merge_metavar": "CSV_EXISTENTE",
+        "viewer_data": "Datos incrustados en el viewer o aparte en <nombre>.data.json (requiere http(s), p.ej. GitHub Pages)",
+        "db": "Guardar la lista en un catálogo SQLite en vez de reescribir el CSV cada vez",
+        "account": "Cuenta/perfil al que pertenece la entrada dentro de --db",
+        "export_csv": "Con --db: exportar también la lista de la cuenta a --out",
+        "posters": "Descargar las carátulas como miniaturas WebP locales (con Pillow) y usarlas en el viewer",
+        "poster_dir": "Carpeta de las miniaturas (por defecto posters/)",
+        "poster_width": "Ancho máximo de las miniaturas en px",
+        "poster_jobs": "Descargas simultáneas de carátulas",
+        "poster_refresh": "Volver a pedir las carátulas ya en caché; las que no han cambiado (HTTP 304) no se descargan",
+        "dedupe": "Quitar títulos repetidos, conservando el primero (mismo id salvo que --dedupe-by diga otra cosa)",
+        "dedupe_by": "Reglas de duplicado separadas por comas: id, entity (mismo unifiedEntityId), supp (supp_video_id "
+                     "que apunta a otro título), title (mismo título normalizado), fuzzy (títulos casi iguales). "
+                     "Activa --dedupe",
+        "dedupe_threshold": "Parecido (0-1) a partir del cual --dedupe-by fuzzy da dos títulos por iguales",
+        "dedupe_report": "Guardar en este CSV los grupos de duplicados fusionados (activa --dedupe)",
+        "dedupe_unknown": "Regla de --dedupe-by desconocida {name!r}, usa: {choices}",
+        "dedupe_done": "[OK] Dedupe: {dropped} duplicados quitados{detail}",
+        "dedupe_saved": "[OK] Informe de duplicados: {path} ({groups} grupos)",
+        "engine": "bs4 = parsear con --parser, stream = siempre el parser incremental de poca memoria",
+        "parser": "Parser HTML; auto = el más rápido instalado (selectolax, si no el parser stream incluido)",
+        "parser_missing": "--parser {parser} no está instalado: pip install {pip}",
+        "prefilter": "Pasar al parser solo las tarjetas de la página, halladas con un escaneo rápido de bytes "
+                     "(la página entera si no encuentra ninguna)",
+        "jobs": "Procesos en modo lote (por defecto: nº de CPUs)",
+        "per_file": "Modo lote: un CSV + viewer por HTML en vez de uno combinado",
+        "out_dir": "Carpeta de salida para --per-file",
+        "no_cache": "Volver a parsear siempre el HTML, sin usar la caché",
+        "clear_cache": "Vaciar la caché de parseo antes de empezar",
+        "cache_dir": "Carpeta de la caché (por defecto ~/.cache/flix2flix)",
+        "cache_max_mb": "Tamaño máximo de la caché; se borran primero las entradas menos usadas",
+        "profile": "Medir tiempo, CPU, memoria máxima e items por etapa, y qué alternativa dio el título de cada tarjeta",
+        "profile_json": "Guardar el informe de --profile en JSON (activa --profile)",
+        "profile_no_memory": "No medir la memoria con tracemalloc en --profile (hace el parseo varias veces más lento)",
+        "profile_cprofile": "Guardar un volcado cProfile de la etapa de parseo (activa --profile; se lee con python -m pstats FICHERO)",
+        "profile_title": "\n[profile]",
+        "profile_saved": "[OK] Profile: {path}",
+        "cache_cleared": "[OK] Caché de parseo vaciada ({n} entradas).",
+        "no_input": "Pasa un HTML o usa --csv-in.",
+        "no_match": "Ningún HTML coincide.",
+        "per_file_done": "[OK] {path}: {count} items -> {csv}, {viewer}",
+        "batch_failed": "[!] {path} omitido: {error}",
+        "batch_done": "[OK] Items: {count}",
+        "done": "[OK] Items: {count}",
+        "csv_saved": "[OK] {kind}: {path}",
+        "viewer_saved": "[OK] Viewer: {path}",
+        "stats": "{added} añadidos, {removed} eliminados, {unchanged} sin cambios",
+        "restored": " ({restored} han vuelto a la lista)",
+        "merge_done": "[OK] Merge: {stats}\n[OK] {path}: {action}",
+        "merge_actions": {"unchanged": "sin cambios", "appended": "filas nuevas añadidas al final",
+                          "rewritten": "reescrito"},
+        "catalog_done": "[OK] Catálogo {db} [{account}]: {stats}",
+        "posters_done": "[OK] Carátulas: {fetched} descargadas, {cached} ya en caché, {failed} fallidas -> {path}",
+        "serve_hint": "Con '%(prog)s serve -h': servidor local para el viewer que guarda los 'visto' al momento.",
+        "serve_description": "Servir el viewer en local: los 'visto' se guardan directamente en el CSV de progreso "
+                             "(o en --db) y se comparten entre pestañas",
+        "serve_csv": "CSV de progreso que se sirve y actualiza",
+        "serve_db": "Servir una cuenta de este catálogo SQLite en vez de un CSV",
+        "serve_host": "Dirección en la que escuchar (por defecto solo este ordenador)",
+        "serve_port": "Puerto (0 = cualquiera libre)",
+        "serve_poster_dir": "Miniaturas (--posters) que se sirven en /posters/ (por defecto posters/ junto a la lista); "
+                            "no se sirve nada más de esa carpeta",
+        "serve_missing": "No existe {path}: créalo antes ejecutando el script sobre el HTML de 'Mi Lista'.",
+        "serve_listening": "[OK] Sirviendo {path} en {url} (Ctrl+C para parar)",
+        "serve_stopped": "[OK] Parado, {writes} guardados en {path}.",
+        "watch_hint": "Con '%(prog)s watch -h': vigilar una carpeta y procesar cada export que se guarde en ella.",
+        "watch_description": "Vigilar una carpeta y procesar los HTML de 'Mi Lista' que se guarden en ella: un CSV + "
+                             "viewer de toda la carpeta (o uno por fichero con --per-file, o sincronizados con un CSV "
+                             "de progreso con --merge-into), actualizado según llegan, cambian o se borran ficheros",
+        "watch_folder": "Carpeta a vigilar",
+        "watch_settle": "Segundos que un fichero debe seguir igual antes de leerlo, para no leer páginas a medio guardar",
+        "watch_poll": "Segundos entre repasos de la carpeta (inotify, si está disponible, avisa antes de los cambios)",
+        "watch_state": "JSON con el hash del contenido de cada export procesado, para saltarlos al reiniciar "
+                       "(por defecto .flix2flix-watch.json junto a la salida)",
+        "watch_once": "Procesar lo que hay ahora en la carpeta y salir",
+        "watch_missing": "{path} no es una carpeta.",
+        "watch_started": "[OK] Vigilando {path} ({how} cada {poll:g}s, Ctrl+C para parar)",
+        "watch_how": {"inotify": "inotify + repasos", "polling": "repasos"},
+        "watch_skipped": "[OK] {path}: ya procesado, se salta",
+        "watch_failed": "[watch] {path} ha fallado: {error}",
+        "watch_done": "[OK] {files} ficheros: {count} items -> {csv}, {viewer}",
+        "watch_stopped": "[OK] Parado, {files} ficheros procesados.",
+        "import_hint": "Con '%(prog)s import-script -h': script que añade una lista a otra cuenta.",
+        "import_description": "Generar un script JS que añade los títulos de una lista a 'Mi Lista' de la cuenta "
+                              "donde se pega (consola del navegador, en netflix.com): varias páginas a la vez, "
+                              "frenando cuando Netflix frena, y retomando donde se quedó si se vuelve a ejecutar",
+        "import_sources": "Listas guardadas (CSV, JSON Lines, Parquet...) o HTML de 'Mi Lista' a importar",
+        "import_out": "Script a generar",
+        "import_present": "Lista de la cuenta destino: sus títulos ya están y se dejan fuera (se puede repetir)",
+        "import_include_seen": "Importar también los títulos marcados como vistos (por defecto se dejan fuera, "
+                               "como los eliminados)",
+        "import_concurrency": "Páginas de títulos abiertas a la vez, como máximo",
+        "import_delay": "Segundos entre dos aperturas de página a toda velocidad (se duplica cuando una no responde)",
+        "import_max_delay": "Pausa máxima entre aperturas de página, en segundos",
+        "import_retries": "Intentos por título antes de descartarlo",
+        "import_timeout": "Segundos que tiene una página de título para mostrar sus botones",
+        "import_missing": "No existe {path}.",
+        "import_done": "[OK] Script de importación de {count} títulos ({skipped} fuera) -> {path}",
+        "compare_hint": "Con '%(prog)s union -h' o '%(prog)s diff -h': comparar las listas de varios perfiles.",
+        "union_description": "Juntar las listas de varios perfiles en una lista + visor, cada título marcado con "
+                             "los perfiles que lo tienen",
+        "diff_description": "Los títulos que les faltan a algunos de varios perfiles (u otro conjunto con --keep), "
+                            "cada uno marcado con los perfiles que lo tienen, como lista + visor",
+        "compare_sources": "Una lista por perfil, como NOMBRE=RUTA o RUTA (con el nombre del fichero): listas "
+                           "guardadas (CSV, JSON Lines, Parquet...) o HTML de 'Mi Lista'",
+        "compare_out": "Dónde guardar la lista (por defecto netflix_mylist_union / _diff + la extensión de "
+                       "--format)",
+        "compare_keep": "Títulos a conservar: all (todos), common (en todos los perfiles), partial (faltan en "
+                        "alguno), unique (en uno solo) u only=NOMBRE (solo en ese perfil); por defecto: %(default)s",
+        "compare_keep_unknown": "--keep {keep}: se espera all, common, partial, unique u only=NOMBRE, con NOMBRE "
+                                "entre {names}.",
+        "compare_jobs": "Procesos en paralelo para cargar las listas (por defecto: uno por CPU)",
+        "compare_too_many": "Se pueden comparar {max} perfiles como mucho, hay {count}.",
+        "compare_done": "[OK] {titles} títulos en {profiles} perfiles, {common} en todos; {count} conservados ({keep})",
+        "compare_profile": "    {name}: {size} títulos, {unique} solo ahí",
+        "resolve_paths": True,
+    },
+}
+
+class _Out:
+    """Localized progress messages."""
+    def __init__(self, lang):
+        self.t = TEXT[lang]
+
+    def path(self, p: Path):
+        return p.resolve() if self.t["resolve_paths"] else p
+
+    def say(self, key, **kw):
+        print(self.t[key].format(**kw))
+
+    def stats(self, st) -> str:
+        return (self.t["stats"].format(added=st.added, removed=st.removed, unchanged=st.unchanged)
+                + (self.t["restored"].format(restored=st.restored) if st.restored else ""))
+
+def build_parser(profile) -> argparse.ArgumentParser:
+    t = TEXT[profile.lang]
+    hints = (t["serve_hint"], t["watch_hint"], t["import_hint"], t["compare_hint"])
+    ap = argparse.ArgumentParser(description=t["description"], epilog=" ".join(hints))
+    ap.add_argument("html_file", nargs="*", help=t["html_file"])
+    ap.add_argument("--csv-in", type=Path, help=t["csv_in"])
+    ap.add_argument("--merge-into", type=Path, metavar=t["merge_metavar"], help=t["merge_into"])
+    ap.add_argument("--out", type=Path, help=t["out"])
+    ap.add_argument("--format", choices=FORMATS, help=t["format"])
+    ap.add_argument("--viewer-out", type=Path, default=Path(profile.viewer_out))
+    ap.add_argument("--viewer-data", choices=DATA_MODES, default="inline", help=t["viewer_data"])
+    ap.add_argument("--db", type=Path, help=t["db"])
+    ap.add_argument("--account", default=DEFAULT_ACCOUNT, help=t["account"])
+    ap.add_argument("--export-csv", action="store_true", help=t["export_csv"])
+    ap.add_argument("--posters", action="store_true", help=t["posters"])
+    ap.add_argument("--poster-dir", type=Path, default=Path("posters"), help=t["poster_dir"])
+    ap.add_argument("--poster-width", type=int, default=DEFAULT_POSTER_WIDTH, help=t["poster_width"])
+    ap.add_argument("--poster-jobs", type=int, default=DEFAULT_POSTER_JOBS, help=t["poster_jobs"])
+    ap.add_argument("--poster-refresh", action="store_true", help=t["poster_refresh"])
+    ap.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    ap.add_argument("--dedupe", action="store_true", help=t["dedupe"])
+    ap.add_argument("--dedupe-by", metavar="RULES", help=t["dedupe_by"])
+    ap.add_argument("--dedupe-threshold", type=float, default=DEFAULT_DEDUPE_THRESHOLD, help=t["dedupe_threshold"])
+    ap.add_argument("--dedupe-report", type=Path, metavar="FILE", help=t["dedupe_report"])
+    ap.add_argument("--open", action="store_true")
+    ap.add_argument("--engine", choices=ENGINES, default="bs4", help=t["engine"])
+    ap.add_argument("--parser", choices=PARSER_CHOICES, default="auto", help=t["parser"])
+    ap.add_argument("--prefilter", action="store_true", help=t["prefilter"])
+    ap.add_argument("--jobs", type=int, default=None, help=t["jobs"])
+    ap.add_argument("--per-file", action="store_true", help=t["per_file"])
+    ap.add_argument("--out-dir", type=Path, default=Path("."), help=t["out_dir"])
+    ap.add_argument("--no-cache", action="store_true", help=t["no_cache"])
+    ap.add_argument("--clear-cache", action="store_true", help=t["clear_cache"])
+    ap.add_argument("--cache-dir", type=Path, default=None, help=t["cache_dir"])
+    ap.add_argument("--cache-max-mb", type=float, default=DEFAULT_CACHE_MAX_MB, help=t["cache_max_mb"])
+    ap.add_argument("--profile", action="store_true", help=t["profile"])
+    ap.add_argument("--profile-json", type=Path, metavar="FILE", help=t["profile_json"])
+    ap.add_argument("--profile-cprofile", type=Path, metavar="FILE", help=t["profile_cprofile"])
+    ap.add_argument("--profile-no-memory", action="store_true", help=t["profile_no_memory"])
+    return ap
+
+def build_serve_parser(profile) -> argparse.ArgumentParser:
+    t = TEXT[profile.lang]
+    ap = argparse.ArgumentParser(prog=f"{Path(sys.argv[0]).name} serve", description=t["serve_description"])
+    ap.add_argument("--csv", type=Path, default=Path("netflix_mylist.csv"), help=t["serve_csv"])
+    ap.add_argument("--db", type=Path, help=t["serve_db"])
+    ap.add_argument("--account", default=DEFAULT_ACCOUNT, help=t["account"])
+    ap.add_argument("--host", default="127.0.0.1", help=t["serve_host"])
+    ap.add_argument("--port", type=int, default=8000, help=t["serve_port"])
+    ap.add_argument("--poster-dir", type=Path, help=t["serve_poster_dir"])
+    ap.add_argument("--open", action="store_true")
+    return ap
+
+def build_watch_parser(profile) -> argparse.ArgumentParser:
+    from .watch import DEFAULT_POLL, DEFAULT_SETTLE
+    t = TEXT[profile.lang]
+    ap = argparse.ArgumentParser(prog=f"{Path(sys.argv[0]).name} watch", description=t["watch_description"])
+    ap.add_argument("folder", type=Path, help=t["watch_folder"])
+    ap.add_argument("--out", type=Path, help=t["out"])
+    ap.add_argument("--format", choices=FORMATS, help=t["format"])
+    ap.add_argument("--viewer-out", type=Path, default=Path(profile.viewer_out))
+    ap.add_argument("--viewer-data", choices=DATA_MODES, default="inline", help=t["viewer_data"])
+    ap.add_argument("--merge-into", type=Path, metavar=t["merge_metavar"], help=t["merge_into"])
+    ap.add_argument("--per-file", action="store_true", help=t["per_file"])
+    ap.add_argument("--out-dir", type=Path, default=Path("."), help=t["out_dir"])
+    ap.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    ap.add_argument("--engine", choices=ENGINES, default="bs4", help=t["engine"])
+    ap.add_argument("--parser", choices=PARSER_CHOICES, default="auto", help=t["parser"])
+    ap.add_argument("--prefilter", action="store_true", help=t["prefilter"])
+    ap.add_argument("--jobs", type=int, default=None, help=t["jobs"])
+    ap.add_argument("--no-cache", action="store_true", help=t["no_cache"])
+    ap.add_argument("--cache-dir", type=Path, default=None, help=t["cache_dir"])
+    ap.add_argument("--cache-max-mb", type=float, default=DEFAULT_CACHE_MAX_MB, help=t["cache_max_mb"])
+    ap.add_argument("--settle", type=float, default=DEFAULT_SETTLE, help=t["watch_settle"])
+    ap.add_argument("--poll", type=float, default=DEFAULT_POLL, help=t["watch_poll"])
+    ap.add_argument("--state", type=Path, metavar="FILE", help=t["watch_state"])
+    ap.add_argument("--once", action="store_true", help=t["watch_once"])
+    return ap
+
+def build_import_parser(profile) -> argparse.ArgumentParser:
+    from . import importer
+    t = TEXT[profile.lang]
+    ap = argparse.ArgumentParser(prog=f"{Path(sys.argv[0]).name} import-script", description=t["import_description"])
+    ap.add_argument("sources", nargs="+", help=t["import_sources"])
+    ap.add_argument("--out", type=Path, default=Path("netflix_import.js"), help=t["import_out"])
+    ap.add_argument("--present", type=Path, action="append", default=[], metavar="LIST", help=t["import_present"])
+    ap.add_argument("--include-seen", action="store_true", help=t["import_include_seen"])
+    ap.add_argument("--concurrency", type=int, default=importer.DEFAULT_CONCURRENCY, help=t["import_concurrency"])
+    ap.add_argument("--delay", type=float, default=importer.DEFAULT_DELAY, help=t["import_delay"])
+    ap.add_argument("--max-delay", type=float, default=importer.DEFAULT_MAX_DELAY, help=t["import_max_delay"])
+    ap.add_argument("--retries", type=int, default=importer.DEFAULT_RETRIES, help=t["import_retries"])
+    ap.add_argument("--timeout", type=float, default=importer.DEFAULT_TIMEOUT, help=t["import_timeout"])
+    ap.add_argument("--parser", choices=PARSER_CHOICES, default="auto", help=t["parser"])
+    return ap
+
+def build_compare_parser(profile, op) -> argparse.ArgumentParser:
+    t = TEXT[profile.lang]
+    ap = argparse.ArgumentParser(prog=f"{Path(sys.argv[0]).name} {op}", description=t[f"{op}_description"])
+    ap.add_argument("sources", nargs="+", metavar="[NAME=]PATH", help=t["compare_sources"])
+    ap.add_argument("--out", type=Path, help=t["compare_out"])
+    ap.add_argument("--format", choices=FORMATS, help=t["format"])
+    ap.add_argument("--viewer-out", type=Path, default=Path(f"{DEFAULT_OUT_STEM}_{op}_viewer.html"))
+    ap.add_argument("--viewer-data", choices=DATA_MODES, default="inline", help=t["viewer_data"])
+    ap.add_argument("--keep", default="all" if op == "union" else "partial", help=t["compare_keep"])
+    ap.add_argument("--parser", choices=PARSER_CHOICES, default="auto", help=t["parser"])
+    ap.add_argument("--jobs", type=int, default=None, help=t["compare_jobs"])
+    ap.add_argument("--no-cache", action="store_true", help=t["no_cache"])
+    ap.add_argument("--cache-dir", type=Path, default=None, help=t["cache_dir"])
+    ap.add_argument("--cache-max-mb", type=float, default=DEFAULT_CACHE_MAX_MB, help=t["cache_max_mb"])
+    return ap
+
+def resolve_format(args, out):
+    """Settle --format (from the --out suffix when not given) and the default --out."""
+    if args.format is None: args.format = format_of(args.out) if args.out else "csv"
+    if args.out is None: args.out = Path(DEFAULT_OUT_STEM + SUFFIXES[args.format])
+    try:
+        check_format(args.format)
+    except FormatUnavailable as e:
+        raise SystemExit(out.t["format_missing"].format(fmt=e.format, pip=e.pip))
+
+def resolve_html_parser(args, out):
+    # Settled once up front, so batch workers and the cache key all use the same backend
+    if args.engine != "bs4": return
+    try:
+        args.parser = resolve_parser(args.parser)
+    except ParserUnavailable as e:
+        raise SystemExit(out.t["parser_missing"].format(parser=e.parser, pip=e.pip))
+
+# ---------- Dedupe ----------
+def new_deduper(args, profile):
+    """A fresh Deduper per output (each --per-file output dedupes on its own), kept for the report."""
+    if not args.dedupe: return None
+    from .dedupe import Deduper
+    d = Deduper(profile, args.dedupe_by, args.dedupe_threshold)
+    args.dedupers.append(d)
+    return d
+
+def deduped(items, args, profile):
+    """items through a new Deduper when --dedupe is on: for the modes that don't go through run_pipeline."""
+    d = new_deduper(args, profile)
+    return profiling.stage("dedupe", d(items)) if d else items
+
+def report_dedupe(args, out):
+    from collections import Counter
+    from .dedupe import write_report
+    counts = sum((d.counts for d in args.dedupers), Counter())
+    detail = ", ".join(f"{k}: {n}" for k, n in counts.most_common())
+    out.say("dedupe_done", dropped=sum(counts.values()), detail=f" ({detail})" if detail else "")
+    if args.dedupe_report:
+        groups = write_report(args.dedupers, args.dedupe_report)
+        out.say("dedupe_saved", path=out.path(args.dedupe_report), groups=groups)
+
+# ---------- Input stages ----------
+def iter_fresh_items(paths, args, profile):
+    """Items of one or several HTML files (several are parsed across cores), in input order."""
+    if len(paths) == 1:
+        yield from iter_items_from_html(paths[0], profile, base_url=args.base_url, engine=args.engine,
+                                        parser=args.parser, cache=args.cache, prefilter=args.prefilter)
+        return
+    from .batch import parse_many
+    # the files are parsed in worker processes: only their total shows up in --profile
+    for _, items in profiling.stage("parse files", parse_many(paths, _parse_file(args, profile), jobs=args.jobs)):
+        yield from items
+
+def _parse_file(args, profile):
+    return partial(parse_html_file, lang=profile.lang, base_url=args.base_url, engine=args.engine,
+                   parser=args.parser, cache=args.cache, prefilter=args.prefilter)
+
+# ---------- Batch Mode (many HTML files across cores) ----------
+def run_batch(paths, args, profile, out):
+    from .batch import parse_many, parse_or_error, per_file_outputs
+    parse = partial(parse_or_error, _parse_file(args, profile))
+    parsed = []  # the files that could be read
+
+    def results():
+        for path, result in profiling.stage("parse files", parse_many(paths, parse, jobs=args.jobs)):
+            if isinstance(result, Exception):
+                out.say("batch_failed", path=path, error=result)  # the other files go on
+            else:
+                parsed.append(path)
+                yield path, result
+
+    if args.per_file:
+        outputs = dict(zip(paths, per_file_outputs(paths, args.out_dir, csv_suffix=SUFFIXES[args.format])))
+        for path, items in results():
+            csv_out, viewer_out = outputs[path]
+            count = run_pipeline(items, csv_out, viewer_out, profile, dedupe=new_deduper(args, profile),
+                                 data_mode=args.viewer_data, posters=args.posters, fmt=args.format)
+            out.say("per_file_done", path=path, count=count, csv=out.path(csv_out), viewer=out.path(viewer_out))
+        return None
+
+    # One merged CSV/viewer, in input order, tagged with the file each row came from
+    items = (dict(it, source_file=str(path)) for path, file_items in results() for it in file_items)
+    count = run_pipeline(items, args.out, args.viewer_out, profile, dedupe=new_deduper(args, profile),
+                         fields=profile.fields + ["source_file"], data_mode=args.viewer_data, posters=args.posters,
+                         fmt=args.format)
+    out.say("batch_done", count=count, files=len(parsed))
+    return count
+
+# ---------- Merge/Sync (new export -> existing progress CSV) ----------
+def run_merge(paths, args, profile, out) -> int:
+    return merge_fresh(deduped(iter_fresh_items(paths, args, profile), args, profile), args, profile, out)
+
+def merge_fresh(fresh_items, args, profile, out) -> int:
+    """Keep the seen flags of args.merge_into, append new titles, flag the ones no longer listed."""
+    from .merge import merge_items, merged_fields, write_merged
+    target = args.merge_into
+    existing = read_items_from_csv(target, profile) if target.exists() else ()
+    with profiling.span("merge"):
+        result = merge_items(existing, fresh_items, removed_field=profile.removed_field)
+    fields = merged_fields(profile.fields, result, target, removed_field=profile.removed_field)
+    with profiling.span("write csv"):
+        action = write_merged(result, target, fields, encoding=profile.csv_encoding)
+    count = write_viewer_html(result.rows, args.viewer_out, profile, data_mode=args.viewer_data, posters=args.posters)
+    out.say("merge_done", stats=out.stats(result.stats), path=out.path(target),
+            action=out.t["merge_actions"][action])
+    return count
+
+# ---------- SQLite Catalog (--db) ----------
+def run_store(paths, args, profile, out) -> int:
+    """Sync the input (HTML or --csv-in) into the catalog, then build the viewer (and CSV) from it."""
+    from .store import CatalogStore
+    with CatalogStore(args.db, seen_field=profile.seen_field, removed_field=profile.removed_field,
+                      title_field=profile.title_field) as store:
+        if args.csv_in: items = read_items(args.csv_in, profile)
+        elif paths: items = iter_fresh_items(paths, args, profile)
+        else: items = None
+        if items is not None:
+            items = deduped(items, args, profile)  # before the sync, or the duplicates would be stored
+            with profiling.span("catalog sync"):
+                stats = store.sync(items, account=args.account)
+            out.say("catalog_done", db=out.path(args.db), account=args.account, stats=out.stats(stats))
+        rows = profiling.stage("catalog read", store.iter_items(args.account))
+        if args.export_csv:
+            return run_pipeline(rows, args.out, args.viewer_out, profile, data_mode=args.viewer_data,
+                                posters=args.posters, fmt=args.format)
+        return write_viewer_html(rows, args.viewer_out, profile, data_mode=args.viewer_data, posters=args.posters)
+
+# ---------- Local sync server (serve) ----------
+def run_serve(argv, profile, out):
+    """Host the viewer and write 'seen' toggles back to --csv / --db until Ctrl+C."""
+    args = build_serve_parser(profile).parse_args(argv)
+    from .serve import CatalogProgress, CsvProgress, SyncServer
+    source = args.db or args.csv
+    if not source.exists(): raise SystemExit(out.t["serve_missing"].format(path=out.path(source)))
+    if args.db: target = CatalogProgress(args.db, args.account, profile)
+    else: target = CsvProgress(args.csv, profile)
+    server = SyncServer(target, profile, host=args.host, port=args.port,
+                        posters=args.poster_dir or source.parent / "posters")
+    out.say("serve_listening", path=out.path(source), url=server.url)
+    if args.open:
+        import webbrowser
+        webbrowser.open(server.url)
+    server.serve_forever()
+    out.say("serve_stopped", writes=server.writer.writes, path=out.path(source))
+
+# ---------- Watch folder (watch) ----------
+def run_watch(argv, profile, out):
+    """Process the exports saved into a folder as they settle, until Ctrl+C (or once, with --once)."""
+    import os
+    from .batch import parse_many, parse_or_error, per_file_outputs
+    from .cache import ParseCache, file_digest
+    from .watch import FolderWatch, WatchState, ignore_sigint
+    args = build_watch_parser(profile).parse_args(argv)
+    if not args.folder.is_dir(): raise SystemExit(out.t["watch_missing"].format(path=out.path(args.folder)))
+    if args.merge_into: args.format = "csv"  # the progress CSV is updated in place
+    resolve_format(args, out)
+    resolve_html_parser(args, out)
+    args.cache = None if args.no_cache else ParseCache(args.cache_dir, args.cache_max_mb)
+    args.posters = None
+    home = args.merge_into.parent if args.merge_into else args.out_dir if args.per_file else args.out.parent
+    state = WatchState.load(args.state or home / ".flix2flix-watch.json")
+    watch = FolderWatch(args.folder, settle=args.settle, poll=args.poll)
+    parse = partial(parse_or_error, _parse_file(args, profile))
+    executor = None
+    if (args.jobs or os.cpu_count() or 1) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=args.jobs, initializer=ignore_sigint)  # kept for the whole run
+    combined = not (args.merge_into or args.per_file)
+    items, processed = {}, []  # path -> its items, for the combined output
+    skipped = set()  # looked again at when a file goes: it may have been the original of a copy
+
+    def parse_all(paths):
+        for p, result in parse_many(paths, parse, jobs=args.jobs, executor=executor):
+            if isinstance(result, Exception): out.say("watch_failed", path=p, error=result)
+            else: yield p, result
+
+    def process(ready, removed, changed=False):
+        for p in removed:
+            items.pop(p, None)
+            changed = state.forget(p) or changed
+        if removed:
+            watch.recheck(skipped)
+            skipped.clear()
+        new = {}
+        for p in ready:
+            try:
+                digest = file_digest(p)
+            except FileNotFoundError:
+                continue
+            if digest in new.values() or state.processed(p, digest, merged=bool(args.merge_into)):
+                out.say("watch_skipped", path=p)
+                skipped.add(p)
+            else:
+                new[p] = digest
+        if args.merge_into:  # oldest export first, so the newest decides what is removed
+            new = dict(sorted(new.items(), key=lambda kv: watch.done.get(kv[0], (0, 0))[1]))
+        for p, file_items in parse_all(list(new)):
+            if args.merge_into:
+                merge_fresh(file_items, args, profile, out)
+                state.merged.append(new[p])
+            elif args.per_file:
+                csv_out, viewer_out = per_file_outputs([p], args.out_dir, csv_suffix=SUFFIXES[args.format])[0]
+                count = run_pipeline(file_items, csv_out, viewer_out, profile, data_mode=args.viewer_data,
+                                     fmt=args.format)
+                out.say("per_file_done", path=p, count=count, csv=out.path(csv_out), viewer=out.path(viewer_out))
+            else:
+                items[p] = file_items
+                changed = True
+            state.record(p, new[p])
+            processed.append(p)
+        if combined and changed:
+            current = [p for p in watch.scan() if state.key(p) in state.files]
+            # processed by an earlier run (from the parse cache, usually); not while being rewritten
+            items.update(parse_all([p for p in current if p not in items and p not in watch.pending]))
+            current = [p for p in current if p in items]
+            rows = (dict(it, source_file=str(p)) for p in current for it in items[p])
+            count = run_pipeline(rows, args.out, args.viewer_out, profile, fields=profile.fields + ["source_file"],
+                                 data_mode=args.viewer_data, fmt=args.format)
+            out.say("watch_done", files=len(current), count=count, csv=out.path(args.out),
+                    viewer=out.path(args.viewer_out))
+        state.save()
+
+    present = {state.key(p) for p in watch.scan()}
+    gone = [k for k in state.files if k not in present]  # deleted while nobody was watching
+    for k in gone: del state.files[k]
+    out.say("watch_started", path=out.path(args.folder), how=out.t["watch_how"][watch.how], poll=args.poll)
+    try:
+        if gone: process([], [], changed=True)
+        for ready, removed in watch.batches(once=args.once):
+            process(ready, removed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watch.close()
+        if executor is not None: executor.shutdown(wait=False, cancel_futures=True)
+    out.say("watch_stopped", files=len(processed))
+
+# ---------- Import script (import-script) ----------
+def iter_source_items(paths, args, profile):
+    """Items of saved lists (any --format) and 'My List' pages alike."""
+    for p in paths:
+        yield from load_items(p, lang=profile.lang, parser=args.parser)
+
+def run_import_script(argv, profile, out):
+    """Write the JS that adds the listed titles to the account it runs in."""
+    from .batch import HTML_SUFFIXES, expand_inputs
+    from .importer import write_import_script
+    args = build_import_parser(profile).parse_args(argv)
+    paths = expand_inputs(args.sources)
+    if not paths: raise SystemExit(out.t["no_match"])
+    for p in paths + args.present:
+        if not p.is_file(): raise SystemExit(out.t["import_missing"].format(path=out.path(p)))
+    pages = [p for p in paths + args.present if p.suffix.lower() in HTML_SUFFIXES]
+    try:
+        for p in paths + args.present:
+            if p not in pages: check_format(sniff_format(p))
+        if pages: args.parser = resolve_parser(args.parser)
+    except FormatUnavailable as e:
+        raise SystemExit(out.t["format_missing"].format(fmt=e.format, pip=e.pip))
+    except ParserUnavailable as e:
+        raise SystemExit(out.t["parser_missing"].format(parser=e.parser, pip=e.pip))
+    present = {str(it.get("id") or "").strip() for it in iter_source_items(args.present, args, profile)}
+    items = list(iter_source_items(paths, args, profile))
+    count = write_import_script(items, args.out, profile, present=present, include_seen=args.include_seen,
+                                concurrency=args.concurrency, delay=args.delay, max_delay=args.max_delay,
+                                retries=args.retries, timeout=args.timeout)
+    out.say("import_done", count=count, skipped=len(items) - count, path=out.path(args.out))
+
+def run_compare(op, argv, profile, out):
+    """union / diff: one list + viewer of several profiles' titles, with the profiles that have each one."""
+    from .accounts import ACCOUNTS_FIELD, MASK_FIELD, MAX_ACCOUNTS, Membership, account_names
+    from .batch import HTML_SUFFIXES, parse_many
+    args = build_compare_parser(profile, op).parse_args(argv)
+    sources = account_names(args.sources)
+    if len(sources) > MAX_ACCOUNTS:
+        raise SystemExit(out.t["compare_too_many"].format(max=MAX_ACCOUNTS, count=len(sources)))
+    names, paths = [name for name, _ in sources], [path for _, path in sources]
+    members = Membership(profile, names)
+    try:
+        members.keeps(args.keep)
+    except ValueError:
+        raise SystemExit(out.t["compare_keep_unknown"].format(keep=args.keep, names=", ".join(names)))
+    for p in paths:
+        if not p.is_file(): raise SystemExit(out.t["import_missing"].format(path=out.path(p)))
+    if args.out is None: args.out = Path(f"{DEFAULT_OUT_STEM}_{op}" + SUFFIXES[args.format or "csv"])
+    resolve_format(args, out)
+    try:
+        for p in paths:
+            if p.suffix.lower() not in HTML_SUFFIXES: check_format(sniff_format(p))
+    except FormatUnavailable as e:
+        raise SystemExit(out.t["format_missing"].format(fmt=e.format, pip=e.pip))
+    cache = None
+    if any(p.suffix.lower() in HTML_SUFFIXES for p in paths):
+        args.engine = "bs4"
+        resolve_html_parser(args, out)
+        if not args.no_cache:
+            from .cache import ParseCache
+            cache = ParseCache(args.cache_dir, args.cache_max_mb)
+
+    # Sources load in parallel; each is folded in as it arrives, in the order given
+    load = partial(load_items, lang=profile.lang, parser=args.parser, cache=cache)
+    for k, (_, items) in enumerate(profiling.stage("parse files", parse_many(paths, load, jobs=args.jobs))):
+        members.add(k, items)
+
+    count = run_pipeline(members.iter_items(args.keep), args.out, args.viewer_out, profile,
+                         fields=profile.fields + [ACCOUNTS_FIELD, MASK_FIELD], data_mode=args.viewer_data,
+                         fmt=args.format, accounts=names)
+    st = members.stats()
+    out.say("compare_done", titles=st["titles"], profiles=len(names), common=st["common"], count=count,
+            keep=args.keep)
+    for name, size, unique in zip(names, st["sizes"], st["unique"]):
+        out.say("compare_profile", name=name, size=size, unique=unique)
+    out.say("csv_saved", kind=FORMAT_LABELS[args.format], path=out.path(args.out))
+    out.say("viewer_saved", path=out.path(args.viewer_out))
+
+# ---------- Dispatch ----------
+def run(paths, args, profile, out):
+    """Run the mode the options ask for; returns the item count (None once --per-file reported each file)."""
+    if args.db:
+        count = run_store(paths, args, profile, out)
+        out.say("done", count=count)
+        if not args.export_csv: args.out = None
+    elif args.csv_in:
+        items = read_items(args.csv_in, profile)  # read whole, so --out may be the input itself
+        count = run_pipeline(items, args.out, args.viewer_out, profile, dedupe=new_deduper(args, profile),
+                             data_mode=args.viewer_data, posters=args.posters, fmt=args.format)
+        out.say("done", count=count)
+    elif not paths:
+        raise SystemExit(out.t["no_input"])
+    elif args.merge_into:
+        count = run_merge(paths, args, profile, out)
+        out.say("done", count=count)
+        args.out, args.format = args.merge_into, "csv"  # the progress CSV is updated in place
+    elif len(paths) > 1 or args.per_file:
+        count = run_batch(paths, args, profile, out)
+    else:
+        items = iter_items_from_html(paths[0], profile, base_url=args.base_url, engine=args.engine,
+                                     parser=args.parser, cache=args.cache, prefilter=args.prefilter)
+        count = run_pipeline(items, args.out, args.viewer_out, profile, dedupe=new_deduper(args, profile),
+                             data_mode=args.viewer_data, posters=args.posters, fmt=args.format)
+        out.say("done", count=count)
+    return count
+
+def report_profile(prof, args, out):
+    print(out.t["profile_title"], file=sys.stderr)
+    print(prof.report(), file=sys.stderr)
+    if args.profile_json:
+        args.profile_json.write_text(json.dumps(prof.to_dict(), indent=2), encoding="utf-8")
+        out.say("profile_saved", path=out.path(args.profile_json))
+    if args.profile_cprofile:
+        prof.save_cprofile(args.profile_cprofile)
+        out.say("profile_saved", path=out.path(args.profile_cprofile))
+
+# ---------- main ----------
+def main(lang="en", argv=None):
+    profile = get_profile(lang)
+    out = _Out(profile.lang)
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["serve"]:
+        return run_serve(argv[1:], profile, out)
+    if argv[:1] == ["watch"]:
+        return run_watch(argv[1:], profile, out)
+    if argv[:1] == ["import-script"]:
+        return run_import_script(argv[1:], profile, out)
+    if argv[:1] in (["union"], ["diff"]):
+        return run_compare(argv[0], argv[1:], profile, out)
+    args = build_parser(profile).parse_args(argv)
+
+    args.cache = None
+    args.dedupers = []
+    resolve_format(args, out)
+    try:
+        if args.csv_in and args.csv_in.is_file(): check_format(sniff_format(args.csv_in))
+    except FormatUnavailable as e:
+        raise SystemExit(out.t["format_missing"].format(fmt=e.format, pip=e.pip))
+    if args.dedupe_by is not None or args.dedupe_report: args.dedupe = True
+    if args.dedupe:
+        from .dedupe import DEFAULT_STRATEGIES, STRATEGIES
+        rules = [r.strip() for r in (args.dedupe_by or "").split(",") if r.strip()]
+        args.dedupe_by = tuple(rules) or DEFAULT_STRATEGIES
+        for r in args.dedupe_by:
+            if r not in STRATEGIES:
+                raise SystemExit(out.t["dedupe_unknown"].format(name=r, choices=", ".join(STRATEGIES)))
+    needs_html = bool(args.html_file) and not args.csv_in
+    if needs_html: resolve_html_parser(args, out)
+    if args.clear_cache or (needs_html and not args.no_cache):
+        from .cache import ParseCache
+        if args.clear_cache:
+            out.say("cache_cleared", n=ParseCache(args.cache_dir).clear())
+            if not args.html_file and not args.csv_in and not args.db: return
+        if needs_html and not args.no_cache:
+            args.cache = ParseCache(args.cache_dir, args.cache_max_mb)
+    if args.posters:
+        from .posters import PosterCache
+        args.posters = PosterCache(args.poster_dir, width=args.poster_width, jobs=args.poster_jobs,
+                                   refresh=args.poster_refresh)
+    else:
+        args.posters = None
+
+    paths = []
+    if args.html_file:
+        from .batch import expand_inputs
+        paths = expand_inputs(args.html_file)
+        if not paths and not args.csv_in: raise SystemExit(out.t["no_match"])
+
+    prof = None
+    if args.profile or args.profile_json or args.profile_cprofile or args.profile_no_memory:
+        prof = profiling.Profiler(memory=not args.profile_no_memory,
+                                  cprofile_stage="parse" if args.profile_cprofile else None).start()
+    try:
+        count = run(paths, args, profile, out)
+    finally:
+        if prof is not None: prof.stop()
+
+    if args.posters is not None:
+        p = args.posters
+        out.say("posters_done", fetched=p.fetched, cached=p.cached + p.revalidated, failed=p.failed,
+                path=out.path(args.poster_dir))
+    if count is not None: # --per-file already reported every file
+        if args.out: out.say("csv_saved", kind=FORMAT_LABELS[args.format], path=out.path(args.out))
+        out.say("viewer_saved", path=out.path(args.viewer_out))
+    if args.dedupers: report_dedupe(args, out)
+    if prof is not None: report_profile(prof, args, out)
+    if count is None:
+        return
+
+    if args.open:
+        import webbrowser
+        webbrowser.open(args.viewer_out.resolve().as_uri())
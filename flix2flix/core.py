@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Parser core: turns a saved "My List" page into card records, whatever the engine.
+#
+# Both engines emit the records documented in stream.CardStreamParser, so the
+# profiles (profiles.py) only have to map a record to their own CSV schema:
+#   "stream" -> stream.CardStreamParser, incremental, stdlib only
+#   "bs4"    -> a full document tree, built by one of PARSERS (--parser):
+#               html.parser / lxml / html5lib through BeautifulSoup, or selectolax.
+#               Backends are imported only when used. "auto" picks the fastest
+#               installed one, where "stream" counts as a backend too.
+# With prefilter=True either engine only gets the card slices of the page (prefilter.py).
+from importlib.util import find_spec
+from . import profiling
+from .htmlsource import open_page, read_chunks, read_page
+from .prefilter import card_regions, iter_card_slices
+from .stream import iter_cards
+
+ENGINES = ("bs4", "stream")
+PARSERS = ("html.parser", "lxml", "html5lib", "selectolax")
+PARSER_CHOICES = ("auto", "stream") + PARSERS
+# Fastest first (benchmarks/bench_pipeline.py, 1k-10k titles): selectolax ~1.5x the
+# stream engine, which itself outruns lxml ~2.5x, html.parser 3-6x and html5lib ~4x
+# through BeautifulSoup. So auto only builds a tree when selectolax is installed.
+AUTO_ORDER = ("selectolax", "stream")
+_REQUIRES = {"html.parser": ("bs4",), "lxml": ("bs4", "lxml"), "html5lib": ("bs4", "html5lib"),
+             "selectolax": ("selectolax",)}
+PIP_NAMES = {"bs4": "beautifulsoup4"}
+
+class ParserUnavailable(ImportError):
+    """The requested --parser backend is not installed."""
+    def __init__(self, parser: str, missing: list):
+        self.parser, self.missing = parser, missing
+        self.pip = " ".join(PIP_NAMES.get(m, m) for m in missing)
+        super().__init__(f"parser {parser!r} needs: pip install {self.pip}")
+
+def missing_modules(parser: str) -> list:
+    if parser not in _REQUIRES:
+        raise ValueError(f"unknown parser {parser!r}, expected one of {PARSER_CHOICES}")
+    return [m for m in _REQUIRES[parser] if find_spec(m) is None]
+
+def available_parsers() -> list:
+    return [p for p in PARSERS if not missing_modules(p)]
+
+def resolve_parser(parser: str = "auto") -> str:
+    """The backend to use: parser itself if installed, or for "auto" the fastest installed one."""
+    if parser == "auto":
+        return next(p for p in AUTO_ORDER if p == "stream" or not missing_modules(p))
+    if parser == "stream": return parser
+    missing = missing_modules(parser)
+    if missing: raise ParserUnavailable(parser, missing)
+    return parser
+
+# ---------- BeautifulSoup (html.parser, lxml, html5lib) ----------
+def _bs4_anchor(a) -> dict:
+    if a is None: return None
+    img = a.find("img")
+    return {"attrs": dict(a.attrs), "img": dict(img.attrs) if img else None, "text": [a.get_text()]}
+
+def iter_cards_bs4(html: str, watch_fallback: bool = False, features: str = "html.parser"):
+    """Same records as iter_cards(), read from a BeautifulSoup tree."""
+    from bs4 import BeautifulSoup
+    with profiling.span("build tree"):
+        soup = BeautifulSoup(html, features)
+    has_href_card = False
+    for el in soup.select("[data-ui-tracking-context]"):
+        container = el.find_parent("div", class_="title-card")
+        fb = el.select_one(".fallback-text-container p.fallback-text")
+        card = {
+            "kind": "card", "tag": el.name, "attrs": dict(el.attrs),
+            "container_id": container.get("id", "") if container else "",
+            "anchor": _bs4_anchor(el.find("a")), "href_anchor": _bs4_anchor(el.find("a", href=True)),
+            "fallback": [fb.get_text()] if fb else None, "done": True,
+        }
+        has_href_card = has_href_card or card["href_anchor"] is not None
+        yield card
+    if watch_fallback and not has_href_card:
+        for a in soup.select('a[href*="/watch/"]'):
+            yield {"kind": "watch", "anchor": _bs4_anchor(a)}
+
+# ---------- selectolax (lexbor, or the older modest engine) ----------
+def _sx_attrs(node) -> dict:
+    return {k: v if v is not None else "" for k, v in node.attributes.items()}
+
+def _sx_text(node) -> str:
+    return node.text(deep=True, separator="", strip=False)
+
+def _sx_anchor(a) -> dict:
+    if a is None: return None
+    img = a.css_first("img")
+    return {"attrs": _sx_attrs(a), "img": _sx_attrs(img) if img else None, "text": [_sx_text(a)]}
+
+def _sx_title_card(node):
+    node = node.parent
+    while node is not None:
+        if node.tag == "div" and "title-card" in (node.attributes.get("class") or "").split():
+            return node
+        node = node.parent
+    return None
+
+def iter_cards_selectolax(html: str, watch_fallback: bool = False):
+    """Same records as iter_cards(), read from a selectolax tree."""
+    try:
+        from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    except ImportError:
+        from selectolax.parser import HTMLParser
+    with profiling.span("build tree"):
+        tree = HTMLParser(html)
+    has_href_card = False
+    for el in tree.css("[data-ui-tracking-context]"):
+        container = _sx_title_card(el)
+        fb = el.css_first(".fallback-text-container p.fallback-text")
+        card = {
+            "kind": "card", "tag": el.tag, "attrs": _sx_attrs(el),
+            "container_id": (container.attributes.get("id") or "") if container else "",
+            "anchor": _sx_anchor(el.css_first("a")), "href_anchor": _sx_anchor(el.css_first("a[href]")),
+            "fallback": [_sx_text(fb)] if fb else None, "done": True,
+        }
+        has_href_card = has_href_card or card["href_anchor"] is not None
+        yield card
+    if watch_fallback and not has_href_card:
+        for a in tree.css('a[href*="/watch/"]'):
+            yield {"kind": "watch", "anchor": _sx_anchor(a)}
+
+def iter_cards_tree(html: str, parser: str, watch_fallback: bool = False):
+    if parser == "selectolax":
+        return iter_cards_selectolax(html, watch_fallback=watch_fallback)
+    return iter_cards_bs4(html, watch_fallback=watch_fallback, features=parser)
+
+def _iter_cards(chunks, engine: str, parser: str, watch_fallback: bool):
+    if engine == "stream":
+        return iter_cards(chunks, watch_fallback=watch_fallback)
+    # a tree needs the whole document in memory anyway
+    with profiling.span("read html"):
+        html = "".join(chunks)
+    return iter_cards_tree(html, parser, watch_fallback=watch_fallback)
+
+def _iter_card_slices(path, regions, engine: str, parser: str, watch_fallback: bool):
+    cards = profiling.stage("walk cards", _iter_cards(iter_card_slices(path, regions), engine, parser, False))
+    if watch_fallback:
+        held = []
+        for card in cards:
+            held.append(card)
+            if card["href_anchor"] is not None: break
+        else:  # no card links to its title: the /watch/ fallback needs the whole page
+            profiling.count("prefilter: full parse")
+            yield from iter_page_cards(path, engine=engine, watch_fallback=True, parser=parser)
+            return
+        yield from held
+    yield from cards
+
+def iter_page_cards(path=None, html: str = None, engine: str = "bs4", watch_fallback: bool = False,
+                    parser: str = "auto", prefilter: bool = False):
+    """Card records of the page saved at path, or of an in-memory html string."""
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine {engine!r}, expected one of {ENGINES}")
+    if engine == "bs4":
+        parser = resolve_parser(parser)
+        if parser == "stream": engine = "stream"
+    if prefilter and html is None:
+        with profiling.span("prefilter"), open_page(path) as buf:
+            regions = card_regions(buf)
+        if regions:
+            yield from _iter_card_slices(path, regions, engine, parser, watch_fallback)
+            return
+        profiling.count("prefilter: full parse")
+    if html is not None:
+        chunks = [html]
+    elif engine == "stream":
+        chunks = profiling.stage("read html", read_chunks(path))
+    else:
+        with profiling.span("read html"):
+            chunks = [read_page(path)]
+    yield from profiling.stage("walk cards", _iter_cards(chunks, engine, parser, watch_fallback))
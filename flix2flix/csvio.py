@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# CSV readers/writers in each profile's schema.
+#
+# The header is matched to the profile's row keys once per file (_plan): a key
+# is read from its own column, then from its aliases while empty, so the English
+# profile reads a Spanish file (titulo -> title, visto -> seen) and vice versa.
+# Big progress files take the bulk path: pyarrow's C reader, when installed,
+# parses the columns the profile uses (read_columns) and the rows are zipped from
+# them; otherwise the csv module streams the rows through one plan-based reader.
+# Writers hand the csv module plain value tuples (no DictWriter per-row checks).
+# Every reader and writer takes compression=None, "gzip" or "zstd" (see formats.py).
+import csv, gc, gzip, io
+from contextlib import contextmanager
+from operator import itemgetter
+from pathlib import Path
+
+COMPRESSIONS = (None, "gzip", "zstd")
+GZIP_LEVEL = 6  # zlib's default: level 9 is several times slower for a few % less
+# Smaller files are read by the csv module: importing pyarrow (~0.1 s) costs
+# more than its faster parsing saves below ~30k rows of the 22-column schema.
+ARROW_MIN_BYTES = 16 << 20
+
+def _zstd():
+    try:
+        from compression import zstd  # Python 3.14+
+    except ImportError:
+        import zstandard as zstd
+    return zstd
+
+def open_text(path: Path, mode: str, encoding: str, compression=None):
+    """path opened as text ("r" or "w") for the csv module, through the compression given."""
+    if compression is None:
+        return open(path, mode, encoding=encoding, newline="")
+    if compression == "gzip":
+        if mode == "r": return gzip.open(path, "rt", encoding=encoding, newline="")
+        # mtime=0: the same rows always compress to the same bytes
+        return io.TextIOWrapper(gzip.GzipFile(path, "wb", GZIP_LEVEL, mtime=0), encoding=encoding, newline="")
+    if compression == "zstd":
+        return _zstd().open(path, mode + "t", encoding=encoding, newline="")
+    raise ValueError(f"unknown compression {compression!r}, expected one of {COMPRESSIONS}")
+
+def _plan(header: list, profile) -> list:
+    """[(row key, header positions to read it from, its own column first)] for a CSV with this header."""
+    pos = {}
+    for i, name in enumerate(header): pos.setdefault(name, i)
+    return [(key, [pos[c] for c in (key, *profile.aliases.get(key, ())) if c in pos])
+            for key in profile.csv_fields(header)]
+
+def _getter(positions: list):
+    if len(positions) == 1:
+        i = positions[0]
+        return lambda values: (values[i],)
+    return itemgetter(*positions)
+
+def row_reader(header: list, profile):
+    """Function turning a csv.reader row of this header into the profile's row dict."""
+    plan, n = _plan(header, profile), len(header)
+    keys = [key for key, _ in plan]
+    firsts = [sources[0] if sources else n for _, sources in plan]  # position n: an empty value
+    fallbacks = [(k, sources[1:]) for k, (_, sources) in enumerate(plan) if len(sources) > 1]
+
+    if firsts == list(range(n)) and not fallbacks:  # the file is in the profile's own schema
+        def read(row: list) -> dict:
+            if len(row) != n: row = (row + [""] * n)[:n]  # ragged rows: missing values are empty
+            return dict(zip(keys, row))
+        return read
+
+    first, padded = _getter(firsts), n in firsts
+    def read(row: list) -> dict:
+        if len(row) != n: row = (row + [""] * n)[:n]
+        if padded: row = row + [""]
+        values = first(row)
+        if fallbacks:
+            values = list(values)
+            for k, alts in fallbacks:
+                if not values[k]: values[k] = next((row[a] for a in alts if row[a]), values[k])
+        return dict(zip(keys, values))
+    return read
+
+def iter_items_from_csv(csv_path: Path, profile, compression=None):
+    # utf-8-sig reads files with and without a BOM alike
+    with open_text(csv_path, "r", "utf-8-sig", compression) as f:
+        reader = csv.reader(f)
+        read = row_reader(next(reader, []), profile)
+        for row in reader:
+            if row: yield read(row)
+
+def read_rows(csv_path: Path, compression=None) -> tuple:
+    """(header, rows) of a CSV as lists of strings, every row as long as the header."""
+    with open_text(csv_path, "r", "utf-8-sig", compression) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        n = len(header)
+        return header, [row if len(row) == n else (row + [""] * n)[:n] for row in reader if row]
+
+def _arrow_columns(csv_path: Path, header: list, compression, names: list):
+    """{column: list of strings} of the named columns via pyarrow, or None to let the csv module read the file."""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return None
+    if len(set(header)) != len(header): return None  # columns are picked by name
+    try:
+        with pa.input_stream(str(csv_path), compression=compression) as f:
+            table = pacsv.read_csv(f, parse_options=pacsv.ParseOptions(newlines_in_values=True),
+                                   convert_options=pacsv.ConvertOptions(
+                                       include_columns=names, column_types=dict.fromkeys(names, pa.string()),
+                                       strings_can_be_null=False, quoted_strings_can_be_null=False))
+    except pa.ArrowInvalid:  # ragged rows, not UTF-8...
+        return None
+    return {name: table.column(name).to_pylist() for name in names}
+
+def _header(csv_path: Path, compression=None) -> list:
+    with open_text(csv_path, "r", "utf-8-sig", compression) as f:
+        return next(csv.reader(f), [])
+
+def _merge(plan: list, columns, n: int) -> dict:
+    out = {}
+    for key, sources in plan:
+        col = columns[sources[0]] if sources else [""] * n
+        for alt in sources[1:]:
+            col = [v or w for v, w in zip(col, columns[alt])]
+        out[key] = col
+    return out
+
+def resolve_columns(header: list, profile, load):
+    """{row key: list of values} of a columnar file with this header, or None when load can't read it.
+
+    load(names) returns {name: list of values} for the header columns the profile uses.
+    """
+    if not header: return None
+    plan = _plan(header, profile)
+    used = sorted({i for _, sources in plan for i in sources}) or [0]  # one column at least, for the row count
+    found = load([header[i] for i in used])
+    if found is None: return None
+    return _merge(plan, dict(zip(used, found.values())), len(next(iter(found.values()))))
+
+def _read_arrow(csv_path: Path, profile, compression=None):
+    if Path(csv_path).stat().st_size < ARROW_MIN_BYTES: return None
+    header = _header(csv_path, compression)
+    return resolve_columns(header, profile, lambda names: _arrow_columns(csv_path, header, compression, names))
+
+def read_columns(csv_path: Path, profile, compression=None) -> dict:
+    """{row key: list of values} of a whole CSV, header aliases resolved column by column."""
+    columns = _read_arrow(csv_path, profile, compression)
+    if columns is None:
+        header, rows = read_rows(csv_path, compression)
+        columns = _merge(_plan(header, profile), list(zip(*rows)) or [()] * len(header), len(rows))
+        columns = {k: list(v) for k, v in columns.items()}
+    return columns
+
+def iter_items_from_columns(columns: dict):
+    keys = list(columns)
+    for values in zip(*columns.values()):
+        yield dict(zip(keys, values))
+
+@contextmanager
+def gc_paused():
+    """No cyclic GC passes while a big file becomes rows: they hold only strings and can't form cycles."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled: gc.enable()
+
+def read_items_from_csv(csv_path: Path, profile, compression=None) -> list:
+    """Every row of the CSV: column by column with pyarrow, else streamed through the csv module."""
+    with gc_paused():
+        columns = _read_arrow(csv_path, profile, compression)
+        if columns is None: return list(iter_items_from_csv(csv_path, profile, compression))
+        return list(iter_items_from_columns(columns))
+
+def _values(fields: list):
+    """item -> its values in fields order, "" for missing keys (what DictWriter does, minus its checks)."""
+    get = _getter(list(fields))
+    def values(it: dict):
+        try:
+            return get(it)
+        except KeyError:
+            return [it.get(k, "") for k in fields]
+    return values
+
+def iter_write_csv(items, out_path: Path, profile, fields=None, compression=None):
+    """Write each item to the CSV as it arrives and pass it on downstream."""
+    fields = fields or profile.fields
+    values = _values(fields)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open_text(out_path, "w", profile.csv_encoding, compression) as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        for it in items:
+            writer.writerow(values(it))
+            yield it
+
+def write_csv(items, out_path: Path, profile, fields=None, compression=None):
+    fields = fields or profile.fields
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open_text(out_path, "w", profile.csv_encoding, compression) as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        writer.writerows(map(_values(fields), items))
+
+def write_columns(columns: dict, out_path: Path, profile, fields=None, compression=None):
+    """Write {key: list of values} (e.g. from read_columns) without building a dict per row."""
+    fields = fields or profile.fields
+    n = len(next(iter(columns.values()), []))
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open_text(out_path, "w", profile.csv_encoding, compression) as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        writer.writerows(zip(*[columns.get(k) or [""] * n for k in fields]))
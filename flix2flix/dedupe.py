@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Duplicate detection for --dedupe: one streaming pass, the first row of a group wins.
+#
+# Strategies (--dedupe-by, any combination; a row is a duplicate when any of them matches):
+#   id      the profile's key: id (Spanish: id, else href_original). Rows without one are dropped.
+#   entity  same unifiedEntityId
+#   supp    a row whose supp_video_id is another row's id (season / supplemental videos)
+#   title   same normalized title: accents, case, punctuation and season/part suffixes ignored
+#   fuzzy   near-identical normalized titles (character-trigram Jaccard >= threshold)
+#
+# Exact strategies are dict lookups. Fuzzy matching avoids comparing every pair:
+# titles are MinHashed and split into bands (locality-sensitive hashing), so
+# only titles sharing a band bucket are compared, which keeps it near-linear.
+import csv, re, struct
+from collections import Counter
+from hashlib import blake2b
+from pathlib import Path
+from . import profiling
+from .search import fold
+
+STRATEGIES = ("id", "entity", "supp", "title", "fuzzy")
+DEFAULT_STRATEGIES = ("id",)
+DEFAULT_THRESHOLD = 0.8
+REPORT_FIELDS = ["group", "kept", "match", "score", "rows", "id", "title"]
+
+_SUFFIX = re.compile(r"\s+(?:(?:season|temporada|series|serie|part|parte|volume|vol|volumen|book|libro|"
+                     r"chapter|capitulo|collection|coleccion)\s*(?:\d+|[ivx]+)|[ts]\d+)$")
+_VIDEO_ID = re.compile(r"\d{5,}")
+
+# LSH: BANDS x ROWS minhashes. A pair with Jaccard j shares a bucket with
+# probability 1 - (1 - j**ROWS)**BANDS: ~99.7% at 0.8, ~20% at 0.3.
+BANDS, ROWS = 8, 3
+_BUCKET_CAP = 64  # titles kept per bucket, so a crowded one can't go quadratic
+
+def title_key(title: str) -> str:
+    """Title normalized for matching: folded, without a trailing season/part marker."""
+    t = fold(title)
+    while True:
+        stripped = _SUFFIX.sub("", t)
+        if stripped == t or not stripped: return t
+        t = stripped
+
+def shingles(s: str) -> frozenset:
+    s = f" {s} "
+    return frozenset(s[i:i + 3] for i in range(len(s) - 2))
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b: return 0.0
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter)
+
+_HASHES = struct.Struct(f"<{BANDS * ROWS}H")  # 16-bit hashes: 48 bytes, within one blake2b digest
+_gram_hashes = {}  # trigram -> its BANDS * ROWS hash values; the trigram vocabulary stays small
+
+def _hashes(gram: str) -> tuple:
+    h = _gram_hashes.get(gram)
+    if h is None:
+        h = _gram_hashes[gram] = _HASHES.unpack(blake2b(gram.encode("utf-8"), digest_size=_HASHES.size).digest())
+    return h
+
+def band_keys(grams: frozenset) -> list:
+    # MinHash signature: per hash function, the minimum over the title's trigrams
+    sig = list(map(min, zip(*map(_hashes, grams))))
+    return [(b, tuple(sig[b * ROWS:(b + 1) * ROWS])) for b in range(BANDS)]
+
+class FuzzyIndex:
+    """Titles seen so far, bucketed by LSH band; match() finds the closest one above threshold."""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.exact = {}    # normalized title -> group
+        self.buckets = {}  # band key -> [(group, shingles)]
+        self.comparisons = 0
+        self._last = (None, None, None)  # key, shingles, band keys: match() then add() hash a title once
+
+    def _sketch(self, key: str):
+        if self._last[0] != key:
+            grams = shingles(key)
+            self._last = (key, grams, band_keys(grams))
+        return self._last[1:]
+
+    def match(self, key: str):
+        """(group, score) of the best earlier title, or None."""
+        if not key: return None
+        if key in self.exact: return self.exact[key], 1.0
+        grams, bands = self._sketch(key)
+        best, checked = None, set()
+        for bk in bands:
+            for group, other in self.buckets.get(bk, ()):
+                if group in checked: continue
+                checked.add(group)
+                score = jaccard(grams, other)
+                if score >= self.threshold and (best is None or score > best[1]): best = (group, score)
+        self.comparisons += len(checked)
+        return best
+
+    def add(self, key: str, group: int):
+        if not key or key in self.exact: return
+        self.exact[key] = group
+        grams, bands = self._sketch(key)
+        for bk in bands:
+            bucket = self.buckets.setdefault(bk, [])
+            if len(bucket) < _BUCKET_CAP: bucket.append((group, grams))
+
+class Deduper:
+    """Callable on an item stream: yields the first row of every group, remembers what it merged."""
+
+    def __init__(self, profile, by=DEFAULT_STRATEGIES, threshold: float = DEFAULT_THRESHOLD):
+        unknown = [s for s in by if s not in STRATEGIES]
+        if unknown: raise ValueError(f"unknown dedupe strategy {unknown[0]!r}, expected any of {STRATEGIES}")
+        self.profile, self.by, self.threshold = profile, tuple(by), threshold
+        self.keys = {}     # (strategy, key) -> group
+        self.fuzzy = FuzzyIndex(threshold) if "fuzzy" in self.by else None
+        self.kept = []     # (id, title) of the row that opened each group
+        self.merged = {}   # group -> {(id, title, strategy): [rows, best score]}
+        self.counts = Counter()
+
+    def _keys(self, it: dict):
+        for s in self.by:
+            if s == "id":
+                yield s, self.profile.dedupe_key(it)
+            elif s == "entity":
+                yield s, (it.get("unifiedEntityId") or "").strip()
+            elif s == "supp":
+                # rows meet on the main video's id; supp_video_id is often a placeholder like "1"
+                vid, supp = str(it.get("id") or "").strip(), str(it.get("supp_video_id") or "").strip()
+                yield s, vid
+                if supp != vid and _VIDEO_ID.fullmatch(supp): yield s, supp
+            elif s == "title":
+                yield s, title_key(self._title(it))
+
+    def _title(self, it: dict) -> str:
+        return str(it.get(self.profile.title_field) or "")
+
+    def __call__(self, items):
+        by_id = "id" in self.by
+        for it in items:
+            if by_id and not self.profile.dedupe_key(it):
+                self.counts["no id"] += 1
+                profiling.count("dedupe: no id")
+                continue
+            keys = [(s, k) for s, k in self._keys(it) if k]
+            match = next(((self.keys[sk], sk[0], 1.0) for sk in keys if sk in self.keys), None)
+            fuzzy_key = title_key(self._title(it)) if self.fuzzy else ""
+            if match is None and self.fuzzy:
+                found = self.fuzzy.match(fuzzy_key)
+                if found: match = (found[0], "fuzzy", found[1])
+            if match is None:
+                group = len(self.kept)
+                self.kept.append((str(it.get("id") or ""), self._title(it)))
+            else:
+                group, strategy, score = match
+                member = (str(it.get("id") or ""), self._title(it), strategy)
+                tally = self.merged.setdefault(group, {}).setdefault(member, [0, 0.0])
+                tally[0] += 1
+                tally[1] = max(tally[1], score)
+                self.counts[strategy] += 1
+                profiling.count(f"dedupe: {strategy}")
+            for sk in keys: self.keys.setdefault(sk, group)  # a duplicate's other keys join its group
+            if self.fuzzy: self.fuzzy.add(fuzzy_key, group)
+            if match is None: yield it
+
+    @property
+    def dropped(self) -> int:
+        return sum(self.counts.values())
+
+    def report_rows(self):
+        """Every group that absorbed duplicates: the kept row, then each distinct duplicate with its row count."""
+        for n, group in enumerate(sorted(self.merged), 1):
+            vid, title = self.kept[group]
+            yield {"group": n, "kept": "1", "match": "", "score": "", "rows": 1, "id": vid, "title": title}
+            for (vid, title, strategy), (rows, score) in self.merged[group].items():
+                yield {"group": n, "kept": "", "match": strategy, "score": f"{score:.2f}", "rows": rows,
+                       "id": vid, "title": title}
+
+def write_report(dedupers, path: Path, encoding="utf-8") -> int:
+    """The merged groups of one or more dedupers as CSV (groups renumbered across them); returns the group count."""
+    groups = 0
+    with open(path, "w", encoding=encoding, newline="") as f:
+        w = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+        w.writeheader()
+        for d in dedupers:
+            for row in d.report_rows():
+                w.writerow(dict(row, group=groups + row["group"]))
+            groups += len(d.merged)
+    return groups
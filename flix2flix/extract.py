@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Per-card extraction helpers shared by every profile and parser engine.
+#
+# Patterns are compiled once at import time, and decoded tracking contexts are
+# memoized: the same data-ui-tracking-context blob is only json-decoded once.
+import json, re
+from functools import lru_cache
+from urllib.parse import unquote, unquote_plus
+
+UNIFIED_ID_RE = re.compile(r":(\d+)$")
+WATCH_ID_RE = re.compile(r"/watch/(\d+)")
+WHITESPACE_RE = re.compile(r"\s+")
+CTX_CACHE_SIZE = 8192
+
+@lru_cache(maxsize=CTX_CACHE_SIZE)
+def parse_ctx(raw_ctx: str) -> dict:
+    """Decode a (once or twice) URL-encoded tracking-context JSON blob.
+
+    The result is memoized and shared between calls: treat it as read-only.
+    """
+    if not raw_ctx: return {}
+    text = unquote(raw_ctx)
+    # Still percent-encoded (double-encoded blob): json.loads would fail, go straight to the second unquote
+    if not text.startswith("%"):
+        try:
+            ctx = json.loads(text)
+            return ctx if isinstance(ctx, dict) else {}
+        except ValueError:
+            pass
+    try:
+        ctx = json.loads(unquote(text))
+        return ctx if isinstance(ctx, dict) else {}
+    except ValueError:
+        return {}
+
+def extract_video_id(href: str, unified_entity_id: str, ctx: dict) -> str:
+    vid = str(ctx.get("video_id") or "").strip()
+    if vid.isdigit(): return vid
+    if unified_entity_id:
+        m = UNIFIED_ID_RE.search(unified_entity_id)
+        if m: return m.group(1)
+    if href:
+        m = WATCH_ID_RE.search(href)
+        if m: return m.group(1)
+    return ""
+
+def extract_tctx(href: str):
+    """parse_qs(urlparse(href).query).get("tctx", [None])[0], without building the full parse."""
+    if not href or "?" not in href:
+        return None
+    query = href.split("#", 1)[0].partition("?")[2]
+    for pair in query.split("&"):
+        name, eq, value = pair.partition("=")
+        if eq and value and unquote_plus(name) == "tctx":
+            return unquote_plus(value)
+    return None
+
+def collapse_ws(text: str) -> str:
+    return WHITESPACE_RE.sub(" ", text)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# List file formats (--format): CSV, gzip- or zstd-compressed CSV, JSON Lines and Parquet.
+#
+# Every format holds the same rows with the same columns, as text, so a list
+# reads back the same whatever it was saved as. Readers tell the formats apart
+# by their first bytes, not by the file name, so --csv-in takes any of them.
+# Writers stream: rows go out as they arrive (Parquet one row group at a time),
+# and each item is passed on downstream, like csvio.iter_write_csv.
+#
+# Parquet dictionary-encodes the columns (the long image_url, request_id,
+# lolomo_id, tctx... values repeated on every row are stored once per row group)
+# and compresses the pages with zstd.
+import codecs, json
+from importlib.util import find_spec
+from pathlib import Path
+from .csvio import gc_paused, iter_write_csv, read_items_from_csv, resolve_columns, row_reader
+
+FORMATS = ("csv", "csv.gz", "csv.zst", "jsonl", "parquet")
+SUFFIXES = {"csv": ".csv", "csv.gz": ".csv.gz", "csv.zst": ".csv.zst", "jsonl": ".jsonl", "parquet": ".parquet"}
+COMPRESSION = {"csv.gz": "gzip", "csv.zst": "zstd"}  # csvio's compression argument
+PARQUET_ROWS = 1 << 16  # rows per Parquet row group, buffered before each write
+PARQUET_COMPRESSION = "zstd"
+
+_MAGIC = ((b"\x1f\x8b", "csv.gz"), (b"\x28\xb5\x2f\xfd", "csv.zst"), (b"PAR1", "parquet"))
+_BY_SUFFIX = {".gz": "csv.gz", ".zst": "csv.zst", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+_REQUIRES = {"csv.zst": ("zstandard",), "parquet": ("pyarrow",)}
+
+class FormatUnavailable(ImportError):
+    """The format needs a package that is not installed."""
+    def __init__(self, fmt: str, missing: list):
+        self.format, self.missing = fmt, missing
+        self.pip = " ".join(missing)
+        super().__init__(f"format {fmt!r} needs: pip install {self.pip}")
+
+def missing_modules(fmt: str) -> list:
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r}, expected one of {FORMATS}")
+    if fmt == "csv.zst" and find_spec("compression") and find_spec("compression.zstd"): return []  # Python 3.14+
+    return [m for m in _REQUIRES.get(fmt, ()) if find_spec(m) is None]
+
+def check_format(fmt: str) -> str:
+    missing = missing_modules(fmt)
+    if missing: raise FormatUnavailable(fmt, missing)
+    return fmt
+
+def format_of(path: Path) -> str:
+    """The format a file name asks for (other suffixes are CSV)."""
+    return _BY_SUFFIX.get(path.suffix.lower(), "csv")
+
+def sniff_format(path: Path) -> str:
+    """The format of an existing file, from its first bytes."""
+    with open(path, "rb") as f:
+        head = f.read(64)
+    for magic, fmt in _MAGIC:
+        if head.startswith(magic): return fmt
+    if head.startswith(codecs.BOM_UTF8): head = head[len(codecs.BOM_UTF8):]
+    return "jsonl" if head.lstrip().startswith(b"{") else "csv"
+
+def _text(v) -> str:
+    """A value as the csv module would write it."""
+    return v if v.__class__ is str else "" if v is None else str(v)
+
+# ---------- JSON Lines ----------
+def iter_items_from_jsonl(path: Path, profile):
+    """Rows of a JSON Lines file, one object per line; the keys get the same aliasing as a CSV header."""
+    header, read = None, None
+    with open(path, "r", encoding="utf-8-sig") as f:
+        for line in f:
+            if not line.strip(): continue
+            obj = json.loads(line)
+            keys = list(obj)
+            if keys != header: header, read = keys, row_reader(keys, profile)  # once, unless the keys change
+            yield read(list(obj.values()))
+
+def iter_write_jsonl(items, out_path: Path, profile, fields=None):
+    fields = fields or profile.fields
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8", newline="\n") as f:
+        for it in items:
+            f.write(dumps({k: _text(it.get(k)) for k in fields}) + "\n")
+            yield it
+
+# ---------- Parquet ----------
+def _parquet_column(table, name: str) -> list:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    col = table.column(name)
+    if col.type != pa.string(): col = col.cast(pa.string())  # a file written by another tool
+    if col.null_count: col = pc.fill_null(col, "")
+    return col.to_pylist()
+
+def read_items_from_parquet(path: Path, profile) -> list:
+    """Rows of a Parquet file; only the columns the profile uses are decoded."""
+    import pyarrow.parquet as pq
+    header = pq.read_schema(path).names
+    def load(names):
+        table = pq.read_table(path, columns=names)
+        return {name: _parquet_column(table, name) for name in names}
+    with gc_paused():
+        columns = resolve_columns(header, profile, load) or {}
+        keys = list(columns)
+        return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+def iter_write_parquet(items, out_path: Path, profile, fields=None, row_group=PARQUET_ROWS):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    fields = fields or profile.fields
+    schema = pa.schema([(k, pa.string()) for k in fields])
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with pq.ParquetWriter(out_path, schema, use_dictionary=True, compression=PARQUET_COMPRESSION) as writer:
+        columns = [[] for _ in fields]
+        def flush():
+            writer.write_table(pa.Table.from_arrays([pa.array(c, pa.string()) for c in columns], schema=schema))
+            for c in columns: c.clear()
+        for it in items:
+            for k, c in zip(fields, columns): c.append(_text(it.get(k)))
+            if len(columns[0]) >= row_group: flush()
+            yield it
+        if columns[0]: flush()
+
+# ---------- Any format ----------
+def read_items(path: Path, profile) -> list:
+    """Every row of a list saved in any of the formats."""
+    fmt = check_format(sniff_format(path))
+    if fmt == "jsonl":
+        with gc_paused():
+            return list(iter_items_from_jsonl(path, profile))
+    if fmt == "parquet": return read_items_from_parquet(path, profile)
+    return read_items_from_csv(path, profile, COMPRESSION.get(fmt))
+
+def iter_write_items(items, out_path: Path, profile, fields=None, fmt="csv"):
+    """Write each item in the format as it arrives and pass it on downstream."""
+    if fmt == "jsonl": return iter_write_jsonl(items, out_path, profile, fields)
+    if fmt == "parquet": return iter_write_parquet(items, out_path, profile, fields)
+    return iter_write_csv(items, out_path, profile, fields, COMPRESSION.get(check_format(fmt)))
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Reading saved pages: the file is memory-mapped and decoded in its own encoding.
+#
+# The encoding comes from a byte-order mark, else from a <meta charset> (or an
+# http-equiv Content-Type) near the top of the page, else UTF-8. As in browsers,
+# "latin1"/"ascii" mean windows-1252 and a UTF-16 declaration without a BOM is
+# ignored. The stream engine decodes the map one chunk at a time, so a page of
+# hundreds of MB never exists as a whole string; a tree backend gets one string
+# decoded straight from the map, without a second copy of the bytes.
+import codecs, mmap, re
+from contextlib import contextmanager
+
+CHUNK_SIZE = 1 << 16
+SNIFF_BYTES = 4096  # browsers look at the first 1024; saved pages can put a long <head> first
+DEFAULT_ENCODING = "utf-8"
+ERRORS = "replace"  # an undecodable byte becomes U+FFFD instead of vanishing
+RELEASE_BYTES = 1 << 20  # decoded parts of the map handed back to the OS this often
+
+_BOMS = ((codecs.BOM_UTF8, "utf-8"), (codecs.BOM_UTF32_LE, "utf-32-le"), (codecs.BOM_UTF32_BE, "utf-32-be"),
+         (codecs.BOM_UTF16_LE, "utf-16-le"), (codecs.BOM_UTF16_BE, "utf-16-be"))
+_META_CHARSET = re.compile(rb"<meta\b[^>]*?charset\s*=\s*[\"']?\s*([\w.:+-]+)", re.IGNORECASE)
+_ALIASES = {"iso8859-1": "cp1252", "ascii": "cp1252"}  # WHATWG: both labels decode as windows-1252
+
+def _codec(label: str):
+    try:
+        info = codecs.lookup(label)
+    except LookupError:
+        return None
+    if not getattr(info, "_is_text_encoding", True): return None  # base64, rot13...
+    name = _ALIASES.get(info.name, info.name)
+    return DEFAULT_ENCODING if name.startswith(("utf-16", "utf-32")) else name
+
+def sniff_encoding(head: bytes) -> tuple:
+    """(encoding, BOM length) of a page starting with head."""
+    for bom, name in _BOMS:
+        if head.startswith(bom): return name, len(bom)
+    m = _META_CHARSET.search(head[:SNIFF_BYTES])
+    return (m and _codec(m.group(1).decode("ascii"))) or DEFAULT_ENCODING, 0
+
+@contextmanager
+def open_page(path):
+    """The file's bytes as a read-only memory map (b"" for an empty file)."""
+    with open(path, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # zero-length files can't be mapped
+            yield b""
+            return
+        with buf:
+            yield buf
+
+def decode_page(buf) -> str:
+    """The whole page as one string (for backends that build a tree anyway)."""
+    encoding, start = sniff_encoding(buf[:SNIFF_BYTES])
+    with memoryview(buf) as view, view[start:] as body:  # released before the map closes
+        return str(body, encoding, ERRORS)
+
+def iter_decoded(buf, chunk_size: int = CHUNK_SIZE):
+    """The page as text chunks; a character split between two chunks is carried over."""
+    encoding, start = sniff_encoding(buf[:SNIFF_BYTES])
+    decoder = codecs.getincrementaldecoder(encoding)(ERRORS)
+    advise = getattr(buf, "madvise", None)  # mmap on Unix; mapped pages would otherwise pile up in RSS
+    if advise: advise(mmap.MADV_SEQUENTIAL)
+    released = 0
+    for pos in range(start, len(buf), chunk_size):
+        text = decoder.decode(buf[pos:pos + chunk_size])
+        if text: yield text
+        done = (pos + chunk_size) // RELEASE_BYTES * RELEASE_BYTES
+        if advise and done > released:
+            advise(mmap.MADV_DONTNEED, released, done - released)  # read-only: re-read from disk if touched
+            released = done
+    text = decoder.decode(b"", final=True)
+    if text: yield text
+
+def read_chunks(path, chunk_size: int = CHUNK_SIZE):
+    """Text chunks of the page saved at path."""
+    with open_page(path) as buf:
+        yield from iter_decoded(buf, chunk_size)
+
+def read_page(path) -> str:
+    with open_page(path) as buf:
+        return decode_page(buf)
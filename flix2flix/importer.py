@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Import script (`import-script`): JS that adds a list's titles to the "My List"
+# of the Netflix account it is pasted into (browser console, on netflix.com).
+#
+# Unlike the README's loop (one popup at a time, fixed 6 + 1 + 2 s sleeps), the
+# script opens up to --concurrency title pages at once, paced --delay apart, and
+# waits for the buttons to show up instead of sleeping. Two pages out of the
+# last five that never show them (slow, throttled) halve the concurrency and
+# double the pause; five answered in a row win them back (AIMD, like TCP). One
+# title unavailable in the region alone doesn't slow anything down. Every
+# finished id is checkpointed
+# to localStorage under a key derived from the id list, so running the same
+# script again resumes where it stopped. Titles seen or removed in the list, or
+# already on the target account (--present), are left out when generating.
+#
+# The scheduler (runImport) never touches the DOM: the page driver, clock and
+# storage are passed in, so benchmarks/check_import.py runs it under Node
+# against a mock title page.
+import hashlib, json
+from pathlib import Path
+from .viewer import is_seen
+
+TITLE_URL = "https://www.netflix.com/title/"
+ADD_SELECTOR = 'button[data-uia="add-to-my-list"]'
+REMOVE_SELECTOR = 'button[data-uia="remove-from-my-list"]'
+DEFAULT_CONCURRENCY = 2
+DEFAULT_DELAY = 1.5      # seconds between two page opens, at full speed
+DEFAULT_MAX_DELAY = 60.0
+DEFAULT_RETRIES = 3      # attempts per id
+DEFAULT_TIMEOUT = 20.0   # seconds a page has to show its buttons
+WINDOW = 5               # last pages the pace is judged on
+POLL_MS = 250
+CHECKPOINT_PREFIX = "flix2flix_import_v1_"
+
+MESSAGES = {
+    "en": {
+        "start": "🚀 Importing {todo} titles ({skipped} already done in an earlier run)...",
+        "added": "✅ [{done}/{total}] {id} added",
+        "present": "⏩ [{done}/{total}] {id} already on the list",
+        "missing": "⚠️ [{done}/{total}] {id}: no button, maybe not available in your region",
+        "retry": "⏳ {id}: no answer ({status}), retrying later; now {width} at a time, {delay}s apart",
+        "failed": "❌ {id}: gave up after {tries} attempts (run the script again to retry)",
+        "done": "🎉 Import done: {added} added, {present} already there, {missing} unavailable, {failed} failed.",
+    },
+    "es": {
+        "start": "🚀 Importando {todo} títulos ({skipped} ya hechos en una ejecución anterior)...",
+        "added": "✅ [{done}/{total}] {id} añadido",
+        "present": "⏩ [{done}/{total}] {id} ya estaba en la lista",
+        "missing": "⚠️ [{done}/{total}] {id}: sin botón, quizá no está disponible en tu región",
+        "retry": "⏳ {id}: sin respuesta ({status}), se reintenta luego; ahora {width} a la vez, cada {delay}s",
+        "failed": "❌ {id}: descartado tras {tries} intentos (vuelve a ejecutar el script para reintentarlo)",
+        "done": "🎉 Importación terminada: {added} añadidos, {present} ya estaban, {missing} no disponibles, "
+                "{failed} fallidos.",
+    },
+}
+
+# runImport(ids, cfg, env) -> Promise of {added, present, missing, failed, skipped, opens, width, delay}
+#   env: {open(id, slot) -> Promise of "added" | "present" | "missing" | "error",
+#         sleep(ms) -> Promise, now() -> ms, store: {load(), save(state)}, log(kind, vars)}
+# pageDriver(cfg, win) -> {open, close()}: title pages in popups named per slot
+# localStore(key) -> the store over localStorage
+IMPORT_JS = r"""// Generated by flix2flix: adds the titles below to the "My List" of this account.
+// Paste it in the browser console of a netflix.com tab, signed in to the target
+// profile. Progress is saved in this browser: run it again to resume.
+(function (root) {
+  "use strict";
+  const CONFIG = __CONFIG__;
+  const IDS = __IDS__;
+
+  // ---------- Scheduling ----------
+  async function runImport(ids, cfg, env) {
+    const log = env.log || function () {};
+    const state = env.store.load() || {done: {}};
+    const queue = ids.filter(id => !state.done[id]);
+    const tries = new Map();
+    const stats = {added: 0, present: 0, missing: 0, failed: 0, skipped: ids.length - queue.length, opens: 0};
+    let width = cfg.concurrency, delay = cfg.delay, nextStart = 0, recent = [];
+    let done = stats.skipped;
+
+    // answered: whether the page showed its buttons; the pace follows the last cfg.window pages
+    function pace(answered) {
+      recent.push(answered);
+      if (recent.length > cfg.window) recent.shift();
+      const misses = recent.filter(a => !a).length;
+      if (!answered && misses >= 2) {
+        recent = [];
+        delay = Math.min(cfg.maxDelay, delay * 2);
+        width = Math.max(1, width >> 1);
+      } else if (answered && !misses && recent.length === cfg.window) {
+        recent = [];
+        delay = Math.max(cfg.delay, delay / 2);
+        width = Math.min(cfg.concurrency, width + 1);
+      }
+    }
+    function finish(id, status) {
+      state.done[id] = status;
+      env.store.save(state);
+      stats[status]++;
+      log(status, {id: id, done: ++done, total: ids.length});
+    }
+    async function worker(slot) {
+      while (queue.length) {
+        if (slot >= width) { await env.sleep(delay); continue; }  // parked until the pace allows it again
+        const now = env.now(), start = Math.max(nextStart, now);
+        nextStart = start + delay;  // opens are spaced delay apart across all workers
+        if (start > now) await env.sleep(start - now);
+        const id = queue.shift();
+        if (id === undefined) break;
+        const n = (tries.get(id) || 0) + 1;
+        tries.set(id, n);
+        stats.opens++;
+        let status;
+        try { status = await env.open(id, slot); } catch (e) { status = "error"; }
+        const answered = status === "added" || status === "present";
+        pace(answered);
+        if (answered) { finish(id, status); continue; }
+        if (n < cfg.retries) {
+          queue.push(id);
+          log("retry", {id: id, status: status, width: width, delay: delay / 1000});
+        } else if (status === "missing") {
+          finish(id, "missing");  // the page loaded every time without a button: not available here
+        } else {
+          stats.failed++;  // not checkpointed: the next run tries it again
+          log("failed", {id: id, tries: n});
+        }
+      }
+    }
+    log("start", {todo: queue.length, skipped: stats.skipped});
+    const workers = [];
+    for (let slot = 0; slot < cfg.concurrency; slot++) workers.push(worker(slot));
+    await Promise.all(workers);
+    stats.width = width;
+    stats.delay = delay;
+    log("done", stats);
+    return stats;
+  }
+
+  // ---------- Title pages in popups ----------
+  function pageDriver(cfg, win) {
+    const popups = [], seen = [];
+    const sleep = ms => new Promise(r => setTimeout(r, ms));
+    // test(doc) on the slot's document once a new one has loaded, until it returns something or time runs out
+    async function waitFor(slot, test) {
+      const end = Date.now() + cfg.timeout;
+      while (Date.now() < end) {
+        try {
+          const doc = popups[slot].document;
+          if (doc && doc !== seen[slot] && doc.readyState !== "loading") {
+            const found = test(doc);
+            if (found) return found;
+          }
+        } catch (e) { /* not reachable while it navigates */ }
+        await sleep(cfg.pollMs);
+      }
+      return null;
+    }
+    async function open(id, slot) {
+      const popup = win.open(cfg.titleUrl + id, "flix2flixImport" + slot, "width=800,height=600");
+      if (!popup) throw new Error("popup blocked");
+      popups[slot] = popup;
+      try {
+        const found = await waitFor(slot, doc => doc.querySelector(cfg.removeSelector) ? "present"
+                                                 : doc.querySelector(cfg.addSelector));
+        if (!found) return "missing";
+        if (found === "present") return "present";
+        found.click();
+        return await waitFor(slot, doc => doc.querySelector(cfg.removeSelector)) ? "added" : "error";
+      } finally {
+        try { seen[slot] = popup.document; } catch (e) { seen[slot] = null; }  // the next id must load a new one
+      }
+    }
+    return {open: open, close() { popups.forEach(p => { try { p.close(); } catch (e) {} }); }};
+  }
+
+  function localStore(key) {
+    return {
+      load() { try { return JSON.parse(localStorage.getItem(key)); } catch (e) { return null; } },
+      save(state) { try { localStorage.setItem(key, JSON.stringify(state)); } catch (e) {} },
+    };
+  }
+
+  function consoleLog(kind, vars) {
+    const text = CONFIG.text[kind].replace(/\{(\w+)\}/g, (m, k) => vars[k]);
+    (kind === "failed" ? console.warn : console.log)(text);
+  }
+
+  const api = {runImport: runImport, pageDriver: pageDriver, localStore: localStore, CONFIG: CONFIG, IDS: IDS};
+  if (typeof module === "object" && module.exports) { module.exports = api; return; }
+  const driver = pageDriver(CONFIG, root);
+  root.flix2flixImport = runImport(IDS, CONFIG, {
+    open: driver.open, sleep: ms => new Promise(r => setTimeout(r, ms)), now: () => Date.now(),
+    store: localStore(CONFIG.key), log: consoleLog,
+  }).finally(driver.close);
+})(typeof window !== "undefined" ? window : this);
+"""
+
+def import_ids(items, profile, present=(), include_seen=False) -> list:
+    """Ids to import, in list order, once each: no seen (unless include_seen), removed or present ones."""
+    skip, out = set(present), []
+    for it in items:
+        vid = str(it.get("id") or "").strip()
+        if not vid or vid in skip: continue
+        if is_seen(it.get(profile.removed_field)): continue
+        if not include_seen and is_seen(it.get(profile.seen_field)): continue
+        skip.add(vid)
+        out.append(vid)
+    return out
+
+def checkpoint_key(ids) -> str:
+    """localStorage key of a list's progress: another list starts afresh."""
+    return CHECKPOINT_PREFIX + hashlib.sha1("\n".join(ids).encode("utf-8")).hexdigest()[:12]
+
+def build_import_script(ids, profile, concurrency=DEFAULT_CONCURRENCY, delay=DEFAULT_DELAY,
+                        max_delay=DEFAULT_MAX_DELAY, retries=DEFAULT_RETRIES, timeout=DEFAULT_TIMEOUT,
+                        title_url=TITLE_URL, poll_ms=POLL_MS) -> str:
+    ids = list(ids)
+    config = {
+        "key": checkpoint_key(ids), "titleUrl": title_url,
+        "addSelector": ADD_SELECTOR, "removeSelector": REMOVE_SELECTOR,
+        "concurrency": max(1, concurrency), "delay": round(delay * 1000), "maxDelay": round(max_delay * 1000),
+        "retries": max(1, retries), "timeout": round(timeout * 1000), "pollMs": poll_ms,
+        "window": WINDOW, "text": MESSAGES[profile.lang],
+    }
+    dumps = lambda v: json.dumps(v, ensure_ascii=False).replace("</", "<\\/")
+    return IMPORT_JS.replace("__CONFIG__", dumps(config)).replace("__IDS__", dumps(ids))
+
+def write_import_script(items, out_path: Path, profile, present=(), include_seen=False, **options) -> int:
+    """Write the import script for items; returns how many ids it imports."""
+    ids = import_ids(items, profile, present, include_seen)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(build_import_script(ids, profile, **options), encoding="utf-8")
+    return len(ids)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Merge/sync a fresh "My List" parse into an existing progress CSV.
+#
+# The existing rows are indexed by id once, then the new parse is streamed
+# against that index: O(n) overall. The index only looks rows up: every
+# existing row is written back, repeated or keyless ones too. Existing rows keep their values (and so
+# their seen/visto flag), titles that are new get appended, and titles missing
+# from the new export are flagged as removed instead of being dropped.
+import csv, os
+from pathlib import Path
+
+def item_key(it: dict) -> str:
+    """Identity of a row: the Netflix id, falling back to url/href and title."""
+    for field in ("id", "url", "href_original", "title", "titulo"):
+        v = str(it.get(field) or "").strip()
+        if v: return f"{field}:{v}" if field != "id" else v
+    return ""
+
+class MergeStats:
+    def __init__(self):
+        self.added = self.removed = self.restored = self.unchanged = 0
+
+    def __str__(self):
+        return (f"{self.added} added, {self.removed} removed, {self.unchanged} unchanged"
+                + (f" ({self.restored} back on the list)" if self.restored else ""))
+
+class MergeResult:
+    """Merged rows (existing order, new titles at the end) and what has to be written."""
+    def __init__(self, rows, appended, rewrite, stats):
+        self.rows = rows
+        self.appended = appended  # rows added at the end
+        self.rewrite = rewrite    # an existing row changed (removed flag toggled)
+        self.stats = stats
+
+    @property
+    def changed(self) -> bool:
+        return self.rewrite or bool(self.appended)
+
+def merge_items(existing, fresh, removed_field="removed", key=item_key) -> MergeResult:
+    """Merge the fresh items into the existing rows, both any iterable of dicts.
+
+    Every existing row is kept, in order, keyless and repeated ones included:
+    the index only maps a key to its rows, which share the removed flag.
+    """
+    stats = MergeStats()
+    rows, index = list(existing), {}
+    for row in rows:
+        k = key(row)
+        if k: index.setdefault(k, []).append(row)
+    present, appended, rewrite = set(), [], False
+    for it in fresh:
+        k = key(it)
+        if not k or k in present: continue
+        present.add(k)
+        same = index.get(k)
+        if same is None:
+            appended.append(dict(it, **{removed_field: ""}))
+            stats.added += 1
+        elif any(row.get(removed_field) for row in same):
+            for row in same: row[removed_field] = ""
+            stats.restored += 1; rewrite = True
+        else:
+            stats.unchanged += 1
+    for k, same in index.items():
+        if k in present: continue
+        stats.removed += 1
+        for row in same:
+            if not row.get(removed_field):
+                row[removed_field] = "1"; rewrite = True
+    return MergeResult(rows + appended, appended, rewrite, stats)
+
+def read_header(csv_path: Path, encoding="utf-8-sig") -> list:
+    with open(csv_path, "r", encoding=encoding, newline="") as f:
+        return next(csv.reader(f), [])
+
+def merged_fields(base_fields, result: MergeResult, csv_path: Path, removed_field="removed") -> list:
+    """base_fields, plus the removed column once any row has been flagged."""
+    header = read_header(csv_path) if csv_path.exists() else []
+    extra = [removed_field] if removed_field in header or result.stats.removed else []
+    return list(base_fields) + [f for f in extra if f not in base_fields]
+
+def write_merged(result: MergeResult, csv_path: Path, fields, encoding="utf-8") -> str:
+    """Write only what changed: nothing, the appended rows, or (atomically) the whole file.
+
+    Returns "unchanged", "appended" or "rewritten".
+    """
+    if not result.changed and csv_path.exists():
+        return "unchanged"
+    if not result.rewrite and csv_path.exists() and read_header(csv_path) == list(fields):
+        # utf-8 on purpose: a utf-8-sig BOM belongs at the start of the file only
+        with open(csv_path, "a", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+            w.writerows(result.appended)
+        return "appended"
+    tmp = csv_path.with_name(f"{csv_path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding=encoding, newline="") as f:
+        w = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        w.writeheader()
+        w.writerows(result.rows)
+    os.replace(tmp, csv_path)
+    return "rewritten"
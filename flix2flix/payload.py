@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Compact columnar data payload for the generated viewers.
+#
+# Instead of one JSON object (or one prerendered card) per title, the viewer
+# gets parallel arrays: titles as strings, ids as integers (those a JS number
+# holds exactly), flags as a base64 bitset and URLs split into an index into a
+# shared prefix dictionary plus a short suffix. The browser decodes it with
+# DECODER_JS, building URLs lazily.
+import base64, json
+
+PAYLOAD_VERSION = 1
+DATA_MODES = ("inline", "external")
+SAME_AS_ID = 0  # URL suffix marker: "the row's own id", e.g. .../watch/<id>
+MAX_SAFE_INTEGER = 2 ** 53 - 1  # Number.MAX_SAFE_INTEGER: past it JSON.parse rounds
+
+def _compact_int(v):
+    # Only canonical integers that a JS number holds exactly become numbers, so String(n)
+    # in the browser gives the original text back
+    s = str(v if v is not None else "")
+    if s.isascii() and s.isdigit() and (s == "0" or not s.startswith("0")) and int(s) <= MAX_SAFE_INTEGER:
+        return int(s)
+    return s
+
+class ColumnarPayload:
+    """Accumulates rows into parallel arrays.
+
+    columns maps a column name to its kind:
+        "str"  -> list of strings
+        "int"  -> ints where the value is a canonical integer up to 2**53 - 1 (ids, rank), strings otherwise
+        "url"  -> {"p": [prefix index or -1], "s": [suffix, or SAME_AS_ID]}
+        "flag" -> base64 bitset, bit i set when the row's value is truthy
+    id_column names the column used for SAME_AS_ID URL suffixes. Anything put in
+    extra (e.g. the search index) ships alongside the columns.
+    """
+
+    def __init__(self, columns: dict, id_column: str = "id"):
+        self.columns = dict(columns)
+        self.id_column = id_column
+        self.n = 0
+        self.extra = {}
+        self.prefixes, self._prefix_index = [], {}
+        self._cols = {}
+        for name, kind in self.columns.items():
+            if kind == "url": self._cols[name] = {"p": [], "s": []}
+            elif kind == "flag": self._cols[name] = bytearray()
+            else: self._cols[name] = []
+
+    def _prefix(self, prefix: str) -> int:
+        idx = self._prefix_index.get(prefix)
+        if idx is None:
+            idx = self._prefix_index[prefix] = len(self.prefixes)
+            self.prefixes.append(prefix)
+        return idx
+
+    def add(self, row: dict):
+        i = self.n
+        row_id = str(row.get(self.id_column) or "")
+        for name, kind in self.columns.items():
+            value = row.get(name)
+            col = self._cols[name]
+            if kind == "str":
+                col.append("" if value is None else str(value))
+            elif kind == "int":
+                col.append(_compact_int(value))
+            elif kind == "url":
+                url = str(value or "")
+                if not url:
+                    col["p"].append(-1); col["s"].append("")
+                    continue
+                cut = url.rfind("/") + 1
+                prefix, suffix = url[:cut], url[cut:]
+                col["p"].append(self._prefix(prefix))
+                col["s"].append(SAME_AS_ID if row_id and suffix == row_id else suffix)
+            elif kind == "flag":
+                if i % 8 == 0: col.append(0)
+                if value: col[i // 8] |= 1 << (i % 8)
+        self.n += 1
+
+    def to_dict(self) -> dict:
+        cols = {}
+        for name, kind in self.columns.items():
+            col = self._cols[name]
+            cols[name] = base64.b64encode(bytes(col)).decode("ascii") if kind == "flag" else col
+        d = {"v": PAYLOAD_VERSION, "n": self.n, "prefixes": self.prefixes,
+             "idcol": self.id_column, "kinds": self.columns, "cols": cols}
+        if self.extra: d["x"] = self.extra
+        return d
+
+    def to_json(self) -> str:
+        # "<" is escaped so the JSON can sit inside a <script> block verbatim
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":")).replace("<", "\\u003c")
+
+def data_path_for(viewer_out):
+    """External payload file that sits next to the viewer: index.html -> index.data.json"""
+    return viewer_out.with_name(viewer_out.stem + ".data.json")
+
+# Loader + decoder used by both viewer templates. loadPayload() resolves to an
+# object with n, col(name) for plain columns, flags(name) -> Uint8Array,
+# url(name, i) which rebuilds a URL on demand and extra(name) for extra sections.
+DECODER_JS = r"""
+  function decodePayload(p) {
+    const cols = p.cols, flagCache = {};
+    return {
+      n: p.n,
+      col(name) { return cols[name]; },
+      extra(name) { return (p.x || {})[name]; },
+      flags(name) {
+        if (flagCache[name]) return flagCache[name];
+        const bin = atob(cols[name] || ''), out = new Uint8Array(p.n);
+        for (let i = 0; i < p.n; i++) out[i] = (bin.charCodeAt(i >> 3) >> (i & 7)) & 1;
+        return (flagCache[name] = out);
+      },
+      url(name, i) {
+        const c = cols[name], k = c.p[i];
+        if (k < 0) return '';
+        const s = c.s[i];
+        return p.prefixes[k] + (s === 0 ? String(cols[p.idcol][i]) : s);
+      },
+    };
+  }
+  function loadPayload() {
+    const tag = document.getElementById('mylist-data');
+    const src = tag.getAttribute('data-src');
+    if (src) return fetch(src).then(r => r.json()).then(decodePayload);
+    return Promise.resolve(decodePayload(JSON.parse(tag.textContent)));
+  }
+"""
+
+def payload_script_tag(payload: ColumnarPayload, viewer_out=None, data_mode: str = "inline"):
+    """The <script> tag that carries the payload, or points to <viewer>.data.json (written here)."""
+    if data_mode == "external":
+        data_path = data_path_for(viewer_out)
+        data_path.write_text(payload.to_json(), encoding="utf-8")
+        src = data_path.name.replace("&", "&amp;").replace('"', "&quot;")
+        return f'<script type="application/json" id="mylist-data" data-src="{src}"></script>'
+    return f'<script type="application/json" id="mylist-data">{payload.to_json()}</script>'
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Pipeline stages (HTML/CSV -> dedupe -> CSV -> viewer), chained lazily one item at a time.
+from pathlib import Path
+from . import profiling
+from .core import iter_page_cards, resolve_parser
+from .dedupe import DEFAULT_STRATEGIES, DEFAULT_THRESHOLD, Deduper
+from .formats import iter_write_items, read_items
+from .profiles import DEFAULT_BASE_URL, get_profile
+from .viewer import write_viewer_html
+
+def iter_items_from_html(html_file: Path, profile, base_url=DEFAULT_BASE_URL, engine="bs4", cache=None, parser="auto",
+                         prefilter=False):
+    """Rows of a saved page, one at a time (from the parse cache when given and valid)."""
+    return profiling.stage("parse", _iter_items_from_html(html_file, profile, base_url, engine, cache, parser,
+                                                          prefilter))
+
+def _iter_items_from_html(html_file, profile, base_url, engine, cache, parser, prefilter):
+    if cache is not None:
+        backend = engine if engine == "stream" else resolve_parser(parser)
+        if prefilter: backend += "+prefilter"
+        with profiling.span("hash html"):
+            key = cache.key(html_file, f"{profile.parser_version}|{backend}|{base_url}")
+        yield from cache.cached(key, lambda: _iter_items_from_html(html_file, profile, base_url, engine, None, parser,
+                                                                   prefilter))
+        return
+    cards = iter_page_cards(html_file, engine=engine, watch_fallback=profile.watch_fallback, parser=parser,
+                            prefilter=prefilter)
+    yield from profiling.stage("build rows", profile.iter_items(cards, base_url))
+
+def parse_html(html: str, profile, base_url=DEFAULT_BASE_URL, engine="bs4", parser="auto") -> list:
+    """Rows of an in-memory page."""
+    cards = iter_page_cards(html=html, engine=engine, watch_fallback=profile.watch_fallback, parser=parser)
+    return list(profiling.stage("build rows", profile.iter_items(cards, base_url)))
+
+def parse_html_file(html_file: Path, lang="en", base_url=DEFAULT_BASE_URL, engine="bs4", cache=None,
+                    parser="auto", prefilter=False) -> list:
+    # Top-level, and takes the profile by name, so it can be shipped to worker processes in batch mode
+    return list(iter_items_from_html(html_file, get_profile(lang), base_url=base_url, engine=engine, cache=cache,
+                                     parser=parser, prefilter=prefilter))
+
+def load_items(path: Path, lang="en", parser="auto", cache=None) -> list:
+    """Rows of a "My List" page or of a saved list (any --format); top-level for worker processes too."""
+    from .batch import HTML_SUFFIXES
+    if Path(path).suffix.lower() in HTML_SUFFIXES:
+        return parse_html_file(path, lang=lang, cache=cache, parser=parser)
+    return read_items(path, get_profile(lang))
+
+def dedupe_items(items, profile, by=DEFAULT_STRATEGIES, threshold=DEFAULT_THRESHOLD):
+    """First row of every group of duplicates; by picks the rules (see dedupe.py)."""
+    return Deduper(profile, by, threshold)(items)
+
+def run_pipeline(items, out_path: Path, viewer_out: Path, profile, dedupe=False, fields=None,
+                 data_mode="inline", posters=None, page_title=None, fmt="csv", accounts=None) -> int:
+    """Chain the stages lazily; returns the number of items written."""
+    if dedupe:  # True, or a dedupe.Deduper set up (and kept for its report) by the caller
+        if dedupe is True: dedupe = Deduper(profile)
+        items = profiling.stage("dedupe", dedupe(items))
+    items = profiling.stage(f"write {fmt}", iter_write_items(items, out_path, profile, fields, fmt))
+    return write_viewer_html(items, viewer_out, profile,
+                             page_title=page_title, data_mode=data_mode, posters=posters, accounts=accounts)
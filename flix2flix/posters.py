@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Poster download + thumbnail cache, so the viewer stops hotlinking full-size
+# nflxso.net images (which expire, and make the page slow).
+#
+# Posters are fetched on a bounded thread pool, each worker keeping one
+# kept-alive connection per host. With Pillow installed they are downscaled to
+# small WebP thumbnails; without it they are stored as downloaded. Files are
+# content-addressed (named by the hash of their bytes) and an index maps each
+# poster URL to its file, so re-runs only fetch what is missing. The ETag and
+# Last-Modified of every download are kept too: with refresh on, cached posters
+# are asked for again with If-None-Match / If-Modified-Since and a 304 keeps the
+# file without downloading it.
+import hashlib, http.client, io, json, os, threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+try:
+    from PIL import Image
+except ImportError:  # optional: pip install Pillow for WebP thumbnails
+    Image = None
+
+DEFAULT_WIDTH = 342  # Netflix's own 16:9 boxart width
+DEFAULT_QUALITY = 75
+DEFAULT_JOBS = 8
+INDEX_NAME = "index.json"
+VALIDATORS_NAME = "validators.json"
+USER_AGENT = "Flix2Flix-posters/1.0"
+
+def url_key(url: str) -> str:
+    """Same poster, same key: the query (?r=...) and fragment are dropped."""
+    p = urlsplit(url)
+    return f"{p.netloc}{p.path}"
+
+def _suffix(url: str, content_type: str) -> str:
+    ext = os.path.splitext(urlsplit(url).path)[1].lower()
+    if ext in (".jpg", ".jpeg", ".png", ".webp", ".gif"): return ext
+    return {"image/png": ".png", "image/webp": ".webp", "image/gif": ".gif"}.get(content_type.split(";")[0].strip(), ".jpg")
+
+def make_thumbnail(data: bytes, width=DEFAULT_WIDTH, quality=DEFAULT_QUALITY) -> bytes:
+    """Downscale to at most width pixels wide and re-encode as WebP (needs Pillow)."""
+    with Image.open(io.BytesIO(data)) as im:
+        im.draft("RGB", (width, width))  # JPEG: let the decoder skip most of the work
+        im = im.convert("RGB")
+        if im.width > width:
+            im = im.resize((width, max(1, round(im.height * width / im.width))), Image.LANCZOS)
+        out = io.BytesIO()
+        im.save(out, "WEBP", quality=quality, method=4)
+        return out.getvalue()
+
+class PosterFetcher:
+    """GETs with one reused connection per (thread, host); safe to call from a thread pool."""
+
+    def __init__(self, timeout: float = 20):
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def _conn(self, scheme: str, netloc: str):
+        pool = self._local.__dict__.setdefault("pool", {})
+        conn = pool.get((scheme, netloc))
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = pool[(scheme, netloc)] = cls(netloc, timeout=self.timeout)
+            with self._lock: self.connections_opened += 1
+        return conn
+
+    def _drop(self, scheme: str, netloc: str):
+        conn = self._local.__dict__.get("pool", {}).pop((scheme, netloc), None)
+        if conn: conn.close()
+
+    def get(self, url: str, validators=None):
+        """(body, content type, [etag, last modified]); raises OSError/HTTPException on failure.
+
+        With validators (from an earlier response) the request is conditional,
+        and body is None when the server answers 304 Not Modified.
+        """
+        p = urlsplit(url)
+        target = (p.path or "/") + (f"?{p.query}" if p.query else "")
+        headers = {"User-Agent": USER_AGENT}
+        etag, modified = validators or (None, None)
+        if etag: headers["If-None-Match"] = etag
+        if modified: headers["If-Modified-Since"] = modified
+        for attempt in (0, 1):
+            conn = self._conn(p.scheme, p.netloc)
+            try:
+                conn.request("GET", target, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.HTTPException, OSError):
+                self._drop(p.scheme, p.netloc)
+                if attempt: raise
+                continue  # the server closed the kept-alive connection: retry once on a new one
+            if resp.will_close: self._drop(p.scheme, p.netloc)
+            got = [resp.getheader("ETag"), resp.getheader("Last-Modified")]
+            if resp.status == 304 and validators:
+                return None, "", [got[0] or etag, got[1] or modified]
+            if resp.status != 200:
+                raise OSError(f"HTTP {resp.status} for {url}")
+            return body, resp.getheader("Content-Type", ""), got
+
+class PosterCache:
+    def __init__(self, cache_dir, width=DEFAULT_WIDTH, quality=DEFAULT_QUALITY, jobs=DEFAULT_JOBS, fetcher=None,
+                 refresh=False):
+        self.cache_dir = Path(cache_dir)
+        self.width, self.quality, self.jobs, self.refresh = width, quality, jobs, refresh
+        self.fetcher = fetcher or PosterFetcher()
+        # thumbnails of a different size/quality are different files
+        self.variant = f"webp{width}q{quality}" if Image is not None else "original"
+        self.index_path = self.cache_dir / INDEX_NAME
+        self.validators_path = self.cache_dir / VALIDATORS_NAME
+        self.index = self._load(self.index_path)
+        self.validators = self._load(self.validators_path)  # url_key -> [etag, last modified]
+        self.cached = self.fetched = self.failed = self.revalidated = 0
+
+    @staticmethod
+    def _load(path: Path) -> dict:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _key(self, url: str) -> str:
+        return f"{self.variant} {url_key(url)}"
+
+    def lookup(self, url: str):
+        name = self.index.get(self._key(url))
+        if name and (self.cache_dir / name).exists():
+            return self.cache_dir / name
+        return None
+
+    def _download(self, url: str, name=None) -> tuple:
+        """(file name, whether it was downloaded) of the poster at url; with name (the cached file)
+        the request is conditional."""
+        ukey = url_key(url)
+        data, content_type, validators = self.fetcher.get(url, self.validators.get(ukey) if name else None)
+        if any(validators): self.validators[ukey] = validators
+        if data is None: return name, False  # 304: the cached file is still current
+        if Image is not None:
+            data, ext = make_thumbnail(data, self.width, self.quality), ".webp"
+        else:
+            ext = _suffix(url, content_type)
+        name = hashlib.sha256(data).hexdigest()[:32] + ext
+        path = self.cache_dir / name
+        if not path.exists():
+            tmp = path.with_name(f"{name}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        return name, True
+
+    def save_index(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for path, data in ((self.index_path, self.index), (self.validators_path, self.validators)):
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_text(json.dumps(data, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, path)
+
+    def localize(self, items, base_dir: Path, field="image_url", out_field="image_local"):
+        """Pass items through, setting out_field to the poster's path relative to base_dir.
+
+        Downloads run ahead of the consumer on the thread pool, a bounded window
+        at a time, and items come out in their original order. Posters that fail
+        to download keep only their remote URL. With refresh, cached posters
+        are revalidated with a conditional request; one that can't be keeps its
+        cached file.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        base_dir = Path(base_dir).resolve()
+        rel = lambda name: Path(os.path.relpath(self.cache_dir.resolve() / name, base_dir)).as_posix()
+        window, inflight = deque(), {}
+
+        def resolve(it, key, fut):
+            if fut is not None:
+                try:
+                    name, downloaded = fut.result()
+                except Exception:
+                    if inflight.pop(key, None) is fut: self.failed += 1
+                    name = self.index.get(key)  # a failed revalidation keeps the cached file
+                    if name and not (self.cache_dir / name).exists():
+                        del self.index[key]
+                        name = None
+                    return set_local(it, name)
+                self.index[key] = name
+                if inflight.pop(key, None) is fut:
+                    if downloaded:
+                        self.fetched += 1
+                    else:
+                        self.revalidated += 1
+            return set_local(it, self.index.get(key))
+
+        def set_local(it, name):
+            if name: it[out_field] = rel(name)
+            return it
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as ex:
+            try:
+                for it in items:
+                    url, key, fut = it.get(field) or "", None, None
+                    if url:
+                        key = self._key(url)
+                        if key in inflight:
+                            fut = inflight[key]
+                        elif self.lookup(url):
+                            if self.refresh:
+                                fut = inflight[key] = ex.submit(self._download, url, self.index[key])
+                            else:
+                                self.cached += 1
+                        else:
+                            fut = inflight[key] = ex.submit(self._download, url)
+                    window.append((it, key, fut))
+                    while len(window) > self.jobs * 4:
+                        yield resolve(*window.popleft())
+                while window:
+                    yield resolve(*window.popleft())
+            finally:
+                for _, _, fut in window:
+                    if fut: fut.cancel()
+                self.save_index()
+
+    def names(self) -> dict:
+        """{url_key: file name} of the posters on disk, this size's thumbnails winning over other sizes'."""
+        out = {}
+        for key, name in sorted(self.index.items(), key=lambda kv: kv[0].startswith(self.variant + " ")):
+            if (self.cache_dir / name).exists(): out[key.split(" ", 1)[-1]] = name
+        return out
+
+    def summary(self) -> str:
+        return f"{self.fetched} downloaded, {self.cached + self.revalidated} already cached, {self.failed} failed"
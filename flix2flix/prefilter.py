@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Byte-level pre-filter (--prefilter): slices the title cards out of the raw page
+# so the HTML parser only sees them.
+#
+# A saved page is mostly inline scripts, styles and SVG; the cards are a small
+# part of it. The scan jumps from one data-ui-tracking-context attribute to the
+# next with bytes.find (skipping those inside <script>, <style> or comments),
+# widens each card to its enclosing div.title-card, looked for back to where the
+# previous card ended, and follows the tags to where that element closes. The
+# slices, in page order, make a small document that every engine turns into the
+# same cards as the whole page. A page the scan can't read (UTF-16/32) or where
+# it finds no card is parsed whole.
+import re
+from .htmlsource import CHUNK_SIZE, ERRORS, SNIFF_BYTES, open_page, sniff_encoding
+from .stream import VOID_TAGS
+
+MARKER = b"data-ui-tracking-context"
+
+_RAW = re.compile(rb"<(script|style)\b|<!--", re.IGNORECASE)
+_RAW_END = {b"script": re.compile(rb"</script\s*>", re.IGNORECASE),
+            b"style": re.compile(rb"</style\s*>", re.IGNORECASE)}
+_START = re.compile(rb"<([a-zA-Z][^\s/>]*)")
+_TAG = re.compile(rb"<(/?)([a-zA-Z][^\s/>]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>|<!--")
+_CLASS = re.compile(rb"""\sclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+_VOID = frozenset(t.encode() for t in VOID_TAGS)
+_SAME_TAG = {}  # tag name -> pattern of its start and end tags
+
+def _raw_end(buf, m) -> int:
+    """Offset past the comment, script or style that match m opened."""
+    if m.group(1) is None:
+        end = buf.find(b"-->", m.end())
+        return len(buf) if end < 0 else end + 3
+    close = _RAW_END[m.group(1).lower()].search(buf, m.end())
+    return close.end() if close else len(buf)
+
+def _walk_end(buf, start: int) -> int:
+    """Offset past the end tag of the element whose start tag is at start, following every tag."""
+    stack, pos = [], start
+    while True:
+        m = _TAG.search(buf, pos)
+        if m is None: return len(buf)
+        pos = m.end()
+        if m.group(2) is None:  # comment
+            pos = _raw_end(buf, m)
+            continue
+        name = m.group(2).lower()
+        if m.group(1):
+            if name in stack:  # a stray end tag is ignored, like the parsers do
+                del stack[len(stack) - 1 - stack[::-1].index(name):]
+                if not stack: return pos
+        elif name in _VOID or m.group(3).endswith(b"/"):
+            if not stack: return pos
+        elif name in _RAW_END:
+            pos = _raw_end(buf, _RAW.match(buf, m.start()))
+        else:
+            stack.append(name)
+
+def _start_tag(buf, lt: int, inside: int):
+    """Name of the start tag at lt (lowercase) when offset inside lies within that tag, else None."""
+    m = _START.match(buf, lt)
+    if m is None: return None
+    if buf.find(b">", lt, inside) >= 0:  # the tag ended before, unless that '>' was in a quoted value
+        full = _TAG.match(buf, lt)
+        if full is None or full.end() <= inside: return None
+    return m.group(1).lower()
+
+def _element_end(buf, start: int, name: bytes) -> int:
+    """Offset past the end of the element whose start tag is at start.
+
+    A saved page is the browser's serialization of the DOM, where every element
+    is closed, so counting the element's own start and end tags finds its end.
+    Only when that stretch holds a script, style or comment (which may contain
+    tags that aren't) are all the tags followed.
+    """
+    if name in _VOID:
+        m = _TAG.match(buf, start)
+        return m.end() if m else len(buf)
+    same = _SAME_TAG.get(name)
+    if same is None:
+        same = _SAME_TAG[name] = re.compile(rb"<(/?)%s[\s/>]" % re.escape(name), re.IGNORECASE)
+    depth = 0
+    for t in same.finditer(buf, start):
+        depth += -1 if t.group(1) else 1
+        if depth == 0:
+            end = buf.find(b">", t.start()) + 1
+            return end if _RAW.search(buf, start, end) is None else _walk_end(buf, start)
+    return _walk_end(buf, start)
+
+def _is_title_card(buf, lt: int, hit: int) -> bool:
+    """Whether the "title-card" at hit belongs to a <div class="... title-card ..."> tag starting at lt."""
+    if _start_tag(buf, lt, hit) != b"div": return False
+    c = _CLASS.search(buf, lt, buf.find(b">", hit) + 1)
+    return c is not None and b"title-card" in (c.group(1) or c.group(2) or c.group(3)).split()
+
+def _card_region(buf, tag_start: int, name: bytes, floor: int, raws: list) -> tuple:
+    """(start, end) of the innermost div.title-card around the card at tag_start, else of the card itself.
+
+    The wrapper is looked for between floor and the card, leaving out the
+    scripts, styles and comments (raws) found there.
+    """
+    hit = tag_start
+    while True:
+        hit = buf.rfind(b"title-card", floor, hit)
+        if hit < 0: break
+        lt = buf.rfind(b"<", floor, hit)
+        if lt < 0: break
+        if not any(s <= lt < e for s, e in raws) and _is_title_card(buf, lt, hit):
+            end = _element_end(buf, lt, b"div")
+            if end > tag_start: return lt, end
+        hit = lt
+    return tag_start, _element_end(buf, tag_start, name)
+
+def card_regions(buf) -> list:
+    """(start, end) byte ranges holding every card of the page, in page order, without overlaps."""
+    if sniff_encoding(buf[:SNIFF_BYTES])[0].startswith(("utf-16", "utf-32")):
+        return []  # not ASCII-compatible: the markers can't be found byte by byte
+    regions, pos, safe = [], 0, 0  # safe: where the last check for scripts/styles/comments ended
+    floor, raws = 0, []  # end of the last region, and the (start, end) of the raw text skipped since
+    while True:
+        hit = buf.find(MARKER, pos)
+        if hit < 0: return regions
+        raw = _RAW.search(buf, safe, hit)
+        if raw:  # the marker may sit inside it: go on after it
+            pos = safe = _raw_end(buf, raw)
+            raws.append((raw.start(), pos))
+            continue
+        safe = hit
+        lt = buf.rfind(b"<", pos, hit)
+        name = _start_tag(buf, lt, hit) if lt >= 0 and buf[hit - 1] in b" \t\r\n\f" else None  # lt >= 0: hit > 0
+        if name is None:
+            pos = hit + len(MARKER)  # the word in text or in another attribute's value
+            continue
+        start, end = _card_region(buf, lt, name, floor, raws)
+        regions.append((start, end))
+        pos = safe = floor = end
+        raws = []
+
+def iter_card_slices(path, regions, chunk_size: int = CHUNK_SIZE):
+    """The regions of the page saved at path as text chunks of a small document holding just its cards."""
+    yield "<html><body>\n"
+    with open_page(path) as buf:
+        encoding, _ = sniff_encoding(buf[:SNIFF_BYTES])
+        parts, size = [], 0
+        for start, end in regions:
+            parts.append(str(buf[start:end], encoding, ERRORS))
+            size += end - start
+            if size >= chunk_size:
+                yield "\n".join(parts) + "\n"
+                parts, size = [], 0
+        if parts: yield "\n".join(parts) + "\n"
+    yield "</body></html>"
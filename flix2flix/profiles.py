@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Locale/schema profiles: how a card record (core.py) becomes a CSV row.
+#
+#   "en" -> 4 columns (title, id, url, seen), the viewer published as index.html
+#   "es" -> 22 columns with the full tracking context, "visto", posters, links
+from urllib.parse import urljoin
+from . import profiling
+from .extract import parse_ctx, extract_video_id, extract_tctx, collapse_ws, WATCH_ID_RE
+from .stream import anchor_text, fallback_text
+
+DEFAULT_BASE_URL = "https://www.netflix.com"
+
+def card_title(anchor: dict, card: dict, with_text: bool = False) -> str:
+    """aria-label, then the fallback text, then the poster's alt (then the link text)."""
+    aria = (anchor["attrs"].get("aria-label") or "").strip()
+    if aria:
+        profiling.count("title: aria-label")
+        return aria
+    fb = fallback_text(card)
+    if fb:
+        profiling.count("title: fallback-text")
+        return fb
+    img = anchor["img"]
+    alt = ((img.get("alt") if img else "") or "").strip()
+    if alt or not with_text:
+        profiling.count("title: img alt" if alt else "title: none")
+        return alt
+    text = collapse_ws(anchor_text(anchor).strip())
+    profiling.count("title: anchor text" if text else "title: none")
+    return text
+
+class Profile:
+    name = ""
+    lang = ""
+    fields = []
+    title_field, seen_field, removed_field = "title", "seen", "removed"
+    aliases = {}  # row key -> other CSV columns it is read from while empty (see csv_fields)
+    csv_encoding = "utf-8"
+    watch_fallback = False
+    parser_version = ""  # bump whenever parsing changes, to invalidate cached parses
+    page_title = "Netflix My List – Viewer"
+    viewer_out = "index.html"
+
+    def item(self, card: dict, base_url: str = DEFAULT_BASE_URL):
+        """CSV row for a card record, or None to skip the card."""
+        raise NotImplementedError
+
+    def csv_fields(self, header: list) -> list:
+        """Keys of the rows read from a CSV with this header: its columns, plus any key found under an alias."""
+        return list(header) + [k for k, alts in self.aliases.items()
+                               if k not in header and any(a in header for a in alts)]
+
+    def read_row(self, row: dict) -> dict:
+        """Normalize a row read back from a CSV (csvio.row_reader does the same for a whole file)."""
+        return {k: next((row[c] for c in (k, *self.aliases.get(k, ())) if row.get(c)), "")
+                for k in self.csv_fields(list(row))}
+
+    def dedupe_key(self, it: dict) -> str:
+        return (it.get("id") or "").strip()
+
+    def iter_items(self, cards, base_url: str = DEFAULT_BASE_URL):
+        for card in cards:
+            it = self.item(card, base_url)
+            if it is not None: yield it
+            else: profiling.count("cards skipped")
+
+class EnglishProfile(Profile):
+    name, lang = "english", "en"
+    fields = ["title", "id", "url", "seen"]
+    aliases = {"title": ("titulo",), "seen": ("visto",), "removed": ("eliminado",)}
+    parser_version = "en-3.2"
+
+    def item(self, card, base_url=DEFAULT_BASE_URL):
+        if card["kind"] != "card" or card["tag"] != "div": return None
+        anchor = card["anchor"]
+        if not anchor: return None
+        href_orig = anchor["attrs"].get("href") or ""
+        href_clean = href_orig.split("?")[0] if href_orig else ""
+        url_full = urljoin(base_url, href_clean) if href_clean else ""
+
+        ctx = parse_ctx(card["attrs"].get("data-ui-tracking-context", ""))
+        unified_id = card["attrs"].get("data-unified-entity-id") or ""
+        video_id = extract_video_id(href_clean, unified_id, ctx)
+        if not video_id: return None
+
+        return {
+            "title": card_title(anchor, card) or f"Unknown_{video_id}",
+            "id": video_id,
+            "url": url_full,
+            "seen": "" # Default empty for new extractions
+        }
+
+    def csv_fields(self, header):
+        return self.fields + [self.removed_field]
+
+class SpanishProfile(Profile):
+    name, lang = "spanish", "es"
+    fields = [
+        "titulo","id","url","href_original","unifiedEntityId","list_id","location",
+        "rank","row","track_id","request_id","lolomo_id","image_key","supp_video_id",
+        "appView","image_url","aria_label","titulo_fallback","container_id",
+        "tracking_uuid","tctx","visto"
+    ]
+    title_field, seen_field, removed_field = "titulo", "visto", "eliminado"
+    aliases = {"titulo": ("title",), "visto": ("seen",), "eliminado": ("removed",)}
+    csv_encoding = "utf-8-sig"  # Excel abre bien los acentos
+    watch_fallback = True
+    parser_version = "es-3.3"
+    page_title = "Netflix My List – Viewer (Con Visto)"
+    viewer_out = "netflix_mylist_viewer.html"
+
+    def _empty(self, titulo, vid, base_url, href, image_url):
+        # fila de la pasada "fallback" (solo enlaces /watch/): sin contexto de tracking
+        return {
+            "titulo": titulo, "id": vid, "url": urljoin(base_url, f"/watch/{vid}"),
+            "href_original": href,
+            "unifiedEntityId": "", "list_id": "", "location": "", "rank": "",
+            "row": "", "track_id": "", "request_id": "", "lolomo_id": "",
+            "image_key": "", "supp_video_id": "", "appView": "",
+            "image_url": image_url, "aria_label": "", "titulo_fallback": "",
+            "container_id": "", "tracking_uuid": "", "tctx": "", "visto": "",
+        }
+
+    def item(self, card, base_url=DEFAULT_BASE_URL):
+        a = card["anchor"] if card["kind"] == "watch" else card["href_anchor"]
+        if not a: return None
+        href = a["attrs"].get("href","")
+        img = a["img"]
+        image_url = img.get("src","").strip() if img else ""
+        if card["kind"] == "watch":
+            m = WATCH_ID_RE.search(href)
+            if not m: return None
+            aria = a["attrs"].get("aria-label")
+            titulo = (aria or anchor_text(a)).strip()
+            profiling.count("title: none" if not titulo else "title: aria-label" if aria else "title: anchor text")
+            titulo = titulo or "(sin título)"
+            return self._empty(titulo, m.group(1), base_url, href, image_url)
+
+        ctx = parse_ctx(card["attrs"].get("data-ui-tracking-context",""))
+        unified = str(ctx.get("unifiedEntityId") or "")
+        vid = extract_video_id(href, unified, ctx)
+        url = urljoin(base_url, f"/watch/{vid}") if vid else urljoin(base_url, href)
+        return {
+            "titulo": card_title(a, card, with_text=True) or "(sin título)", "id": vid, "url": url,
+            "href_original": href,
+            "unifiedEntityId": unified, "list_id": ctx.get("list_id",""),
+            "location": ctx.get("location",""), "rank": ctx.get("rank",""),
+            "row": ctx.get("row",""), "track_id": ctx.get("track_id",""),
+            "request_id": ctx.get("request_id",""), "lolomo_id": ctx.get("lolomo_id",""),
+            "image_key": ctx.get("image_key",""), "supp_video_id": ctx.get("supp_video_id",""),
+            "appView": ctx.get("appView",""), "image_url": image_url,
+            "aria_label": "", "titulo_fallback": "", "container_id": card["container_id"],
+            "tracking_uuid": card["attrs"].get("data-tracking-uuid",""), "tctx": extract_tctx(href),
+            "visto": "",
+        }
+
+    def dedupe_key(self, it):
+        # dedupe por id/href, se queda con el primero
+        return (it.get("id") or it.get("href_original") or "").strip()
+
+PROFILES = {p.lang: p for p in (EnglishProfile(), SpanishProfile())}
+
+def get_profile(lang: str) -> Profile:
+    try:
+        return PROFILES[lang]
+    except KeyError:
+        raise ValueError(f"unknown profile {lang!r}, expected one of {sorted(PROFILES)}") from None
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Opt-in run profiling (--profile): wall/CPU time, peak traced memory and item
+# counts per stage, plus event counters (e.g. which title fallback each card took).
+#
+# The pipeline is a chain of generators, so stages run nested inside each other:
+# pulling one row through "write csv" runs "build rows", "walk cards"... inside it.
+# Every stage therefore reports its self time (nested stages subtracted) next to
+# its inclusive time. With no Profiler running, stage() hands the iterable back
+# untouched, span() is a shared null context and count() is one global check.
+import time, tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+ACTIVE = None
+_NULL = nullcontext()
+
+def stage(name: str, iterable):
+    """iterable, timed item by item as stage `name` while a Profiler runs."""
+    return iterable if ACTIVE is None else ACTIVE.stage(name, iterable)
+
+def span(name: str):
+    """Context manager timing one block as stage `name` while a Profiler runs."""
+    return _NULL if ACTIVE is None else ACTIVE.span(name)
+
+def count(key: str, n: int = 1):
+    if ACTIVE is not None: ACTIVE.counts[key] += n
+
+class _Frame:
+    __slots__ = ("name", "wall", "cpu", "child_wall", "child_cpu", "peak")
+
+    def __init__(self, name):
+        self.name, self.wall, self.cpu = name, time.perf_counter(), time.process_time()
+        self.child_wall = self.child_cpu = 0.0
+        self.peak = 0
+
+class Profiler:
+    """Collects stage timings while started; report() / to_dict() summarize them.
+
+    With cprofile_stage set, cProfile runs only while that stage (and whatever
+    it calls) is executing; dump it with save_cprofile().
+    """
+
+    def __init__(self, memory: bool = True, cprofile_stage: str = None):
+        self.memory, self.cprofile_stage = memory, cprofile_stage
+        self.stages = {}     # name -> totals, in the order stages first finished
+        self.counts = Counter()
+        self._stack = []
+        self._cprofile, self._cprofile_depth = None, 0
+        self.wall = self.cpu = 0.0
+        self.peak = 0
+
+    # ----- lifecycle -----
+    def start(self):
+        global ACTIVE
+        if self.cprofile_stage:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+        if self.memory and not tracemalloc.is_tracing(): tracemalloc.start()
+        self._root = _Frame("total")
+        self._stack = [self._root]
+        ACTIVE = self
+        return self
+
+    def stop(self):
+        global ACTIVE
+        ACTIVE = None
+        root = self._root
+        self.wall, self.cpu = time.perf_counter() - root.wall, time.process_time() - root.cpu
+        if self.memory:
+            self.peak = max(root.peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    __enter__ = start
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ----- bookkeeping -----
+    def _enter(self, name) -> _Frame:
+        if self.memory:  # the peak so far belongs to the stage we are leaving for a nested one
+            parent = self._stack[-1]
+            parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        if name == self.cprofile_stage:
+            if self._cprofile_depth == 0: self._cprofile.enable()
+            self._cprofile_depth += 1
+        frame = _Frame(name)
+        self._stack.append(frame)
+        return frame
+
+    def _exit(self, frame: _Frame, items: int = 0):
+        wall, cpu = time.perf_counter() - frame.wall, time.process_time() - frame.cpu
+        self._stack.pop()
+        parent = self._stack[-1]
+        parent.child_wall += wall
+        parent.child_cpu += cpu
+        if frame.name == self.cprofile_stage:
+            self._cprofile_depth -= 1
+            if self._cprofile_depth == 0: self._cprofile.disable()
+        st = self.stages.get(frame.name)
+        if st is None:
+            st = self.stages[frame.name] = {"items": 0, "calls": 0, "wall": 0.0, "cpu": 0.0,
+                                            "self_wall": 0.0, "self_cpu": 0.0, "peak": 0}
+        st["items"] += items
+        st["calls"] += 1
+        st["wall"] += wall
+        st["cpu"] += cpu
+        st["self_wall"] += wall - frame.child_wall
+        st["self_cpu"] += cpu - frame.child_cpu
+        if self.memory:
+            peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            st["peak"] = max(st["peak"], peak)
+            parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+
+    def stage(self, name, iterable):
+        it = iter(iterable)
+        while True:
+            frame = self._enter(name)
+            try:
+                item = next(it)
+            except StopIteration:
+                self._exit(frame)
+                return
+            except BaseException:
+                self._exit(frame)
+                raise
+            self._exit(frame, 1)
+            yield item
+
+    @contextmanager
+    def span(self, name):
+        frame = self._enter(name)
+        try:
+            yield
+        finally:
+            self._exit(frame)
+
+    # ----- output -----
+    def save_cprofile(self, path):
+        self._cprofile.dump_stats(str(path))
+
+    def to_dict(self) -> dict:
+        mb = lambda b: round(b / (1 << 20), 2)
+        return {
+            "wall_s": round(self.wall, 4), "cpu_s": round(self.cpu, 4),
+            "peak_mb": mb(self.peak) if self.memory else None,
+            "stages": [{"stage": name, "items": st["items"], "calls": st["calls"],
+                        "wall_s": round(st["wall"], 4), "self_wall_s": round(st["self_wall"], 4),
+                        "cpu_s": round(st["cpu"], 4), "self_cpu_s": round(st["self_cpu"], 4),
+                        "peak_mb": mb(st["peak"]) if self.memory else None}
+                       for name, st in self.stages.items()],
+            "counts": dict(sorted(self.counts.items())),
+        }
+
+    def report(self) -> str:
+        d = self.to_dict()
+        lines = [f"{'stage':<18}{'items':>9}{'self s':>9}{'cpu s':>9}{'incl s':>9}{'peak MB':>9}"]
+        for st in d["stages"]:
+            peak = f"{st['peak_mb']:>9.1f}" if self.memory else f"{'-':>9}"
+            lines.append(f"{st['stage']:<18}{st['items'] or '':>9}{st['self_wall_s']:>9.3f}{st['self_cpu_s']:>9.3f}"
+                         f"{st['wall_s']:>9.3f}{peak}")
+        peak = f"{d['peak_mb']:>9.1f}" if self.memory else f"{'-':>9}"
+        lines.append(f"{'total':<18}{'':>9}{d['wall_s']:>9.3f}{d['cpu_s']:>9.3f}{d['wall_s']:>9.3f}{peak}")
+        if self.memory: lines.append("(times include tracemalloc overhead; --profile-no-memory for exact ones)")
+        for key, n in d["counts"].items():
+            lines.append(f"  {key:<30}{n:>9}")
+        return "\n".join(lines)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Search index for the viewers, built in Python while the payload is written.
+#
+# Titles are folded (accents stripped, lowercased, punctuation -> single spaces)
+# the same way SEARCH_JS folds what the user types, so "elite" finds "Élite" and
+# "nino" finds "Niño". The index ships with the payload as:
+#   "tri":   trigram -> rows containing it inside a word
+#   "pre":   1-2 char word prefix -> rows with a word starting with it
+#   "order": {"title": rows sorted by collation key}, so sorting is a walk, not a sort
+# Row lists are varint strings (5 bits per char, postings delta-encoded), about
+# half the size of JSON arrays. A query matches a row when every word of it
+# does: words of 3+ characters anywhere in the title, shorter ones at the start
+# of a title word. Candidates are checked against the folded title in the browser.
+import re, unicodedata
+from collections import defaultdict
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+def fold(s: str) -> str:
+    """Accent/case-insensitive form of s (mirrors fold() in SEARCH_JS)."""
+    s = unicodedata.normalize("NFKD", s or "")
+    if not s.isascii():
+        s = "".join(c for c in s if not unicodedata.category(c).startswith("M"))
+    return _NON_WORD.sub(" ", s.lower()).strip()
+
+def collation_key(s: str) -> tuple:
+    # base letters first, then accents, then case (lowercase first), like Intl.Collator
+    s = s or ""
+    return (fold(s), s.lower(), s.swapcase())
+
+VARINT_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_"
+
+def varint(values, delta: bool = False) -> str:
+    """Non-negative ints as one string: 5 bits per char, low bits first, bit 6 = more follows."""
+    out, prev = [], 0
+    for v in values:
+        if delta: v, prev = v - prev, v
+        while True:
+            group, v = v & 31, v >> 5
+            out.append(VARINT_ALPHABET[group | (32 if v else 0)])
+            if not v: break
+    return "".join(out)
+
+class SearchIndex:
+    """Add titles in row order, then to_dict() for the payload."""
+
+    def __init__(self):
+        self.n = 0
+        self.tri = defaultdict(list)
+        self.pre = defaultdict(list)
+        self._keys = []
+
+    def add(self, title: str):
+        i = self.n
+        self.n += 1
+        f = fold(title)
+        grams, prefixes = set(), set()
+        for w in f.split():
+            prefixes.add(w[:1]); prefixes.add(w[:2])
+            grams.update(w[k:k + 3] for k in range(len(w) - 2))
+        for g in grams: self.tri[g].append(i)
+        for p in prefixes: self.pre[p].append(i)
+        self._keys.append(collation_key(title))
+
+    def to_dict(self) -> dict:
+        keys = self._keys
+        return {
+            "tri": {g: varint(rows, delta=True) for g, rows in self.tri.items()},
+            "pre": {p: varint(rows, delta=True) for p, rows in self.pre.items()},
+            "order": {"title": varint(sorted(range(self.n), key=keys.__getitem__))},
+        }
+
+# Browser side, shared by both viewers. makeSearch(index, titles) returns
+#   match(query) -> Uint8Array mask of matching rows, or null when the query is empty
+#   sorted(name) -> precomputed order of every row (e.g. "title")
+SEARCH_JS = r"""
+  function fold(s) {
+    return s.normalize('NFKD').replace(/\p{M}+/gu, '').toLowerCase().replace(/[^\p{L}\p{N}]+/gu, ' ').trim();
+  }
+  const VARINT = {};
+  Array.from('__VARINT_ALPHABET__', (c, k) => VARINT[c] = k);
+  function unpackRows(str, delta) {
+    const out = [];
+    for (let k = 0, v = 0, shift = 0, prev = 0; k < str.length; k++) {
+      const g = VARINT[str[k]];
+      v |= (g & 31) << shift;
+      if (g & 32) { shift += 5; continue; }
+      out.push(delta ? (prev += v) : v);
+      v = 0; shift = 0;
+    }
+    return out;
+  }
+  function makeSearch(idx, titles) {
+    const n = titles.length, folded = new Array(n), cache = {}, orders = {}, counts = new Uint16Array(n);
+    const foldedAt = i => folded[i] === undefined ? (folded[i] = fold(titles[i])) : folded[i];
+    function postings(table, key) {
+      const ck = table + ':' + key;
+      return cache[ck] || (cache[ck] = unpackRows(idx[table][key] || '', true));
+    }
+    return {
+      sorted(name) { return orders[name] || (orders[name] = unpackRows(idx.order[name], false)); },
+      match(query) {
+        const words = fold(query).split(' ').filter(Boolean);
+        if (!words.length) return null;
+        const mask = new Uint8Array(n), lists = [];
+        for (const w of words) {
+          if (w.length < 3) lists.push(postings('pre', w));
+          else for (let k = 0; k + 3 <= w.length; k++) lists.push(postings('tri', w.slice(k, k + 3)));
+        }
+        lists.sort((a, b) => a.length - b.length);
+        if (!lists[0].length) return mask;
+        counts.fill(0);
+        for (const l of lists) for (let k = 0; k < l.length; k++) counts[l[k]]++;
+        const long = words.filter(w => w.length >= 3);
+        for (const i of lists[0]) {
+          if (counts[i] === lists.length && long.every(w => foldedAt(i).includes(w))) mask[i] = 1;
+        }
+        return mask;
+      },
+    };
+  }
+""".replace("__VARINT_ALPHABET__", VARINT_ALPHABET)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Browser-side seen state and CSV export, shared by both viewers.
+#
+# Seen changes are kept by video id in IndexedDB (database "flix2flix:<store>",
+# store "seen"), so they survive a reload without exporting. Every viewer file
+# has its own store (see store_name): file:// pages all share one origin, and
+# the viewers of different profiles must not mark each other's titles. Each
+# change also records the file's flag it replaced; once the file says otherwise
+# (regenerated from a newer list) the file wins. Writes are batched: a change
+# lands in memory at once and reaches the database in one transaction a moment
+# later (or when the page is hidden). Where IndexedDB is unavailable (some
+# browsers block it for file:// pages) the same map goes to localStorage.
+#
+# The export is built from the in-memory rows, never from the DOM, in blocks of
+# lines kept between exports: a block is rebuilt only when one of its rows
+# changed, and the blocks go straight into a Blob instead of one big string.
+import hashlib, json
+
+SEEN_DB, SEEN_STORE = "flix2flix", "seen"
+FALLBACK_KEY = "flix2flix_seen_v2"
+
+def store_name(viewer: str, profile) -> str:
+    """Seen store of a viewer (its resolved output path, or its page title when it has none)."""
+    return f"{profile.lang}-" + hashlib.sha1(viewer.encode("utf-8")).hexdigest()[:12]
+
+def seen_js(store: str) -> str:
+    return SEEN_JS.replace("__SEEN_NS__", json.dumps(store))
+
+# openSeenStore(legacyKey) -> Promise of {get(key, fileValue), set(key, value, fileValue), flush(), onchange(fn)};
+#   fileValue is the title's flag in the viewer's data; get() is true/false for
+#   titles the user marked while the file had that flag, undefined for the rest.
+#   A legacyKey names an older localStorage map ({key: true}) to import once.
+#   On a page served by `serve` (a #mylist-sync tag, see serve.py) the changes
+#   are POSTed to the server instead, and onchange(fn) gets those of other tabs.
+# rowsByKey(n, keyOf) -> Map key -> rows with that key (a title can be listed twice)
+# makeCsvExport(header, lineOf) -> {changed(i), blob(rows)}
+SEEN_JS = r"""
+  function openSeenStore(legacyKey) {
+    const ns = __SEEN_NS__;
+    const map = new Map(), bases = new Map(), pending = new Map(), listeners = [];  // bases: the file's flag then
+    let write = null, timer = 0;
+    function readLocal(key) {
+      try { return JSON.parse(localStorage.getItem(key) || '{}'); } catch (e) { return {}; }
+    }
+    function flush() {
+      clearTimeout(timer); timer = 0;
+      if (!pending.size) return;
+      const batch = new Map(pending);
+      pending.clear();
+      write(batch);
+    }
+    function entry(k, x) {  // [value, file's flag] as saved (a bare value when imported)
+      if (Array.isArray(x)) { map.set(k, x[0]); if (x[1] != null) bases.set(k, x[1]); } else map.set(k, x);
+    }
+    const saved = k => [map.get(k), bases.has(k) ? bases.get(k) : null];
+    const store = {
+      get(key, fileValue) {
+        const b = bases.get(key);
+        if (b === undefined || b === fileValue) return map.get(key);
+        // the file changed since (a newer list): it wins, and the old mark is dropped
+        map.delete(key); bases.delete(key); pending.set(key, undefined);
+        if (!timer) timer = setTimeout(flush, 400);
+      },
+      set(key, value, fileValue) {
+        map.set(key, value); pending.set(key, value);
+        if (fileValue !== undefined) bases.set(key, fileValue);
+        if (!timer) timer = setTimeout(flush, 400);
+      },
+      flush,
+      onchange(fn) { listeners.push(fn); },
+    };
+    window.addEventListener('pagehide', flush);
+    document.addEventListener('visibilitychange', () => { if (document.visibilityState === 'hidden') flush(); });
+
+    function importLegacy() {
+      const old = legacyKey ? readLocal(legacyKey) : {};
+      const keys = Object.keys(old).filter(k => old[k] && !map.has(k));
+      if (!keys.length) return;
+      keys.forEach(k => store.set(k, true));
+      flush();
+    }
+    function useLocal() {
+      write = () => {
+        const all = {};
+        map.forEach((v, k) => { all[k] = saved(k); });
+        try { localStorage.setItem('__FALLBACK_KEY__:' + ns, JSON.stringify(all)); } catch (e) {}
+      };
+      for (const [k, x] of Object.entries(readLocal('__FALLBACK_KEY__:' + ns))) entry(k, x);
+      importLegacy();
+      return store;
+    }
+    function useServer(cfg) {
+      // the page already carries the server's state: only changes are exchanged
+      const inflight = new Map();
+      let version = cfg.version;
+      write = batch => {
+        batch.forEach((v, k) => inflight.set(k, v));
+        fetch(cfg.api, {method: 'POST', headers: {'Content-Type': 'application/json'}, keepalive: true,
+                        body: JSON.stringify({changes: Object.fromEntries(batch)})})
+          .then(r => { if (!r.ok) throw new Error(r.status); })
+          .catch(() => batch.forEach((v, k) => { if (!pending.has(k)) store.set(k, v); }))  // retried later
+          .finally(() => batch.forEach((v, k) => { if (inflight.get(k) === v) inflight.delete(k); }));
+      };
+      (function poll() {
+        fetch(cfg.api + '?since=' + version + '&boot=' + encodeURIComponent(cfg.boot))
+          .then(r => r.json())
+          .then(d => {
+            if (d.reload) return location.reload();
+            version = d.version;
+            for (const [k, v] of Object.entries(d.changes)) {
+              if (pending.has(k) || inflight.has(k) || (map.get(k) ?? null) === v) continue;
+              map.set(k, v);
+              listeners.forEach(fn => fn(k, v));
+            }
+          })
+          .catch(() => {})
+          .then(() => setTimeout(poll, cfg.poll));
+      })();
+      return store;
+    }
+
+    const sync = document.getElementById('mylist-sync');
+    if (sync) return Promise.resolve(useServer(JSON.parse(sync.textContent)));
+    return new Promise(resolve => {
+      let req;
+      try { req = indexedDB.open('__DB__:' + ns, 1); } catch (e) { return resolve(useLocal()); }
+      req.onupgradeneeded = () => req.result.createObjectStore('__STORE__');
+      req.onerror = () => resolve(useLocal());
+      req.onsuccess = () => {
+        const db = req.result;
+        const tx = db.transaction('__STORE__'), st = tx.objectStore('__STORE__');
+        const keys = st.getAllKeys(), values = st.getAll();
+        tx.oncomplete = () => {
+          write = batch => {
+            const st = db.transaction('__STORE__', 'readwrite').objectStore('__STORE__');
+            batch.forEach((v, k) => { if (map.has(k)) st.put(saved(k), k); else st.delete(k); });
+          };
+          keys.result.forEach((k, j) => entry(k, values.result[j]));
+          importLegacy();
+          if (legacyKey) try { localStorage.removeItem(legacyKey); } catch (e) {}
+          resolve(store);
+        };
+        tx.onerror = () => resolve(useLocal());
+      };
+    });
+  }
+
+  function rowsByKey(n, keyOf) {
+    const rows = new Map();
+    for (let i = 0; i < n; i++) {
+      const k = keyOf(i), list = rows.get(k);
+      if (list) list.push(i); else rows.set(k, [i]);
+    }
+    return rows;
+  }
+
+  function makeCsvExport(header, lineOf) {
+    const BLOCK = 2048;
+    let rows = null, pos = null, blocks = [];
+    return {
+      changed(i) { if (pos) blocks[Math.floor(pos[i] / BLOCK)] = undefined; },
+      blob(order) {
+        if (order !== rows) {
+          rows = order; blocks = []; pos = new Int32Array(order.length);
+          order.forEach((r, k) => { pos[r] = k; });
+        }
+        const parts = ['\ufeff' + header];
+        for (let b = 0; b * BLOCK < rows.length; b++) {
+          if (blocks[b] === undefined) {
+            const lines = [];
+            for (let k = b * BLOCK, end = Math.min(rows.length, k + BLOCK); k < end; k++) lines.push(lineOf(rows[k]));
+            blocks[b] = '\n' + lines.join('\n');
+          }
+          parts.push(blocks[b]);
+        }
+        return new Blob(parts, {type: 'text/csv;charset=utf-8'});
+      },
+    };
+  }
+""".replace("__DB__", SEEN_DB).replace("__STORE__", SEEN_STORE).replace("__FALLBACK_KEY__", FALLBACK_KEY)
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Local sync server (`serve`): hosts the viewer and writes the seen toggles back
+# to the list, so there is no Export CSV -> --csv-in -> regenerate round trip.
+#
+#   GET  /                          the viewer, built from the current state
+#   GET  /api/seen?since=V&boot=B   seen changes after version V (latest per title), for other tabs
+#   POST /api/seen                  {"changes": {key: true/false}}, a viewer's batch of toggles
+#   GET  /posters/NAME              a thumbnail of the poster cache (--posters), nothing else
+#
+# Rows whose image_url the poster cache holds point the viewer at /posters/NAME
+# instead of the remote (expiring) URL.
+#
+# Anything else is a 404: the folder of the list (the CSV, the SQLite catalog...)
+# is never served, even with --host 0.0.0.0.
+#
+# Requests run on threads but only touch the in-memory SeenState, under its lock.
+# One writer thread owns the progress CSV (or the SQLite connection) and saves
+# the changes in coalesced batches, so several tabs can toggle titles at once
+# without ever racing on the file. Keys are the viewer's: the id, or the title
+# for rows without one.
+import csv, json, mimetypes, os, sys, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+from .csvio import read_rows, row_reader
+from .payload import payload_script_tag
+from .viewer import build_payload, is_seen, render_page, viewer_module
+
+API = "/api/seen"
+POSTERS = "/posters/"
+POLL_MS = 2000       # how often a viewer asks for the other tabs' changes
+WRITE_DELAY = 0.5    # seconds of toggles gathered into one write
+MAX_BODY = 1 << 20
+mimetypes.add_type("image/webp", ".webp")  # missing from older Pythons' table
+
+def _seen_text(value: bool) -> str:
+    return "1" if value else ""
+
+# ---------- Where the list lives ----------
+class CsvProgress:
+    """A progress CSV: read once, rewritten atomically after each batch with every column kept."""
+
+    def __init__(self, path, profile):
+        self.path, self.profile = Path(path), profile
+        self.raw, self.header, self.seen_col = [], [], 0
+
+    def load(self) -> list:
+        self.header, self.raw = read_rows(self.path)
+        if not self.header: self.header = list(self.profile.fields)
+        read = row_reader(self.header, self.profile)
+        items = [read(r) for r in self.raw]
+        # the column the rows take "seen" from (the English profile accepts "visto" too)
+        field = self.profile.seen_field
+        col = next((c for c in (field, *self.profile.aliases.get(field, ())) if c in self.header), None)
+        if col is None:
+            self.header.append(field)
+            for r in self.raw: r.append("")
+            col = field
+        self.seen_col = self.header.index(col)
+        return items
+
+    def save(self, changes: dict, rows_by_key: dict):
+        for key, value in changes.items():
+            for i in rows_by_key.get(key, ()):
+                self.raw[i][self.seen_col] = _seen_text(value)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding=self.profile.csv_encoding, newline="") as f:
+            w = csv.writer(f)
+            w.writerow(self.header)
+            w.writerows(self.raw)
+        os.replace(tmp, self.path)
+
+    def close(self):
+        pass
+
+class CatalogProgress:
+    """An account's list in the SQLite catalog (--db): one UPDATE per changed title, one transaction per batch."""
+
+    def __init__(self, db_path, account, profile):
+        self.db_path, self.account, self.profile = Path(db_path), account, profile
+        self.keys = []      # catalog key of each row
+        self._store = None  # opened by the writer thread, the only one using it
+
+    def _open(self):
+        from .store import CatalogStore
+        return CatalogStore(self.db_path, seen_field=self.profile.seen_field,
+                            removed_field=self.profile.removed_field, title_field=self.profile.title_field)
+
+    def load(self) -> list:
+        from .merge import item_key
+        with self._open() as store:
+            items = list(store.iter_items(self.account))
+        self.keys = [item_key(it) for it in items]
+        return items
+
+    def save(self, changes: dict, rows_by_key: dict):
+        if self._store is None: self._store = self._open()
+        self._store.set_seen_many({self.keys[i]: value for key, value in changes.items()
+                                   for i in rows_by_key.get(key, ())}, account=self.account)
+
+    def close(self):
+        if self._store is not None: self._store.close()
+
+# ---------- Shared state ----------
+def row_key(row: dict, profile) -> str:
+    # same as keyOf() in the viewers: String(ids[i]) || titles[i]
+    return str(row.get("id") or "") or row[profile.title_field]
+
+class SeenState:
+    """The list being served, with a version bumped by every seen change."""
+
+    def __init__(self, items, profile, page_title=None, posters=None):
+        self.items, self.profile = items, profile
+        self.page_title = page_title or profile.page_title
+        view = viewer_module(profile)
+        if posters is not None: self._link_posters(posters)
+        self.rows_by_key = {}
+        for i, it in enumerate(items):
+            self.rows_by_key.setdefault(row_key(view.row(it), profile), []).append(i)
+        self.boot = f"{os.getpid()}-{time.time_ns()}"  # a restarted server makes the tabs reload
+        self.version = 0
+        self.changed = {}  # key -> (version, seen) of its latest change
+        self.lock = threading.Lock()
+        self._page = None  # (version, html)
+
+    def _link_posters(self, cache_dir: Path):
+        from .posters import PosterCache, url_key
+        names = PosterCache(cache_dir).names()
+        if not names: return
+        for it in self.items:
+            name = names.get(url_key(it.get("image_url") or ""))
+            if name: it["image_local"] = POSTERS + quote(name)
+
+    def apply(self, changes: dict) -> dict:
+        """Record a batch of {key: seen}; returns the changes that were new."""
+        field, applied = self.profile.seen_field, {}
+        with self.lock:
+            for key, value in changes.items():
+                rows = self.rows_by_key.get(key)
+                if not rows or not isinstance(value, bool): continue
+                if all(is_seen(self.items[i].get(field)) == value for i in rows): continue
+                for i in rows: self.items[i][field] = _seen_text(value)
+                self.version += 1
+                self.changed[key] = (self.version, value)
+                applied[key] = value
+        return applied
+
+    def since(self, version: int, boot: str) -> dict:
+        with self.lock:
+            if boot != self.boot or version > self.version: return {"reload": True}
+            return {"version": self.version,
+                    "changes": {k: v for k, (ver, v) in self.changed.items() if ver > version}}
+
+    def page(self) -> bytes:
+        """The viewer with the current state inline, rebuilt only after a change."""
+        with self.lock:
+            if self._page and self._page[0] == self.version: return self._page[1]
+            version, payload = self.version, build_payload(self.items, self.profile)
+        sync = json.dumps({"api": API, "version": version, "boot": self.boot, "poll": POLL_MS})
+        data_tag = payload_script_tag(payload) + f'\n<script type="application/json" id="mylist-sync">{sync}</script>'
+        html = render_page(self.profile, self.page_title, data_tag).encode("utf-8")
+        self._page = (version, html)
+        return html
+
+# ---------- Single writer ----------
+class Writer(threading.Thread):
+    """The one thread writing to the list: waits for toggles, lets a burst pile up, saves it in one go."""
+
+    def __init__(self, target, rows_by_key: dict, delay: float = WRITE_DELAY):
+        super().__init__(name="flix2flix-writer", daemon=True)
+        self.target, self.rows_by_key, self.delay = target, rows_by_key, delay
+        self.pending = {}
+        self.cond = threading.Condition()
+        self.closing = False
+        self.writes = 0
+
+    def submit(self, changes: dict):
+        with self.cond:
+            self.pending.update(changes)
+            self.cond.notify()
+
+    def run(self):
+        while True:
+            with self.cond:
+                while not self.pending and not self.closing: self.cond.wait()
+                if not self.pending: break
+                closing = self.closing
+            if not closing: time.sleep(self.delay)
+            with self.cond:
+                batch, self.pending = self.pending, {}
+            try:
+                self.target.save(batch, self.rows_by_key)
+                self.writes += 1
+            except Exception as e:  # e.g. the CSV is open in Excel on Windows: keep the batch, retry
+                print(f"[serve] save failed: {e}", file=sys.stderr)
+                if closing: break
+                with self.cond:
+                    self.pending = {**batch, **self.pending}
+                time.sleep(self.delay)
+        self.target.close()
+
+    def close(self):
+        """Save whatever is pending and stop."""
+        with self.cond:
+            self.closing = True
+            self.cond.notify()
+        self.join()
+
+# ---------- HTTP ----------
+class Handler(BaseHTTPRequestHandler):
+    state = writer = posters = None  # set per server, see SyncServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body: bytes, content_type: str, status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, obj):
+        self._send(json.dumps(obj, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path in ("/", "/index.html"):
+            self._send(self.state.page(), "text/html; charset=utf-8")
+        elif url.path == API:
+            q = parse_qs(url.query)
+            try:
+                since = int(q.get("since", ["0"])[0])
+            except ValueError:
+                return self.send_error(400)
+            self._json(self.state.since(since, q.get("boot", [""])[0]))
+        elif url.path.startswith(POSTERS) and self.posters is not None:
+            self._poster(unquote(url.path[len(POSTERS):]))
+        else:
+            self.send_error(404)
+
+    def _poster(self, name: str):
+        # the cache is flat: a plain image file name, no sub-folders (and not its index.json)
+        kind = mimetypes.guess_type(name)[0] or ""
+        if not kind.startswith("image/") or name.startswith(".") or "/" in name or "\\" in name:
+            return self.send_error(404)
+        try:
+            body = (self.posters / name).read_bytes()
+        except OSError:
+            return self.send_error(404)
+        self._send(body, kind)
+
+    def do_POST(self):
+        if urlsplit(self.path).path != API: return self.send_error(404)
+        origin = self.headers.get("Origin")
+        if origin is not None and urlsplit(origin).netloc != self.headers.get("Host"):
+            return self.send_error(403)  # another site's page posting to localhost, or a sandboxed one ("null")
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY: return self.send_error(413)
+        try:
+            changes = json.loads(self.rfile.read(length))["changes"]
+            if not isinstance(changes, dict): raise TypeError
+        except (ValueError, KeyError, TypeError):
+            return self.send_error(400)
+        applied = self.state.apply(changes)
+        if applied: self.writer.submit(applied)
+        self._json({"version": self.state.version})
+
+class SyncServer:
+    """serve_forever() until Ctrl+C, then close() saves what is pending."""
+
+    def __init__(self, target, profile, host="127.0.0.1", port=8000, posters=None, page_title=None):
+        """posters: the poster cache folder served under /posters/, or None."""
+        self.state = SeenState(target.load(), profile, page_title, Path(posters) if posters else None)
+        self.writer = Writer(target, self.state.rows_by_key)
+        handler = type("Handler", (Handler,), {"state": self.state, "writer": self.writer,
+                                               "posters": Path(posters) if posters else None})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.writer.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{'127.0.0.1' if host == '0.0.0.0' else host}:{port}/"
+
+    def serve_forever(self):
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        self.httpd.server_close()
+        self.writer.close()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# SQLite catalog: an alternative to rewriting the whole CSV on every run.
+#
+# One table of titles keyed by id (the full parsed row kept as JSON, so any of
+# the CSV schemas can be exported again) and one of per-account list
+# membership with the seen/removed state. Syncs are batched upserts inside a
+# single transaction; lookups and updates go through the primary keys.
+import json, sqlite3, time
+from pathlib import Path
+from .merge import MergeStats, item_key
+
+DEFAULT_ACCOUNT = "default"
+BATCH_SIZE = 1000
+SEEN_TRUE = ("1", "true", "yes", "si", "sí", "x")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS titles (
+    id         TEXT PRIMARY KEY,
+    title      TEXT NOT NULL DEFAULT '',
+    url        TEXT NOT NULL DEFAULT '',
+    data       TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS memberships (
+    account    TEXT NOT NULL,
+    id         TEXT NOT NULL REFERENCES titles(id),
+    seen       INTEGER NOT NULL DEFAULT 0,
+    removed    INTEGER NOT NULL DEFAULT 0,
+    added_at   REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (account, id)
+);
+"""
+
+def seen_value(v):
+    """1/0 for an explicit seen/visto value, None when empty (keep what is stored)."""
+    s = str(v or "").strip().lower()
+    if not s: return None
+    return 1 if s in SEEN_TRUE else 0
+
+def _batches(iterable, size):
+    batch = []
+    for x in iterable:
+        batch.append(x)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch: yield batch
+
+class CatalogStore:
+    def __init__(self, db_path, seen_field="seen", removed_field="removed", title_field="title"):
+        self.db_path = Path(db_path)
+        self.seen_field, self.removed_field, self.title_field = seen_field, removed_field, title_field
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _split(self, it: dict):
+        """(key, title, url, data json, seen) for a parsed or CSV row."""
+        data = {k: v for k, v in it.items() if k not in (self.seen_field, self.removed_field)}
+        title = it.get("title") or it.get("titulo") or ""
+        return (item_key(it), title, it.get("url") or "",
+                json.dumps(data, ensure_ascii=False), seen_value(it.get(self.seen_field)))
+
+    def sync(self, items, account=DEFAULT_ACCOUNT, mark_removed=True, batch_size=BATCH_SIZE) -> MergeStats:
+        """Upsert a full list for account, like --merge-into does for a CSV.
+
+        Stored seen state wins unless the row carries an explicit seen value;
+        with mark_removed, titles of the account missing from items get removed=1.
+        """
+        stats, now = MergeStats(), time.time()
+        with self.conn:  # one transaction for the whole sync
+            cur = self.conn.cursor()
+            cur.execute("CREATE TEMP TABLE IF NOT EXISTS present (id TEXT PRIMARY KEY)")
+            cur.execute("DELETE FROM present")
+            present = set()
+            for batch in _batches(map(self._split, items), batch_size):
+                rows = []
+                for row in batch:
+                    if row[0] and row[0] not in present:  # no id, or a duplicate within this list
+                        present.add(row[0]); rows.append(row)
+                if not rows: continue
+                known = {}
+                for i in range(0, len(rows), 500):  # stay under SQLite's bound-parameter limit
+                    chunk = [row[0] for row in rows[i:i + 500]]
+                    known.update(cur.execute(
+                        f"SELECT id, removed FROM memberships WHERE account = ? AND id IN ({','.join('?' * len(chunk))})",
+                        [account, *chunk]).fetchall())
+                for key, *_ in rows:
+                    if key not in known: stats.added += 1
+                    elif known[key]: stats.restored += 1
+                    else: stats.unchanged += 1
+                cur.executemany("INSERT INTO present (id) VALUES (?)", [(row[0],) for row in rows])
+                cur.executemany(
+                    "INSERT INTO titles (id, title, url, data, updated_at) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET title = excluded.title, url = excluded.url, "
+                    "data = excluded.data, updated_at = excluded.updated_at",
+                    [(key, title, url, data, now) for key, title, url, data, _ in rows])
+                cur.executemany(
+                    "INSERT INTO memberships (account, id, seen, removed, added_at, updated_at) "
+                    "VALUES (?, ?, COALESCE(?, 0), 0, ?, ?) "
+                    "ON CONFLICT(account, id) DO UPDATE SET seen = COALESCE(?, seen), removed = 0, "
+                    "updated_at = excluded.updated_at",
+                    [(account, key, seen, now, now, seen) for key, _, _, _, seen in rows])
+            if mark_removed:
+                cur.execute("SELECT COUNT(*) FROM memberships WHERE account = ? AND id NOT IN (SELECT id FROM present)",
+                            (account,))
+                stats.removed = cur.fetchone()[0]
+                cur.execute("UPDATE memberships SET removed = 1, updated_at = ? "
+                            "WHERE account = ? AND removed = 0 AND id NOT IN (SELECT id FROM present)",
+                            (now, account))
+        return stats
+
+    def set_seen(self, key: str, seen: bool, account=DEFAULT_ACCOUNT) -> bool:
+        with self.conn:
+            cur = self.conn.execute("UPDATE memberships SET seen = ?, updated_at = ? WHERE account = ? AND id = ?",
+                                    (1 if seen else 0, time.time(), account, key))
+        return cur.rowcount > 0
+
+    def set_seen_many(self, changes: dict, account=DEFAULT_ACCOUNT) -> int:
+        """Apply {key: seen} in one transaction; returns how many memberships were updated."""
+        now = time.time()
+        with self.conn:
+            cur = self.conn.executemany("UPDATE memberships SET seen = ?, updated_at = ? WHERE account = ? AND id = ?",
+                                        [(1 if seen else 0, now, account, key) for key, seen in changes.items()])
+        return cur.rowcount
+
+    def get(self, key: str, account=DEFAULT_ACCOUNT):
+        row = self.conn.execute(
+            "SELECT t.data, t.title, m.seen, m.removed FROM memberships m JOIN titles t ON t.id = m.id "
+            "WHERE m.account = ? AND m.id = ?", (account, key)).fetchone()
+        return self._row(*row) if row else None
+
+    def _row(self, data, title, seen, removed) -> dict:
+        it = json.loads(data)
+        it[self.title_field] = title  # the row may have been synced with the other profile's columns
+        it[self.seen_field] = "1" if seen else ""
+        it[self.removed_field] = "1" if removed else ""
+        return it
+
+    def iter_items(self, account=DEFAULT_ACCOUNT, include_removed=True):
+        """Rows of account's list in the order titles were first added, with this store's title/seen/removed keys."""
+        sql = ("SELECT t.data, t.title, m.seen, m.removed FROM memberships m JOIN titles t ON t.id = m.id "
+               "WHERE m.account = ?" + ("" if include_removed else " AND m.removed = 0") + " ORDER BY m.rowid")
+        for row in self.conn.execute(sql, (account,)):
+            yield self._row(*row)
+
+    def accounts(self) -> list:
+        return [a for (a,) in self.conn.execute("SELECT DISTINCT account FROM memberships ORDER BY account")]
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Streaming (SAX-style) extractor for saved "My List" pages.
+#
+# Instead of building a full DOM, the page is fed to html.parser in chunks and
+# every element carrying data-ui-tracking-context is emitted as a small "card"
+# record as soon as it closes. Memory stays flat no matter how big the page is.
+from html.parser import HTMLParser
+
+VOID_TAGS = frozenset([
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr",
+])
+SKIP_TEXT_TAGS = frozenset(["script", "style", "template"])
+
+def _classes(attrs: dict) -> list:
+    return (attrs.get("class") or "").split()
+
+def _anchor(attrs: dict) -> dict:
+    return {"attrs": attrs, "img": None, "text": []}
+
+class CardStreamParser(HTMLParser):
+    """Event-driven parser that collects one record per tracking-context element.
+
+    A card looks like:
+        {"kind": "card", "tag": "div", "attrs": {...}, "container_id": "...",
+         "anchor": <first <a>>, "href_anchor": <first <a href>>,
+         "fallback": <first .fallback-text-container p.fallback-text> or None}
+    where every anchor is {"attrs": {...}, "img": <first <img> attrs>, "text": [...]}.
+
+    With watch_fallback=True, and only if no card with an <a href> was seen,
+    the <a href*="/watch/"> anchors of the page are emitted at the end as
+    {"kind": "watch", "anchor": ...} records.
+    """
+
+    def __init__(self, watch_fallback: bool = False):
+        super().__init__(convert_charrefs=True)
+        self.watch_fallback = watch_fallback
+        self._stack = []          # [(tag, [frames opened by that element])]
+        self._pending = []        # cards in document order, waiting to close
+        self._ready = []          # records ready to be handed to the caller
+        self._open_cards = []
+        self._open_anchors = []
+        self._open_fallbacks = []
+        self._title_cards = []    # ids of the enclosing div.title-card elements
+        self._fb_containers = 0
+        self._skip_text = 0
+        self._watch = []
+        self._has_href_card = False
+
+    # ----- element bookkeeping -----
+    def handle_starttag(self, tag, attrs):
+        attrs = {k: (v if v is not None else "") for k, v in attrs}
+        frames = []
+        classes = _classes(attrs)
+
+        if "data-ui-tracking-context" in attrs:
+            card = {
+                "kind": "card", "tag": tag, "attrs": attrs,
+                "container_id": self._title_cards[-1] if self._title_cards else "",
+                "anchor": None, "href_anchor": None, "fallback": None,
+                "done": False,
+            }
+            self._open_cards.append(card)
+            self._pending.append(card)
+            frames.append(("card", card))
+
+        if tag == "div" and "title-card" in classes:
+            self._title_cards.append(attrs.get("id", ""))
+            frames.append(("title-card", None))
+
+        if tag == "a":
+            rec = None
+            for card in self._open_cards:
+                if card["anchor"] is None:
+                    rec = rec or _anchor(attrs)
+                    card["anchor"] = rec
+                if card["href_anchor"] is None and "href" in attrs:
+                    rec = rec or _anchor(attrs)
+                    card["href_anchor"] = rec
+            if (self.watch_fallback and not self._has_href_card
+                    and "/watch/" in attrs.get("href", "")):
+                rec = rec or _anchor(attrs)
+                self._watch.append(rec)
+            if rec is not None:
+                self._open_anchors.append(rec)
+                frames.append(("anchor", rec))
+
+        if tag == "img":
+            for rec in self._open_anchors:
+                if rec["img"] is None:
+                    rec["img"] = attrs
+
+        if "fallback-text-container" in classes:
+            self._fb_containers += 1
+            frames.append(("fb-container", None))
+
+        if tag == "p" and self._fb_containers and "fallback-text" in classes:
+            rec = None
+            for card in self._open_cards:
+                if card["fallback"] is None:
+                    rec = rec or []
+                    card["fallback"] = rec
+            if rec is not None:
+                self._open_fallbacks.append(rec)
+                frames.append(("fallback", rec))
+
+        if tag in SKIP_TEXT_TAGS:
+            self._skip_text += 1
+            frames.append(("skip", None))
+
+        if tag in VOID_TAGS:
+            self._close_frames(frames)
+        else:
+            self._stack.append((tag, frames))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                break
+        else:
+            return  # stray end tag, ignore it like the tree builders do
+        while len(self._stack) > i:
+            self._close_frames(self._stack.pop()[1])
+
+    def handle_data(self, data):
+        if self._skip_text:
+            return
+        for rec in self._open_anchors:
+            rec["text"].append(data)
+        for rec in self._open_fallbacks:
+            rec.append(data)
+
+    def _close_frames(self, frames):
+        for kind, obj in reversed(frames):
+            if kind == "card":
+                obj["done"] = True
+                self._open_cards.remove(obj)
+                if obj["href_anchor"] is not None:
+                    self._has_href_card = True
+                    self._watch = []
+            elif kind == "anchor":
+                self._open_anchors.remove(obj)
+            elif kind == "fallback":
+                self._open_fallbacks.remove(obj)
+            elif kind == "title-card":
+                self._title_cards.pop()
+            elif kind == "fb-container":
+                self._fb_containers -= 1
+            elif kind == "skip":
+                self._skip_text -= 1
+        # Cards are released in the order they were opened so nested
+        # tracking contexts come out in document order, like find_all().
+        while self._pending and self._pending[0]["done"]:
+            self._ready.append(self._pending.pop(0))
+
+    # ----- public API -----
+    def drain(self) -> list:
+        ready, self._ready = self._ready, []
+        return ready
+
+    def close(self):
+        super().close()
+        while self._stack:
+            self._close_frames(self._stack.pop()[1])
+        if self.watch_fallback and not self._has_href_card:
+            self._ready.extend({"kind": "watch", "anchor": rec} for rec in self._watch)
+        self._watch = []
+
+def iter_cards(chunks, watch_fallback: bool = False):
+    """Feed an iterable of text chunks and yield card records as they close."""
+    parser = CardStreamParser(watch_fallback=watch_fallback)
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.drain()
+    parser.close()
+    yield from parser.drain()
+
+def anchor_text(anchor: dict) -> str:
+    return "".join(anchor["text"]) if anchor else ""
+
+def fallback_text(card: dict) -> str:
+    return "".join(card["fallback"]).strip() if card.get("fallback") else ""
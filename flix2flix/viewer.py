@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Viewer writer shared by every profile; the page itself lives in viewer_<lang>.py.
+from importlib import import_module
+from pathlib import Path
+from . import profiling
+from .accounts import ACCOUNTS_JS, MASK_FIELD
+from .payload import ColumnarPayload, DECODER_JS, payload_script_tag
+from .search import SEARCH_JS, SearchIndex
+from .seen import seen_js, store_name
+
+SEEN_TRUE = ("1", "true", "yes", "si", "sí", "x")
+
+def is_seen(v) -> bool:
+    return str(v or "").strip().lower() in SEEN_TRUE
+
+def esc_html(s) -> str:
+    if s is None: return ""
+    return (str(s).replace("&","&amp;").replace("<","&lt;")
+                 .replace(">","&gt;").replace('"',"&quot;"))
+
+def viewer_module(profile):
+    return import_module(f".viewer_{profile.lang}", __package__)
+
+def build_payload(items, profile, accounts=None) -> ColumnarPayload:
+    """accounts: the profile names of a union/diff, whose items carry an accounts_mask (see accounts.py)."""
+    view = viewer_module(profile)
+    payload = ColumnarPayload(dict(view.COLUMNS, accounts="int") if accounts else view.COLUMNS)
+    index = SearchIndex()
+    for it in items:
+        row = view.row(it)
+        if accounts: row["accounts"] = it.get(MASK_FIELD)
+        payload.add(row)
+        index.add(row[profile.title_field])
+    payload.extra["search"] = index.to_dict()
+    if accounts: payload.extra["accounts"] = list(accounts)
+    return payload
+
+def render_page(profile, page_title: str, data_tag: str, store: str = None) -> str:
+    """The complete viewer page; data_tag is the <script> carrying (or pointing to) the data.
+
+    store names the browser-side seen store (seen.store_name), by default after the page title.
+    """
+    return (viewer_module(profile).TEMPLATE.replace("__PAGE_TITLE__", esc_html(page_title))
+            .replace("__DECODER_JS__", DECODER_JS)
+            .replace("__SEARCH_JS__", SEARCH_JS)
+            .replace("__SEEN_JS__", seen_js(store or store_name(page_title, profile)))
+            .replace("__ACCOUNTS_JS__", ACCOUNTS_JS)
+            .replace("__DATA_TAG__", data_tag))
+
+def write_viewer_html(items, out_path: Path, profile, page_title=None, data_mode="inline", posters=None,
+                      accounts=None) -> int:
+    """Fold items (any iterable) into the columnar payload and write the viewer; returns the count.
+
+    With data_mode="external" the data goes to <name>.data.json next to the viewer,
+    with posters (a posters.PosterCache) the images point to local thumbnails, and
+    with accounts (profile names) the viewer gets a "which profiles have this" filter.
+    """
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    if posters is not None:
+        items = profiling.stage("posters", posters.localize(items, out_path.parent))
+    with profiling.span("viewer payload"):
+        payload = build_payload(items, profile, accounts)
+    with profiling.span("viewer template"):
+        html = render_page(profile, page_title or profile.page_title, payload_script_tag(payload, out_path, data_mode),
+                           store=store_name(str(out_path.resolve()), profile))
+    with profiling.span("write viewer"):
+        out_path.write_text(html, encoding="utf-8")
+    return payload.n
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# English viewer (index.html): titles with a "Seen" checkbox, search, sorting and CSV export.
+from .viewer import is_seen
+
+COLUMNS = {"title": "str", "id": "int", "seen": "flag"}
+
+def row(it: dict) -> dict:
+    return {"title": it.get("title") or "", "id": it.get("id"), "seen": is_seen(it.get("seen"))}
+
+TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width,initial-scale=1">
+<title>__PAGE_TITLE__</title>
+<style>
+  :root { --bg:#0b0d12; --panel:#121725; --text:#e5e7eb; --muted:#9aa0a6; --accent:#e50914; --card:#1a2031; --btn:#141c2c; --btn-stroke:#2a3550; }
+  * { box-sizing: border-box; }
+  body { margin:0; background:var(--bg); color:var(--text); font-family: ui-sans-serif, -apple-system, Segoe UI, Roboto, Noto Sans, Helvetica Neue, Arial; }
+  header { position:sticky; top:0; background:rgba(11,13,18,.9); border-bottom:1px solid #222a3b; backdrop-filter: blur(4px); z-index:10; }
+  .wrap { max-width:1200px; margin:0 auto; padding:14px 18px; }
+  h1 { margin:0; font-size:22px; }
+  .sub { color:var(--muted); font-size:13px; }
+  .panel { background:var(--panel); border:1px solid #23304a; border-radius:14px; padding:12px; margin:16px auto; max-width:1200px; display:flex; flex-wrap:wrap; gap:12px; align-items:center; justify-content:space-between; }
+  .btn-export { background:var(--text); color:var(--bg); border:none; padding:8px 16px; border-radius:8px; font-weight:600; cursor:pointer; }
+  .btn-export:hover { background:#fff; }
+  select, input[type=search] { background:var(--bg); color:var(--text); border:1px solid var(--btn-stroke); padding:8px; border-radius:8px; }
+  input[type=search] { width:260px; max-width:100%; }
+  .filters { display:flex; flex-wrap:wrap; gap:12px; align-items:center; }
+  .grid { display:grid; grid-template-columns:repeat(auto-fill, minmax(280px, 1fr)); gap:16px; max-width:1200px; margin:0 auto; padding:0 18px 40px; }
+  .card { background:var(--card); border:1px solid var(--btn-stroke); border-radius:12px; padding:16px; display:flex; flex-direction:column; gap:12px; height:170px; }
+  .card.seen { opacity: 0.5; }
+  .title-row { display:flex; justify-content:space-between; align-items:flex-start; gap:8px; }
+  .title { font-size:16px; font-weight:600; line-height:1.3; margin:0; height:2.6em; overflow:hidden; display:-webkit-box; -webkit-line-clamp:2; -webkit-box-orient:vertical; }
+  .seen-label { display:flex; align-items:center; gap:6px; font-size:13px; color:var(--muted); cursor:pointer; background:rgba(0,0,0,0.2); padding:4px 8px; border-radius:6px; }
+  .seen-label input { margin:0; width:16px; height:16px; accent-color:var(--accent); cursor:pointer; }
+  .id-badge { display:inline-block; font-family:monospace; font-size:12px; color:var(--muted); background:rgba(255,255,255,0.05); padding:2px 6px; border-radius:4px; }
+  .actions { display:grid; grid-template-columns:1fr 1fr; gap:8px; margin-top:auto; }
+  .btn { text-align:center; text-decoration:none; font-size:13px; font-weight:500; padding:8px; border-radius:8px; border:1px solid var(--btn-stroke); color:var(--text); background:var(--btn); transition:all .2s; }
+  .btn:hover { background:#1f2a40; }
+  .btn-watch { background:var(--text); color:#000; border:none; }
+  .btn-watch:hover { background:#fff; }
+</style>
+</head>
+<body>
+<header>
+  <div class="wrap">
+    <h1>__PAGE_TITLE__</h1>
+    <div class="sub" id="counter">Loading titles...</div>
+  </div>
+</header>
+<div class="panel">
+  <div class="filters">
+    <input type="search" id="q" placeholder="Search titles..." autocomplete="off" aria-label="Search titles">
+    <select id="seenFilter" aria-label="Show">
+      <option value="all">All</option>
+      <option value="unseen">Not seen</option>
+      <option value="seen">Seen</option>
+    </select>
+    <select id="accountFilter" aria-label="Profiles" hidden></select>
+    <label for="sortSel">Sort by: </label>
+    <select id="sortSel">
+      <option value="rank-asc">Original Order</option>
+      <option value="title-asc">A-Z</option>
+      <option value="title-desc">Z-A</option>
+    </select>
+  </div>
+  <button class="btn-export" id="btnExport">Export CSV (with Progress)</button>
+</div>
+<div class="grid" id="grid"></div>
+
+__DATA_TAG__
+<script>
+__DECODER_JS__
+__SEARCH_JS__
+__SEEN_JS__
+__ACCOUNTS_JS__
+  const grid = document.getElementById('grid');
+  const sortSel = document.getElementById('sortSel');
+  const btnExport = document.getElementById('btnExport');
+  const counter = document.getElementById('counter');
+  const qInput = document.getElementById('q');
+  const seenFilter = document.getElementById('seenFilter');
+  const accountFilter = document.getElementById('accountFilter');
+
+  // Titles, ids and seen flags arrive as parallel arrays (see flix2flix/payload.py);
+  // seen changes made here are kept by id in the browser and override the file's flags
+  // until the file is regenerated with other flags
+  Promise.all([loadPayload(), openSeenStore()]).then(([data, store]) => {
+    const titles = data.col('title'), ids = data.col('id'), n = data.n;
+    const keyOf = i => String(ids[i]) || titles[i];
+    // Only in union/diff viewers: which of the merged profiles list each title
+    const accounts = makeAccountFilter(accountFilter, data.extra('accounts'), data.col('accounts'), {
+      all: 'All profiles', every: 'On every profile', on: 'On {name}', only: 'Only on {name}', not: 'Not on {name}'});
+
+    counter.textContent = n + " titles found";
+
+    // ---- Windowed rendering: only the rows on screen (plus a small buffer) exist in the DOM ----
+    const BUFFER_ROWS = 3;
+    const fileSeen = data.flags('seen');
+    const seen = Array.from(fileSeen, (v, i) => store.get(keyOf(i), !!v) ?? !!v);
+    const byKey = rowsByKey(n, keyOf);
+    let order = Array.from({length: n}, (_, i) => i); // rows currently shown, in display order
+    const pool = []; // recycled card nodes
+    const base = getComputedStyle(grid);
+    const padTop = parseFloat(base.paddingTop) || 0, padBottom = parseFloat(base.paddingBottom) || 0;
+    let cols = 1, rowH = 1, firstRow = -1, lastRow = -1;
+
+    function makeCard() {
+      const card = document.createElement('div');
+      card.className = 'card';
+      card.innerHTML = `
+        <div class="title-row">
+          <h2 class="title"></h2>
+          <label class="seen-label">
+            <input type="checkbox" class="chk-seen">
+            Seen
+          </label>
+        </div>
+        <div><span class="id-badge"></span></div>
+        <div class="actions">
+          <a target="_blank" rel="noreferrer" class="btn btn-title">Title Page ↗</a>
+          <a target="_blank" rel="noreferrer" class="btn btn-watch">Watch ▶</a>
+        </div>
+      `;
+      card._title = card.querySelector('.title');
+      card._chk = card.querySelector('.chk-seen');
+      card._badge = card.querySelector('.id-badge');
+      card._linkTitle = card.querySelector('.btn-title');
+      card._linkWatch = card.querySelector('.btn-watch');
+      return card;
+    }
+
+    function fillCard(card, index) {
+      if (card._index === index) { card._chk.checked = seen[index]; card.classList.toggle('seen', seen[index]); return; }
+      card._index = index;
+      card._title.textContent = titles[index];
+      card._title.title = titles[index];
+      card._badge.textContent = 'ID: ' + ids[index] + (accounts ? ' · ' + accounts.names(index) : '');
+      card._linkTitle.href = 'https://www.netflix.com/title/' + ids[index];
+      card._linkWatch.href = 'https://www.netflix.com/watch/' + ids[index];
+      card._chk.checked = seen[index];
+      card.classList.toggle('seen', seen[index]);
+    }
+
+    function measure() {
+      cols = Math.max(1, getComputedStyle(grid).gridTemplateColumns.split(' ').length);
+      if (!order.length) return;
+      const probe = pool[0] || (pool[0] = makeCard());
+      fillCard(probe, order[0]);
+      if (!probe.isConnected) grid.appendChild(probe);
+      rowH = probe.offsetHeight + (parseFloat(getComputedStyle(grid).rowGap) || 0);
+    }
+
+    function render(force) {
+      const total = Math.ceil(order.length / cols);
+      const gridTop = grid.getBoundingClientRect().top + window.scrollY + padTop;
+      const viewTop = window.scrollY - gridTop;
+      const r0 = Math.max(0, Math.min(total, Math.floor(viewTop / rowH) - BUFFER_ROWS));
+      const r1 = Math.max(r0, Math.min(total, Math.ceil((viewTop + window.innerHeight) / rowH) + BUFFER_ROWS));
+      if (!force && r0 === firstRow && r1 === lastRow) return;
+      firstRow = r0; lastRow = r1;
+
+      const start = r0 * cols, count = Math.min(order.length, r1 * cols) - start;
+      while (pool.length < count) pool.push(makeCard());
+      for (let k = 0; k < count; k++) {
+        fillCard(pool[k], order[start + k]);
+        if (!pool[k].isConnected) grid.appendChild(pool[k]);
+      }
+      for (let k = count; k < pool.length; k++) if (pool[k].isConnected) pool[k].remove();
+      grid.style.paddingTop = (padTop + r0 * rowH) + 'px';
+      grid.style.paddingBottom = (padBottom + Math.max(0, total - r1) * rowH) + 'px';
+    }
+
+    let ticking = false;
+    function schedule() {
+      if (ticking) return;
+      ticking = true;
+      requestAnimationFrame(() => { ticking = false; render(false); });
+    }
+    window.addEventListener('scroll', schedule, {passive: true});
+    window.addEventListener('resize', () => { measure(); render(true); });
+
+    // Every row of the title (it can be listed twice), from here or from another tab
+    function applySeen(key, value) {
+      for (const j of byKey.get(key) || []) { seen[j] = value; csv.changed(j); }
+      render(true);
+    }
+    store.onchange(applySeen);
+
+    // One delegated listener for every card, visible or recycled
+    grid.addEventListener('change', (e) => {
+      if (!e.target.classList.contains('chk-seen')) return;
+      const i = e.target.closest('.card')._index, key = keyOf(i);
+      store.set(key, e.target.checked, !!fileSeen[i]);
+      applySeen(key, e.target.checked);
+    });
+
+    // Search + filters + sorting: every sort order is precomputed (the title order in
+    // Python), so a change is one walk over it keeping the rows that match
+    const search = makeSearch(data.extra('search'), titles);
+    const sorted = {};
+    function sortedAll(how) {
+      if (sorted[how]) return sorted[how];
+      let rows;
+      if (how === 'title-asc') rows = search.sorted('title');
+      else if (how === 'title-desc') rows = search.sorted('title').slice().reverse();
+      else rows = Array.from({length: n}, (_, i) => i);
+      return (sorted[how] = rows);
+    }
+    let mask = null; // rows matching the search box, null = all
+    function applyView() {
+      const rows = sortedAll(sortSel.value), want = seenFilter.value, shown = [];
+      const onAccount = accounts && accounts.test();
+      for (const i of rows) {
+        if (mask && !mask[i]) continue;
+        if (want !== 'all' && seen[i] !== (want === 'seen')) continue;
+        if (onAccount && !onAccount(i)) continue;
+        shown.push(i);
+      }
+      order = shown;
+      counter.textContent = shown.length === n ? n + " titles found" : shown.length + " of " + n + " titles";
+      render(true);
+    }
+    qInput.addEventListener('input', () => { mask = search.match(qInput.value); applyView(); });
+    seenFilter.addEventListener('change', applyView);
+    if (accounts) accountFilter.addEventListener('change', applyView);
+    sortSel.addEventListener('change', applyView);
+
+    measure();
+    render(true);
+
+    // Export CSV: every title whatever the filters, built from the arrays above
+    const csv = makeCsvExport(["title","id","url","seen"].join(","), i => {
+      const title = titles[i].replace(/"/g,'""');
+      const id = String(ids[i]);
+      const url = ('https://www.netflix.com/watch/' + id).replace(/"/g,'""');
+      return ['"'+title+'"', id, '"'+url+'"', seen[i] ? "1" : ""].join(",");
+    });
+    btnExport.addEventListener('click', () => {
+      const blob = csv.blob(sortedAll(sortSel.value));
+      const urlObj = URL.createObjectURL(blob);
+      const a = document.createElement('a');
+      a.href = urlObj;
+      a.download = "netflix_mylist_updated.csv";
+      document.body.appendChild(a);
+      a.click();
+      document.body.removeChild(a);
+      URL.revokeObjectURL(urlObj);
+    });
+  });
+</script>
+</body>
+</html>"""
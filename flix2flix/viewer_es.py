@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Viewer en español: carátulas, enlaces a Netflix, búsqueda, "visto" (guardado en IndexedDB) y export.
+from .viewer import is_seen
+
+# Columnas que pinta el viewer (ver payload.py: arrays paralelos, URLs con prefijo compartido)
+COLUMNS = {"titulo": "str", "id": "int", "url": "url", "image": "url", "rank": "int", "visto": "flag"}
+
+def row(it: dict) -> dict:
+    return {
+        "titulo": it.get("titulo") or "(sin título)", "id": str(it.get("id") or ""),
+        "url": it.get("url") or "", "image": it.get("image_local") or it.get("image_url") or "",
+        "rank": str(it.get("rank") or ""), "visto": is_seen(it.get("visto")),
+    }
+
+TEMPLATE = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width,initial-scale=1">
+<title>__PAGE_TITLE__</title>
+<style>
+  :root { --bg:#0b0d12; --panel:#121725; --text:#e5e7eb; --muted:#9aa0a6; --accent:#e50914; --card:#1a2031; --btn:#141c2c; --btn-stroke:#2a3550; }
+  * { box-sizing: border-box; }
+  body { margin:0; background:var(--bg); color:var(--text); font-family: ui-sans-serif, -apple-system, Segoe UI, Roboto, Noto Sans, Helvetica Neue, Arial; }
+  header { position:sticky; top:0; background:rgba(11,13,18,.9); border-bottom:1px solid #222a3b; backdrop-filter: blur(4px); z-index:10; }
+  .wrap { max-width:1200px; margin:0 auto; padding:14px 18px; }
+  h1 { margin:0; font-size:22px; }
+  .sub { color:var(--muted); font-size:13px; }
+  .panel { background:var(--panel); border:1px solid #23304a; border-radius:14px; padding:12px; margin:16px 0; }
+  .controls { display:flex; gap:10px; align-items:center; flex-wrap:wrap; }
+  select, button, input[type=search] { padding:8px 10px; border-radius:10px; border:1px solid var(--btn-stroke); background:#0f1625; color:var(--text); font-size:14px; }
+  input[type=search] { width:260px; max-width:100%; }
+  .grid { display:grid; gap:12px; grid-template-columns: repeat(6, minmax(0,1fr)); padding-bottom:30px; }
+  @media (max-width:1200px) { .grid { grid-template-columns: repeat(5,1fr); } }
+  @media (max-width:1000px) { .grid { grid-template-columns: repeat(4,1fr); } }
+  @media (max-width:800px)  { .grid { grid-template-columns: repeat(3,1fr); } }
+  @media (max-width:600px)  { .grid { grid-template-columns: repeat(2,1fr); } }
+  @media (max-width:420px)  { .grid { grid-template-columns: repeat(1,1fr); } }
+  .card { background:var(--card); border:1px solid #2a3550; border-radius:14px; overflow:hidden; }
+  .poster { display:block; width:100%; aspect-ratio:16/9; object-fit:cover; background:#0e1524; }
+  .poster.empty { visibility:hidden; }
+  .card-body { padding:10px 12px; }
+  .title { font-size:14px; font-weight:700; margin:0 0 4px; line-height:1.3; height:2.6em; overflow:hidden; display:-webkit-box; -webkit-line-clamp:2; -webkit-box-orient:vertical; }
+  .idline { font-size:12px; color:var(--muted); min-height:1.2em; }
+  .seen { display:flex; gap:8px; align-items:center; font-size:13px; margin-top:6px; color:#d5d9e3; }
+  .row-actions { display:inline-flex; gap:8px; nowrap:block; margin-top:8px; min-height:32px; }
+  .btn { display:inline-flex; align-items:center; gap:8px; padding:5px 7px; border-radius:10px; border:1px solid var(--btn-stroke); background: var(--btn); color:#e5e7eb; font-weight:700; text-decoration:none; }
+  .btn[hidden] { display:none; }
+  .btn-primary { background: var(--accent); color: #fff; }
+  .btn-secondary { background: #99a3ba; }
+  .ext-icon { width: 16px; height: 16px; }
+</style>
+</head>
+<body>
+<header>
+  <div class="wrap">
+    <h1>__PAGE_TITLE__</h1>
+    <div class="sub">Busca, marca “visto”, ordena y exporta un CSV actualizado.</div>
+  </div>
+</header>
+
+<main class="wrap">
+  <section class="panel">
+    <div class="controls">
+      <input type="search" id="q" placeholder="Buscar título..." autocomplete="off" aria-label="Buscar título">
+      <select id="seenFilter" aria-label="Mostrar">
+        <option value="all">Todos</option>
+        <option value="unseen">Pendientes</option>
+        <option value="seen">Vistos</option>
+      </select>
+      <select id="accountFilter" aria-label="Perfiles" hidden></select>
+      <label for="sort">Ordenar por:</label>
+      <select id="sort">
+        <option value="title-asc">Título A→Z</option>
+        <option value="title-desc">Título Z→A</option>
+        <option value="rank-asc">Rank ↑</option>
+        <option value="rank-desc">Rank ↓</option>
+      </select>
+      <button id="btnExport">Exportar CSV actualizado</button>
+      <span class="sub" id="count"></span>
+    </div>
+  </section>
+
+  <section id="grid" class="grid"></section>
+</main>
+
+__DATA_TAG__
+<script>
+__DECODER_JS__
+__SEARCH_JS__
+__SEEN_JS__
+__ACCOUNTS_JS__
+// Estado visto: IndexedDB por id; el mapa antiguo de localStorage se importa una vez
+Promise.all([loadPayload(), openSeenStore('netflix_mylist_seen_v1')]).then(function([data, store]){
+  const n = data.n, titulos = data.col('titulo'), ids = data.col('id'), ranks = data.col('rank');
+  const grid = document.getElementById('grid');
+  const sortSel = document.getElementById('sort');
+  const btnExport = document.getElementById('btnExport');
+  const qInput = document.getElementById('q');
+  const seenFilter = document.getElementById('seenFilter');
+  const countEl = document.getElementById('count');
+  // Solo en los visores de union/diff: qué perfiles fusionados tienen cada título
+  const accountFilter = document.getElementById('accountFilter');
+  const accounts = makeAccountFilter(accountFilter, data.extra('accounts'), data.col('accounts'),
+    {all: 'Todos los perfiles', every: 'En todos los perfiles', on: 'En {name}',
+     only: 'Solo en {name}', not: 'Falta en {name}'});
+
+  const keyOf = i => String(ids[i]) || titulos[i];
+  const visto = data.flags('visto');
+  const seen = Array.from(visto, (v, i) => store.get(keyOf(i), !!v) ?? !!v);
+  const byKey = rowsByKey(n, keyOf);
+
+  // ---- Render por ventana: solo existen en el DOM las filas visibles (+ un pequeño margen) ----
+  const BUFFER_ROWS = 3;
+  let order = Array.from({length: n}, (_, i) => i); // filas que se muestran, en orden
+  const pool = [];                      // tarjetas recicladas
+  const base = getComputedStyle(grid);
+  const padTop = parseFloat(base.paddingTop) || 0, padBottom = parseFloat(base.paddingBottom) || 0;
+  let cols = 1, rowH = 1, firstRow = -1, lastRow = -1;
+
+  function makeCard() {
+    const card = document.createElement('div');
+    card.className = 'card';
+    card.innerHTML = `
+  <img class="poster" alt="">
+  <div class="card-body">
+    <div class="title"></div>
+    <div class="idline"></div>
+    <label class="seen"><input type="checkbox" class="chk-seen"> Marcado como visto</label>
+    <div class="row-actions">
+      <a class="btn btn-secondary btn-title" target="_blank" rel="noopener noreferrer">
+        <svg aria-hidden="true" focusable="false" viewBox="0 0 24 24" class="ext-icon"><path d="M14 3h7v7h-2V6.41l-9.29 9.3-1.42-1.42 9.3-9.29H14V3z"></path><path d="M5 5h6v2H7v10h10v-4h2v6H5z"></path></svg>
+      </a>
+      <a class="btn btn-primary btn-watch" target="_blank" rel="noopener noreferrer">Ver en Netflix</a>
+    </div>
+  </div>`;
+    card._poster = card.querySelector('.poster');
+    card._title = card.querySelector('.title');
+    card._idline = card.querySelector('.idline');
+    card._chk = card.querySelector('.chk-seen');
+    card._linkTitle = card.querySelector('.btn-title');
+    card._linkWatch = card.querySelector('.btn-watch');
+    return card;
+  }
+
+  function setLink(a, href) {
+    a.hidden = !href;
+    if (href) a.href = href; else a.removeAttribute('href');
+  }
+
+  // Igual que antes en Python: scheme://host de la URL de "ver", o netflix.com
+  function originOf(u) {
+    try { const x = new URL(u); if (x.host) return x.protocol + '//' + x.host; } catch(e) {}
+    return 'https://www.netflix.com';
+  }
+
+  function fillCard(card, i) {
+    card._chk.checked = seen[i];
+    if (card._index === i) return;
+    card._index = i;
+    const id = String(ids[i]), url = data.url('url', i), image = data.url('image', i);
+    if (image) { card._poster.src = image; card._poster.classList.remove('empty'); }
+    else { card._poster.removeAttribute('src'); card._poster.classList.add('empty'); }
+    card._poster.alt = titulos[i];
+    card._title.textContent = titulos[i];
+    card._idline.textContent = (id ? 'ID: ' + id : '') + (accounts ? (id ? ' · ' : '') + accounts.names(i) : '');
+    setLink(card._linkTitle, id ? originOf(url) + '/title/' + id : '');
+    setLink(card._linkWatch, url);
+  }
+
+  function measure() {
+    cols = Math.max(1, getComputedStyle(grid).gridTemplateColumns.split(' ').length);
+    if (!order.length) return;
+    const probe = pool[0] || (pool[0] = makeCard());
+    fillCard(probe, order[0]);
+    if (!probe.isConnected) grid.appendChild(probe);
+    rowH = probe.offsetHeight + (parseFloat(getComputedStyle(grid).rowGap) || 0);
+  }
+
+  function render(force) {
+    const total = Math.ceil(order.length / cols);
+    const gridTop = grid.getBoundingClientRect().top + window.scrollY + padTop;
+    const viewTop = window.scrollY - gridTop;
+    const r0 = Math.max(0, Math.min(total, Math.floor(viewTop / rowH) - BUFFER_ROWS));
+    const r1 = Math.max(r0, Math.min(total, Math.ceil((viewTop + window.innerHeight) / rowH) + BUFFER_ROWS));
+    if (!force && r0 === firstRow && r1 === lastRow) return;
+    firstRow = r0; lastRow = r1;
+
+    const start = r0 * cols, count = Math.min(order.length, r1 * cols) - start;
+    while (pool.length < count) pool.push(makeCard());
+    for (let k = 0; k < count; k++) {
+      fillCard(pool[k], order[start + k]);
+      if (!pool[k].isConnected) grid.appendChild(pool[k]);
+    }
+    for (let k = count; k < pool.length; k++) if (pool[k].isConnected) pool[k].remove();
+    grid.style.paddingTop = (padTop + r0 * rowH) + 'px';
+    grid.style.paddingBottom = (padBottom + Math.max(0, total - r1) * rowH) + 'px';
+  }
+
+  let ticking = false;
+  function schedule() {
+    if (ticking) return;
+    ticking = true;
+    requestAnimationFrame(() => { ticking = false; render(false); });
+  }
+  window.addEventListener('scroll', schedule, {passive: true});
+  window.addEventListener('resize', () => { measure(); render(true); });
+
+  // Todas las filas del título (puede estar repetido), cambie aquí o en otra pestaña
+  function applySeen(key, value) {
+    for (const j of byKey.get(key) || []) { seen[j] = value; csv.changed(j); }
+    render(true);
+  }
+  store.onchange(applySeen);
+  function setSeen(i, value) {
+    const key = keyOf(i);
+    store.set(key, value, !!visto[i]);
+    applySeen(key, value);
+  }
+
+  // Un único listener delegado en #grid para todas las tarjetas (visibles o recicladas)
+  grid.addEventListener('change', (e) => {
+    if (!e.target.classList.contains('chk-seen')) return;
+    setSeen(e.target.closest('.card')._index, e.target.checked);
+  });
+  // Click en botones watch/title -> marcar visto
+  grid.addEventListener('click', (e) => {
+    const a = e.target.closest('.btn-watch, .btn-title');
+    if (!a) return;
+    const card = a.closest('.card');
+    card._chk.checked = true;
+    setSeen(card._index, true);
+  });
+
+  function getNum(v, d) { const n = Number(v); return Number.isFinite(n) ? n : d; }
+
+  // Búsqueda + filtros + orden: cada orden se calcula una sola vez (el de título ya
+  // viene de Python), así que un cambio es un recorrido quedándose con las filas que encajan
+  const search = makeSearch(data.extra('search'), titulos);
+  const sorted = {};
+  function sortedAll(how) {
+    if (sorted[how]) return sorted[how];
+    const all = Array.from({length: n}, (_, i) => i);
+    let rows;
+    if (how === 'title-desc') rows = search.sorted('title').slice().reverse();
+    else if (how === 'rank-asc') rows = all.sort((a,b)=> getNum(ranks[a], 9e9) - getNum(ranks[b], 9e9) || a - b);
+    else if (how === 'rank-desc') rows = all.sort((a,b)=> getNum(ranks[b], -1) - getNum(ranks[a], -1) || a - b);
+    else rows = search.sorted('title');
+    return (sorted[how] = rows);
+  }
+  let mask = null; // filas que encajan con la búsqueda, null = todas
+  function applyView() {
+    const rows = sortedAll(sortSel.value), want = seenFilter.value, shown = [];
+    const onAccount = accounts && accounts.test();
+    for (const i of rows) {
+      if (mask && !mask[i]) continue;
+      if (want !== 'all' && seen[i] !== (want === 'seen')) continue;
+      if (onAccount && !onAccount(i)) continue;
+      shown.push(i);
+    }
+    order = shown;
+    countEl.textContent = shown.length === n ? n + ' títulos' : shown.length + ' de ' + n + ' títulos';
+    render(true);
+  }
+  qInput.addEventListener('input', () => { mask = search.match(qInput.value); applyView(); });
+  seenFilter.addEventListener('change', applyView);
+  if (accounts) accountFilter.addEventListener('change', applyView);
+  sortSel.addEventListener('change', applyView);
+  measure();
+  applyView();
+
+  // Exportar CSV con columna "visto": todos los títulos aunque haya filtros, desde los arrays
+  const csv = makeCsvExport(["titulo","id","url","visto"].join(","), i => {
+    const title = titulos[i].replace(/"/g,'""');
+    const id = String(ids[i]);
+    const url = data.url('url', i).replace(/"/g,'""');
+    return ['"'+title+'"', id, '"'+url+'"', seen[i] ? "1" : ""].join(",");
+  });
+  btnExport.addEventListener('click', () => {
+    const blob = csv.blob(sortedAll(sortSel.value));
+    const a = document.createElement('a');
+    a.href = URL.createObjectURL(blob);
+    a.download = "netflix_mylist_actualizado.csv";
+    document.body.appendChild(a);
+    a.click();
+    setTimeout(()=>{ URL.revokeObjectURL(a.href); a.remove(); }, 120);
+  });
+});
+</script>
+</body>
+</html>"""
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Watch mode (`watch`): reprocess the "My List" exports saved into a folder.
+#
+# The folder is rescanned every --poll seconds, and right away on Linux when
+# inotify (through ctypes: the stdlib has no binding) reports a file created,
+# closed after writing, moved or deleted. Network shares rarely deliver those
+# events, hence the rescans. A file is handed out once its size and mtime have
+# held still for --settle seconds, so a page still being saved or copied is not
+# parsed half-written. Its content hash then decides whether it is new: files
+# processed before, by this run or an earlier one (see WatchState), are skipped.
+import ctypes, ctypes.util, json, os, select, signal, sys, time
+from pathlib import Path
+from .batch import expand_inputs
+
+DEFAULT_SETTLE = 2.0  # seconds a file must stay unchanged before it is read
+DEFAULT_POLL = 2.0    # seconds between rescans
+STATE_VERSION = 1
+
+# <sys/inotify.h>
+IN_ATTRIB, IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO = 0x4, 0x8, 0x40, 0x80
+IN_CREATE, IN_DELETE, IN_DELETE_SELF, IN_MOVE_SELF = 0x100, 0x200, 0x400, 0x800
+IN_NONBLOCK, IN_CLOEXEC = 0o4000, 0o2000000
+# No IN_MODIFY: a page being written would wake the loop on every block
+WATCH_MASK = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF)
+
+def open_inotify(folder: Path):
+    """A non-blocking inotify descriptor watching folder, or None where inotify isn't available."""
+    if not sys.platform.startswith("linux"): return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0: return None
+    if libc.inotify_add_watch(fd, os.fsencode(folder), WATCH_MASK) < 0:  # e.g. out of watches
+        os.close(fd)
+        return None
+    return fd
+
+class FolderWatch:
+    """The HTML files of a folder, handed out in batches once they stop changing."""
+
+    def __init__(self, folder, settle: float = DEFAULT_SETTLE, poll: float = DEFAULT_POLL, inotify: bool = True):
+        self.folder, self.settle, self.poll = Path(folder), settle, poll
+        self.fd = open_inotify(self.folder) if inotify else None
+        self.done = {}     # path -> (size, mtime) it was handed out with
+        self.pending = {}  # path -> ((size, mtime), first seen at)
+
+    @property
+    def how(self) -> str:
+        return "inotify" if self.fd is not None else "polling"
+
+    def scan(self) -> dict:
+        sigs = {}
+        for p in expand_inputs([self.folder]):
+            try:
+                st = p.stat()
+            except FileNotFoundError:  # deleted since the listing
+                continue
+            sigs[p] = (st.st_size, st.st_mtime_ns)
+        return sigs
+
+    def changes(self, now: float) -> tuple:
+        """(files ready to process, files gone) since the last call."""
+        sigs = self.scan()
+        removed = [p for p in self.done if p not in sigs]
+        for p in removed: del self.done[p]
+        ready = []
+        for p, sig in sigs.items():
+            if self.done.get(p) == sig:
+                self.pending.pop(p, None)
+                continue
+            seen = self.pending.get(p)
+            if seen is None or seen[0] != sig:
+                self.pending[p] = (sig, now)  # new or still changing: the clock starts (again)
+            elif now - seen[1] >= self.settle:
+                del self.pending[p]
+                self.done[p] = sig
+                ready.append(p)
+        for p in [p for p in self.pending if p not in sigs]: del self.pending[p]
+        return ready, removed
+
+    def recheck(self, paths):
+        """Hand these files out again (once settled) even though they haven't changed."""
+        for p in paths: self.done.pop(p, None)
+
+    def wait(self, timeout: float):
+        """Sleep up to timeout, less when inotify reports a change."""
+        if self.fd is None:
+            time.sleep(timeout)
+            return
+        if select.select([self.fd], [], [], timeout)[0]:
+            try:
+                while os.read(self.fd, 1 << 16): pass  # the events only wake us up: the scan decides
+            except BlockingIOError:
+                pass
+
+    def batches(self, once: bool = False):
+        """Yield (ready, removed) whenever files settle or go away; with once, stop when nothing is left pending."""
+        while True:
+            ready, removed = self.changes(time.monotonic())
+            if ready or removed: yield ready, removed
+            elif once and not self.pending: return
+            self.wait(min(self.poll, self.settle / 2) if self.pending else self.poll)
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+class WatchState:
+    """Content hash of every processed file, saved as JSON so a restarted watch skips them too.
+
+    merged keeps every export merged into a --merge-into CSV, even once its file
+    is gone: merging an old export again would flag newer titles as removed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.files = {}   # path -> digest of its processed content
+        self.merged = []  # digests merged so far, in order
+
+    @classmethod
+    def load(cls, path: Path) -> "WatchState":
+        state = cls(path)
+        try:
+            data = json.loads(state.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return state
+        if data.get("version") == STATE_VERSION:
+            state.files, state.merged = dict(data.get("files", {})), list(data.get("merged", []))
+        return state
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": STATE_VERSION, "files": self.files, "merged": self.merged},
+                                  indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    @staticmethod
+    def key(path: Path) -> str:
+        return str(Path(path).resolve())
+
+    def processed(self, path: Path, digest: str, merged: bool = False) -> bool:
+        """Whether this content was processed already: at this path, as another current file, or merged before."""
+        key = self.key(path)
+        if self.files.get(key) == digest: return True
+        if any(d == digest for p, d in self.files.items() if p != key): return True  # a copy of another export
+        return merged and digest in self.merged
+
+    def record(self, path: Path, digest: str):
+        self.files[self.key(path)] = digest
+
+    def forget(self, path: Path) -> bool:
+        return self.files.pop(self.key(path), None) is not None
+
+def ignore_sigint():
+    """Worker initializer: Ctrl+C reaches the whole process group, but only the watch loop handles it."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
@@ -0,0 +1,5 @@
+# The package is used from the checkout (no install step), like the benchmarks do
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,75 @@
+import csv
+import pytest
+from benchmarks import synth_mylist
+from flix2flix import get_profile
+from flix2flix.accounts import MAX_ACCOUNTS, Membership, account_names
+from flix2flix.cli import main
+
+EN = get_profile("en")
+
+def en(vid, title=None, seen="", removed=""):
+    return {"title": title or f"T{vid}", "id": vid, "url": "", "seen": seen, "removed": removed}
+
+@pytest.fixture
+def members():
+    m = Membership(EN, ["ana", "bea", "cris"])
+    m.add(0, [en("1"), en("2"), en("3"), en("9", removed="1")])
+    m.add(1, [en("2", seen="1"), en("3"), en("4"), en("4")])
+    m.add(2, [en("3"), en("5"), en("", "No id")])
+    return m
+
+def kept(m, keep):
+    return {it["id"] or it["title"]: (it["accounts"], it["accounts_mask"]) for it in m.iter_items(keep)}
+
+def test_masks_and_keep_sets(members):
+    assert kept(members, "all") == {"1": ("ana", 1), "2": ("ana|bea", 3), "3": ("ana|bea|cris", 7),
+                                    "4": ("bea", 2), "5": ("cris", 4), "No id": ("cris", 4)}
+    assert list(kept(members, "common")) == ["3"]
+    assert list(kept(members, "partial")) == ["1", "2", "4", "5", "No id"]
+    assert list(kept(members, "unique")) == ["1", "4", "5", "No id"]
+    assert list(kept(members, "only=cris")) == ["5", "No id"]
+    assert list(kept(members, "only=bea")) == ["4"]
+
+def test_seen_on_any_profile_and_stats(members):
+    assert {it["id"]: it["seen"] for it in members.iter_items()}["2"] == "1"
+    assert members.stats() == {"titles": 6, "common": 1, "sizes": [3, 3, 3], "unique": [1, 1, 2]}
+
+def test_unknown_keep_sets(members):
+    for keep in ("nope", "only=dani", "only="):
+        with pytest.raises(ValueError):
+            members.keeps(keep)
+    with pytest.raises(ValueError):
+        Membership(EN, [str(i) for i in range(MAX_ACCOUNTS + 1)])
+
+def test_account_names(tmp_path):
+    odd = tmp_path / "x=y.csv"
+    odd.write_text("")
+    got = account_names(["ana=exports/a.html", "exports/bea.csv", "other/bea.html", "=c.csv", str(odd)])
+    assert [name for name, _ in got] == ["ana", "bea", "bea-2", "=c", "x=y"]  # "=c.csv" is a path
+    assert [p.name for _, p in got][:3] == ["a.html", "bea.csv", "bea.html"]
+
+@pytest.mark.parametrize("op, keep, expected", [("union", None, 7), ("diff", None, 6), ("union", "common", 1),
+                                                ("diff", "only=page", 4)])
+def test_cli_mixes_csv_and_html(tmp_path, op, keep, expected):
+    page = tmp_path / "page.html"
+    page.write_text("".join(synth_mylist.iter_page(5)), encoding="utf-8")
+    ana = tmp_path / "ana.csv"
+    ana.write_text("title,id,url,seen\nShared,80000007,,1\nMine,12,,\nGone,13,,\n", encoding="utf-8")
+    out = tmp_path / "out.csv"
+    argv = [op, f"ana={ana}", str(page), "--out", str(out), "--viewer-out", str(tmp_path / "v.html"), "--jobs", "2",
+            "--no-cache"] + (["--keep", keep] if keep else [])
+    main("en", argv)
+    with open(out, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == expected
+    shared = [r for r in rows if r["id"] == "80000007"]
+    if keep in (None, "common") and op == "union":
+        assert shared[0]["accounts"] == "ana|page" and shared[0]["accounts_mask"] == "3" and shared[0]["seen"] == "1"
+    assert "accounts" in (tmp_path / "v.html").read_text(encoding="utf-8")
+
+def test_cli_refuses_an_unknown_profile(tmp_path):
+    ana = tmp_path / "ana.csv"
+    ana.write_text("title,id\nA,1\n", encoding="utf-8")
+    with pytest.raises(SystemExit) as e:
+        main("en", ["union", str(ana), str(ana), "--keep", "only=bea", "--out", str(tmp_path / "o.csv")])
+    assert "ana, ana-2" in str(e.value)
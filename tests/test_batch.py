@@ -0,0 +1,68 @@
+import csv
+from functools import partial
+import pytest
+from benchmarks import synth_mylist
+from flix2flix.batch import expand_inputs, parse_many, parse_or_error
+from flix2flix.cli import main
+from flix2flix.pipeline import parse_html_file
+
+def page(path, n, seed=0):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(synth_mylist.iter_page(n, seed=seed)), encoding="utf-8")
+    return path
+
+@pytest.fixture
+def exports(tmp_path):
+    d = tmp_path / "exports"
+    for i, name in enumerate(["c.html", "a.HTM", "b.html"]):
+        page(d / name, i + 1, seed=i)
+    (d / "notes.txt").write_text("")
+    (d / "sub").mkdir()
+    page(d / "sub" / "d.html", 1)
+    return d
+
+def test_directories_and_globs(exports, tmp_path):
+    names = lambda paths: [p.name for p in paths]
+    assert names(expand_inputs([exports])) == ["a.HTM", "b.html", "c.html"]  # sorted, HTML only, not recursive
+    assert names(expand_inputs([str(exports / "*.html")])) == ["b.html", "c.html"]
+    assert names(expand_inputs([str(exports / "*" / "*.html")])) == ["d.html"]
+    assert names(expand_inputs([str(exports / "*.txt")])) == ["notes.txt"]  # a glob takes what it names
+    assert expand_inputs([str(tmp_path / "none-*.html")]) == []
+
+def test_argument_order_and_duplicates(exports, monkeypatch):
+    monkeypatch.chdir(exports.parent)
+    got = expand_inputs([exports / "c.html", "exports", "exports/./c.html", str(exports / "*.html"), "missing.html"])
+    assert [p.as_posix() for p in got] == [(exports / "c.html").as_posix(), "exports/a.HTM", "exports/b.html",
+                                           "missing.html"]  # first spelling wins; a missing file is kept for the parser
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_results_in_input_order(exports, jobs):
+    paths = [exports / "c.html", exports / "a.HTM", exports / "b.html"]
+    got = list(parse_many(paths, partial(parse_html_file, lang="en"), jobs=jobs))
+    assert [p for p, _ in got] == paths and [len(items) for _, items in got] == [1, 2, 3]
+
+def test_parse_or_error():
+    assert parse_or_error(len, "abc") == 3
+    assert isinstance(parse_or_error(int, "x"), ValueError)
+
+def read(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_merged_output_tags_the_source_file(exports, tmp_path, capsys, jobs):
+    out = tmp_path / "all.csv"
+    main("en", [str(exports / "c.html"), str(exports / "gone.html"), str(exports / "a.HTM"), "--jobs", jobs,
+                "--out", str(out), "--viewer-out", str(tmp_path / "v.html"), "--no-cache"])
+    rows = read(out)
+    assert [r["source_file"] for r in rows] == [str(exports / "c.html")] + [str(exports / "a.HTM")] * 2
+    printed = capsys.readouterr().out
+    assert "gone.html skipped" in printed and "3 items processed from 2 files" in printed
+
+def test_per_file_goes_on_after_a_bad_file(exports, tmp_path, capsys):
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    main("en", [str(exports / "gone.html"), str(exports), "--per-file", "--out-dir", str(out_dir), "--jobs", "2",
+                "--no-cache"])
+    assert sorted(p.name for p in out_dir.glob("*.csv")) == ["a.csv", "b.csv", "c.csv"]
+    assert len(read(out_dir / "b.csv")) == 3 and "gone.html skipped" in capsys.readouterr().out
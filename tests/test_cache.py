@@ -0,0 +1,81 @@
+import os
+from benchmarks import synth_mylist
+from flix2flix import get_profile
+from flix2flix.cache import ENTRY_SUFFIX, ParseCache
+from flix2flix.pipeline import iter_items_from_html
+
+def page(tmp_path, n=3, seed=1, name="list.html"):
+    path = tmp_path / name
+    path.write_text("".join(synth_mylist.iter_page(n, seed=seed)), encoding="utf-8")
+    return path
+
+def parse(path, cache, **kw):
+    return list(iter_items_from_html(path, get_profile(kw.pop("lang", "en")), cache=cache, **kw))
+
+def entries(cache):
+    return sorted(p.name for p in cache.cache_dir.iterdir() if p.name.endswith(ENTRY_SUFFIX))
+
+def test_hit_and_miss(tmp_path):
+    cache, path = ParseCache(tmp_path / "cache"), page(tmp_path)
+    key = cache.key(path, "v1")
+    assert cache.get(key) is None
+    rows = parse(path, cache)
+    assert len(entries(cache)) == 1
+    assert cache.get(cache.key(path, "v1")) is None  # another salt
+    calls = []
+    assert list(cache.cached(key, lambda: calls.append(1) or iter([{"id": "x"}]))) == [{"id": "x"}]
+    assert list(cache.cached(key, lambda: calls.append(1) or iter([]))) == [{"id": "x"}] and calls == [1]
+    assert parse(path, cache) == rows and len(entries(cache)) == 2
+
+def test_a_changed_file_is_parsed_again(tmp_path):
+    cache, path = ParseCache(tmp_path / "cache"), page(tmp_path)
+    first = parse(path, cache)
+    page(tmp_path, n=4)  # other size and content
+    assert len(parse(path, cache)) == 4 and len(entries(cache)) == 2
+    page(tmp_path, n=3)
+    assert parse(path, cache) == first and len(entries(cache)) == 2  # back to the first content: a hit
+
+def test_keyed_by_content_not_mtime(tmp_path):
+    # the key is the content hash: touching a file, or copying it elsewhere, keeps the entry
+    cache, path = ParseCache(tmp_path / "cache"), page(tmp_path)
+    key = cache.key(path, "v")
+    os.utime(path, (1, 1))
+    assert cache.key(path, "v") == key == cache.key(page(tmp_path, name="copy.html"), "v")
+
+def test_salt_has_version_backend_and_profile(tmp_path):
+    cache, path = ParseCache(tmp_path / "cache"), page(tmp_path)
+    parse(path, cache, engine="stream")
+    parse(path, cache, engine="stream")
+    assert len(entries(cache)) == 1
+    parse(path, cache, engine="stream", prefilter=True)
+    parse(path, cache, engine="bs4", parser="html.parser")
+    parse(path, cache, engine="stream", lang="es")
+    assert len(entries(cache)) == 4
+
+def test_lru_eviction_at_the_cap(tmp_path):
+    cache = ParseCache(tmp_path / "cache")
+    items = [{"id": str(i), "title": os.urandom(8).hex()} for i in range(200)]
+    cache.put("a", items)
+    size = (cache.cache_dir / ("a" + ENTRY_SUFFIX)).stat().st_size
+    cache.max_bytes = size * 2 + size // 2  # room for two entries
+    cache.put("b", items)
+    os.utime(cache.cache_dir / ("a" + ENTRY_SUFFIX), (1, 1))
+    os.utime(cache.cache_dir / ("b" + ENTRY_SUFFIX), (2, 2))
+    assert cache.get("a") == items  # read: a becomes the most recent
+    cache.put("c", items)
+    assert entries(cache) == ["a" + ENTRY_SUFFIX, "c" + ENTRY_SUFFIX]
+
+def test_corrupt_entry_is_reparsed(tmp_path):
+    cache, path = ParseCache(tmp_path / "cache"), page(tmp_path)
+    rows = parse(path, cache)
+    (entry,) = cache.cache_dir.glob("*" + ENTRY_SUFFIX)
+    entry.write_bytes(b"not zlib")
+    assert parse(path, cache) == rows
+    assert cache.get(entry.name[:-len(ENTRY_SUFFIX)]) == rows  # written again
+
+def test_clear(tmp_path):
+    cache = ParseCache(tmp_path / "cache")
+    assert cache.clear() == 0
+    cache.put("a", [])
+    cache.put("b", [])
+    assert cache.clear() == 2 and entries(cache) == []
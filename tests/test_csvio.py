@@ -0,0 +1,57 @@
+import pytest
+from benchmarks import synth_mylist
+from flix2flix import csvio, get_profile, parse_html
+from flix2flix.csvio import read_columns, read_items_from_csv, write_columns, write_csv
+
+ROWS = [{"title": "Taxi", "id": "70002005", "url": "https://www.netflix.com/watch/70002005", "seen": "1"},
+        {"title": 'Quotes "and", commas', "id": "81663325", "url": "", "seen": ""},
+        {"title": "Niño\nSeñor", "id": "", "url": "https://www.netflix.com/watch/9", "seen": ""}]
+
+@pytest.fixture(params=["csv module", "pyarrow"])
+def reader(request, monkeypatch):
+    """Run the test through both read paths: small files normally skip pyarrow."""
+    if request.param == "pyarrow":
+        pytest.importorskip("pyarrow")
+        monkeypatch.setattr(csvio, "ARROW_MIN_BYTES", 0)
+    else:
+        monkeypatch.setattr(csvio, "ARROW_MIN_BYTES", float("inf"))
+    return request.param
+
+def test_round_trip(tmp_path, reader):
+    profile = get_profile("en")
+    path = tmp_path / "list.csv"
+    write_csv(ROWS, path, profile)
+    assert read_items_from_csv(path, profile) == [dict(r, removed="") for r in ROWS]  # English rows always have it
+
+def test_other_profile_reads_through_aliases(tmp_path, reader):
+    path = tmp_path / "lista.csv"
+    path.write_text("titulo,id,url,visto,eliminado\nCafé,1,,1,\nOtro,2,,,1\n", encoding="utf-8-sig")
+    rows = read_items_from_csv(path, get_profile("en"))
+    assert [(r["title"], r["seen"], r["removed"]) for r in rows] == [("Café", "1", ""), ("Otro", "", "1")]
+
+def test_own_column_wins_over_alias_unless_empty(tmp_path, reader):
+    path = tmp_path / "both.csv"
+    path.write_text("title,id,url,seen,visto\nA,1,,,1\nB,2,,1,\n", encoding="utf-8")
+    rows = read_items_from_csv(path, get_profile("en"))
+    assert [r["seen"] for r in rows] == ["1", "1"]
+
+def test_ragged_rows_are_padded(tmp_path, reader):
+    path = tmp_path / "ragged.csv"
+    path.write_text("title,id,url,seen\nA,1\nB,2,u,1,extra\n", encoding="utf-8")
+    rows = read_items_from_csv(path, get_profile("en"))
+    assert [list(r.values()) for r in rows] == [["A", "1", "", "", ""], ["B", "2", "u", "1", ""]]
+
+def test_columns_round_trip_byte_identical(tmp_path, reader):
+    profile = get_profile("es")
+    rows = [dict(zip(profile.fields, (f"{k}{i}" for k in profile.fields))) for i in range(20)]
+    by_rows, by_columns = tmp_path / "rows.csv", tmp_path / "columns.csv"
+    write_csv(rows, by_rows, profile)
+    write_columns(read_columns(by_rows, profile), by_columns, profile)
+    assert by_columns.read_bytes() == by_rows.read_bytes()
+
+@pytest.mark.parametrize("lang", ["en", "es"])
+def test_parsed_rows_carry_exactly_the_profile_fields(lang):
+    # what the parse cache stores: the CSV readers and writers rely on every key being there
+    profile = get_profile(lang)
+    rows = parse_html("".join(synth_mylist.iter_page(50)), profile)
+    assert rows and all(list(r) == profile.fields for r in rows)
@@ -0,0 +1,87 @@
+import csv
+import pytest
+from benchmarks import synth_mylist
+from flix2flix import get_profile
+from flix2flix.cli import main
+from flix2flix.dedupe import Deduper, jaccard, shingles, title_key, write_report
+
+EN, ES = get_profile("en"), get_profile("es")
+
+def en(title, vid):
+    return {"title": title, "id": vid, "url": "", "seen": ""}
+
+def es(titulo, vid, entity="", supp=""):
+    return {"titulo": titulo, "id": vid, "href_original": f"/watch/{vid}" if vid else "",
+            "unifiedEntityId": entity, "supp_video_id": supp}
+
+def kept(deduper, items):
+    return [it.get("id") for it in deduper(items)]
+
+@pytest.mark.parametrize("title, key", [("Dark", "dark"), ("Élite: Temporada 2", "elite"),
+                                        ("Stranger Things Season 4", "stranger things"), ("Lupin Part III", "lupin"),
+                                        ("Narcos S2", "narcos"), ("Season 2", "season 2")])
+def test_title_key(title, key):
+    assert title_key(title) == key
+
+def test_by_id_keeps_the_first_and_drops_rows_without_id():
+    d = Deduper(EN)
+    assert kept(d, [en("A", "1"), en("B", "2"), en("A copy", "1"), en("No id", "")]) == ["1", "2"]
+    assert d.counts == {"id": 1, "no id": 1} and d.dropped == 2
+
+def test_spanish_key_falls_back_to_href():
+    a, b = es("A", ""), es("B", "")
+    a["href_original"] = b["href_original"] = "/watch/5"
+    assert [it["titulo"] for it in Deduper(ES)([a, b])] == ["A"]
+
+def test_entity_and_supp():
+    items = [es("Show", "81000001", entity="Video:1"), es("Show (other cut)", "81000002", entity="Video:1"),
+             es("Show: season 2", "81000003", supp="81000001"), es("Other", "81000004", supp="1")]
+    d = Deduper(ES, by=("entity", "supp"))
+    assert kept(d, items) == ["81000001", "81000004"]
+    assert d.counts == {"entity": 1, "supp": 1}
+
+def test_title_and_fuzzy():
+    items = [en("Stranger Things", "1"), en("Stranger Things: Season 2", "2"), en("Money Heist", "3"),
+             en("Money Heists", "4"), en("Monkey Business", "5")]
+    assert kept(Deduper(EN, by=("title",)), items) == ["1", "3", "4", "5"]
+    assert kept(Deduper(EN, by=("title", "fuzzy"), threshold=0.7), items) == ["1", "3", "5"]
+
+def test_fuzzy_threshold():
+    a, b = shingles(title_key("Money Heist")), shingles(title_key("Money Heists"))
+    assert 0.7 < jaccard(a, b) < 0.9
+    items = [en("Money Heist", "1"), en("Money Heists", "2")]
+    assert kept(Deduper(EN, by=("fuzzy",), threshold=0.95), items) == ["1", "2"]
+
+def test_a_duplicate_links_its_other_keys_to_the_group():
+    # 3 matches 2 by title only, but 2 joined group 1 by id, so 3 is reported under group 1
+    d = Deduper(EN, by=("id", "title"))
+    assert kept(d, [en("Dark", "1"), en("Dark II", "1"), en("Dark ii", "7")]) == ["1"]
+    assert list(d.merged) == [0]
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        Deduper(EN, by=("id", "nope"))
+
+def test_report_numbers_groups_across_dedupers(tmp_path):
+    first, second = Deduper(EN), Deduper(EN, by=("title",))
+    list(first([en("A", "1"), en("A", "1"), en("A", "1")]))
+    list(second([en("B", "2"), en("b!", "3")]))
+    path = tmp_path / "groups.csv"
+    assert write_report([first, second], path) == 2
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = [(r["group"], r["kept"], r["match"], r["rows"], r["id"]) for r in csv.DictReader(f)]
+    assert rows == [("1", "1", "", "1", "1"), ("1", "", "id", "2", "1"), ("2", "1", "", "1", "2"),
+                    ("2", "", "title", "1", "3")]
+
+@pytest.mark.parametrize("mode", [["--merge-into", "progress.csv"], ["--db", "catalog.db", "--export-csv"]])
+def test_dedupe_applies_before_merge_and_sync(tmp_path, mode, capsys):
+    page = tmp_path / "list.html"
+    page.write_text("".join(synth_mylist.iter_page(12, dup_every=4)), encoding="utf-8")
+    out = tmp_path / "out.csv"
+    target = [str(tmp_path / mode[1])] + mode[2:]
+    main("en", [str(page), mode[0]] + target + ["--out", str(out), "--viewer-out", str(tmp_path / "v.html"),
+                                                "--no-cache", "--dedupe", "--dedupe-report", str(tmp_path / "g.csv")])
+    with open(out if mode[0] == "--db" else tmp_path / mode[1], encoding="utf-8", newline="") as f:
+        ids = [r["id"] for r in csv.DictReader(f)]
+    assert len(ids) == 9 and len(set(ids)) == 9  # 3 repeated cards dropped
+    assert "3 duplicates dropped" in capsys.readouterr().out and (tmp_path / "g.csv").exists()
@@ -0,0 +1,71 @@
+import pytest
+from flix2flix import get_profile
+from flix2flix.formats import (FORMATS, SUFFIXES, FormatUnavailable, check_format, format_of, iter_write_items,
+                               missing_modules, read_items, sniff_format)
+
+def installed(fmt):
+    return pytest.param(fmt, marks=pytest.mark.skipif(bool(missing_modules(fmt)), reason=f"{fmt} not installed"))
+
+ALL = [installed(f) for f in FORMATS]
+
+def rows(profile, n=5):
+    out = []
+    for i in range(n):
+        it = {k: f"{k} {i}" for k in profile.fields}
+        it.update({"id": str(80000000 + i), profile.seen_field: "1" if i % 2 else ""})
+        out.append(it)
+    out[0][profile.title_field] = 'Niño, "Señor"\nCafé'
+    return out
+
+def write(items, path, profile, fmt, fields=None):
+    # the writers are generators passing every item on, like the pipeline consumes them
+    return list(iter_write_items(items, path, profile, fields=fields, fmt=fmt))
+
+@pytest.mark.parametrize("fmt", ALL)
+@pytest.mark.parametrize("lang", ["en", "es"])
+def test_round_trip(tmp_path, lang, fmt):
+    profile = get_profile(lang)
+    items = rows(profile)
+    path = tmp_path / ("list" + SUFFIXES[fmt])
+    assert write(items, path, profile, fmt) == items
+    assert sniff_format(path) == fmt and format_of(path) == fmt
+    got = read_items(path, profile)
+    if lang == "en": got = [{k: v for k, v in it.items() if k != "removed"} for it in got]  # always read back
+    assert got == items
+
+@pytest.mark.parametrize("fmt", ALL)
+def test_sniffed_whatever_the_name(tmp_path, fmt):
+    profile = get_profile("en")
+    path = tmp_path / "list.txt"
+    write(rows(profile), path, profile, fmt)
+    assert sniff_format(path) == fmt
+    assert len(read_items(path, profile)) == 5
+
+@pytest.mark.parametrize("fmt", ALL)
+def test_other_profile_and_extra_fields(tmp_path, fmt):
+    es, en = get_profile("es"), get_profile("en")
+    path = tmp_path / ("lista" + SUFFIXES[fmt])
+    items = [dict(it, source_file="a.html", rank=3) for it in rows(es, 2)]
+    write(items, path, es, fmt, fields=es.fields + ["source_file"])
+    got = read_items(path, en)
+    assert [(it["title"], it["seen"]) for it in got] == [(items[0]["titulo"], ""), ("titulo 1", "1")]
+    assert all(it["source_file"] == "a.html" for it in read_items(path, es))
+    assert read_items(path, es)[0]["rank"] == "3"  # every format stores text
+
+def test_missing_package_is_reported(monkeypatch):
+    import flix2flix.formats as formats
+    monkeypatch.setattr(formats, "find_spec", lambda name: None)
+    with pytest.raises(FormatUnavailable) as e:
+        check_format("parquet")
+    assert e.value.pip == "pyarrow"
+    assert check_format("csv.gz") == "csv.gz"
+    with pytest.raises(ValueError):
+        check_format("xlsx")
+
+def test_gzip_output_is_reproducible(tmp_path):
+    profile = get_profile("en")
+    (tmp_path / "a").mkdir(); (tmp_path / "b").mkdir()
+    a, b = tmp_path / "a" / "list.csv.gz", tmp_path / "b" / "list.csv.gz"  # gzip keeps the name, not the time
+    write(rows(profile), a, profile, "csv.gz")
+    write(rows(profile), b, profile, "csv.gz")
+    assert a.read_bytes() == b.read_bytes()
@@ -0,0 +1,77 @@
+import codecs, mmap
+import pytest
+from flix2flix import get_profile
+from flix2flix.htmlsource import decode_page, iter_decoded, open_page, read_chunks, read_page, sniff_encoding
+from flix2flix.pipeline import iter_items_from_html
+
+TEXT = "Niño, Señor — Café «Ñ» €"
+CARD = ('<div data-ui-tracking-context="%7B%22video_id%22%3A7%7D"><a href="/title/7" aria-label="{}"></a></div>')
+
+@pytest.mark.parametrize("head, expected", [
+    (codecs.BOM_UTF8 + b"<html>", ("utf-8", 3)),
+    (codecs.BOM_UTF16_LE + "<html>".encode("utf-16-le"), ("utf-16-le", 2)),
+    (codecs.BOM_UTF16_BE + "<html>".encode("utf-16-be"), ("utf-16-be", 2)),
+    (b'<meta charset="windows-1252">', ("cp1252", 0)),
+    (b"<META CHARSET=iso-8859-1>", ("cp1252", 0)),  # latin1 labels mean windows-1252, as in browsers
+    (b'<meta http-equiv="Content-Type" content="text/html; charset=ISO-8859-15">', ("iso8859-15", 0)),
+    (b'<meta charset="utf-16">', ("utf-8", 0)),  # without a BOM, ignored
+    (b'<meta charset="base64">', ("utf-8", 0)),
+    (b'<meta charset="nope">', ("utf-8", 0)),
+    (b"<html><head>", ("utf-8", 0)),
+    (b" " * 5000 + b'<meta charset="cp1252">', ("utf-8", 0)),  # past the sniffed head
+])
+def test_sniff_encoding(head, expected):
+    assert sniff_encoding(head) == expected
+
+@pytest.mark.parametrize("raw", [
+    codecs.BOM_UTF8 + TEXT.encode("utf-8"),
+    codecs.BOM_UTF16_LE + TEXT.encode("utf-16-le"),
+    codecs.BOM_UTF16_BE + TEXT.encode("utf-16-be"),
+    ('<meta charset="cp1252">' + TEXT).encode("cp1252"),
+    ('<meta http-equiv="content-type" content="text/html;charset=windows-1252">' + TEXT).encode("cp1252"),
+])
+def test_pages_decode_in_their_encoding(tmp_path, raw):
+    path = tmp_path / "p.html"
+    path.write_bytes(raw)
+    text = read_page(path)
+    assert text.endswith(TEXT) and not text.startswith("\ufeff")
+    for size in (1, 2, 3, 7):  # every split of a multibyte character
+        assert "".join(read_chunks(path, size)) == text
+
+def test_characters_split_across_chunks(tmp_path):
+    path = tmp_path / "p.html"
+    path.write_bytes(("€" * 3 + "ñ" + "😀").encode("utf-8"))
+    chunks = list(read_chunks(path, 2))
+    assert "".join(chunks) == "€€€ñ😀" and "\ufffd" not in "".join(chunks)
+
+def test_undecodable_bytes_are_replaced(tmp_path):
+    path = tmp_path / "p.html"
+    path.write_bytes(b"ok \xff\xfe\xfa end")
+    assert read_page(path) == "".join(read_chunks(path, 3)) == "ok " + "\ufffd" * 3 + " end"
+
+def test_empty_and_mapped_files(tmp_path):
+    empty = tmp_path / "empty.html"
+    empty.write_bytes(b"")
+    with open_page(empty) as buf:
+        assert buf == b"" and decode_page(buf) == "" and list(iter_decoded(buf)) == []
+    assert read_page(empty) == "" and list(read_chunks(empty)) == []
+    small = tmp_path / "small.html"
+    small.write_bytes("é".encode("utf-8"))
+    with open_page(small) as buf:
+        assert isinstance(buf, mmap.mmap) and decode_page(buf) == "é"
+
+def test_page_larger_than_the_release_step(tmp_path):
+    # the stream decoder hands mapped pages back to the OS every MB: the text must not change
+    path = tmp_path / "big.html"
+    text = ("<p>" + TEXT + "</p>\n") * 60000
+    path.write_bytes(text.encode("utf-8"))
+    assert len(path.read_bytes()) > 2 << 20
+    assert "".join(read_chunks(path, 4099)) == read_page(path) == text
+
+@pytest.mark.parametrize("engine", ["stream", "bs4"])
+def test_cp1252_page_keeps_its_accents(tmp_path, engine):
+    path = tmp_path / "p.html"
+    path.write_bytes(('<html><head><meta charset="windows-1252"></head><body>' + CARD.format(TEXT)
+                      + "</body></html>").encode("cp1252"))
+    rows = list(iter_items_from_html(path, get_profile("en"), engine=engine))
+    assert [r["title"] for r in rows] == [TEXT]
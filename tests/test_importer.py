@@ -0,0 +1,53 @@
+import json, re, shutil, subprocess, sys
+from pathlib import Path
+import pytest
+from flix2flix import get_profile
+from flix2flix.importer import (CHECKPOINT_PREFIX, MESSAGES, build_import_script, checkpoint_key, import_ids,
+                                write_import_script)
+
+EN, ES = get_profile("en"), get_profile("es")
+ROOT = Path(__file__).resolve().parent.parent
+
+def en(vid, seen="", removed=""):
+    return {"title": f"T{vid}", "id": vid, "url": "", "seen": seen, "removed": removed}
+
+def embedded(script, name):
+    return json.loads(re.search(rf"const {name} = (.*);\n", script).group(1))
+
+def test_import_ids_skips_seen_removed_and_present():
+    items = [en("1"), en("2", seen="1"), en("3", removed="1"), en("1"), en(" 4 "), en(""), en("5")]
+    assert import_ids(items, EN) == ["1", "4", "5"]
+    assert import_ids(items, EN, present={"5"}) == ["1", "4"]
+    assert import_ids(items, EN, include_seen=True) == ["1", "2", "4", "5"]
+
+def test_import_ids_spanish_fields():
+    items = [{"titulo": "A", "id": "1", "visto": "sí"}, {"titulo": "B", "id": "2", "eliminado": "1"},
+             {"titulo": "C", "id": "3", "visto": "0"}]
+    assert import_ids(items, ES) == ["3"]
+
+def test_checkpoint_key_follows_the_list():
+    key = checkpoint_key(["1", "2"])
+    assert key.startswith(CHECKPOINT_PREFIX) and key == checkpoint_key(["1", "2"])
+    assert key != checkpoint_key(["2", "1"]) and key != checkpoint_key(["1"])
+
+def test_script_embeds_ids_and_config():
+    ids = ["81000001", "</script><b>"]
+    script = build_import_script(ids, ES, concurrency=0, delay=0.25, retries=0, timeout=2)
+    assert "</script>" not in script  # safe to paste inside a <script> too
+    assert embedded(script, "IDS") == ids
+    config = embedded(script, "CONFIG")
+    assert config["key"] == checkpoint_key(ids) and config["text"] == MESSAGES["es"]
+    assert (config["concurrency"], config["delay"], config["retries"], config["timeout"]) == (1, 250, 1, 2000)
+
+def test_write_import_script(tmp_path):
+    out = tmp_path / "out" / "import.js"
+    assert write_import_script([en("1"), en("2", seen="1"), en("3")], out, EN, present={"3"}) == 1
+    script = out.read_text(encoding="utf-8")
+    assert embedded(script, "IDS") == ["1"] and embedded(script, "CONFIG")["text"] == MESSAGES["en"]
+
+@pytest.mark.skipif(not (shutil.which("node") or shutil.which("nodejs")), reason="node not installed")
+def test_scheduling_under_node():
+    # the mock title page run of benchmarks/check_import.py, trimmed down
+    run = subprocess.run([sys.executable, str(ROOT / "benchmarks" / "check_import.py"), "--titles", "80"],
+                         capture_output=True, text=True, timeout=120)
+    assert run.returncode == 0, run.stdout + run.stderr
@@ -0,0 +1,54 @@
+import csv
+from flix2flix import get_profile
+from flix2flix.csvio import read_items_from_csv, write_csv
+from flix2flix.merge import merge_items, merged_fields, write_merged
+
+def row(title, vid, seen=""):
+    return {"title": title, "id": vid, "url": f"https://www.netflix.com/watch/{vid}" if vid else "", "seen": seen}
+
+def read(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f))
+
+def merge_file(path, fresh, profile):
+    result = merge_items(read_items_from_csv(path, profile), fresh, removed_field=profile.removed_field)
+    fields = merged_fields(profile.fields, result, path, removed_field=profile.removed_field)
+    return result, write_merged(result, path, fields, encoding=profile.csv_encoding)
+
+def test_rewrite_keeps_repeated_and_keyless_rows(tmp_path):
+    profile = get_profile("en")
+    path = tmp_path / "progress.csv"
+    existing = [row("A", "1", "1"), row("B", "2"), row("A again", "1"), row("No id", "", "1"),
+                row("C", "3", "1"), row("B again", "2", "1")]
+    existing[3]["title"] = ""  # no id, url or title: no key at all
+    write_csv(existing, path, profile)
+
+    result, action = merge_file(path, [row("A", "1"), row("D", "4")], profile)  # 2 and 3 are gone
+
+    assert action == "rewritten"
+    out = read(path)
+    assert [(r["id"], r["seen"]) for r in out] == [("1", "1"), ("2", ""), ("1", ""), ("", "1"), ("3", "1"),
+                                                   ("2", "1"), ("4", "")]
+    assert [r["removed"] for r in out] == ["", "1", "", "", "1", "1", ""]
+    assert (result.stats.added, result.stats.removed, result.stats.unchanged) == (1, 2, 1)
+
+def test_restored_key_clears_every_repeated_row(tmp_path):
+    profile = get_profile("en")
+    path = tmp_path / "progress.csv"
+    write_csv([dict(row("B", "2"), removed="1"), dict(row("B again", "2", "1"), removed="1")], path, profile,
+              fields=profile.fields + ["removed"])
+
+    result, action = merge_file(path, [row("B", "2")], profile)
+
+    assert action == "rewritten" and result.stats.restored == 1
+    assert [(r["seen"], r["removed"]) for r in read(path)] == [("", ""), ("1", "")]
+
+def test_new_titles_only_are_appended(tmp_path):
+    profile = get_profile("en")
+    path = tmp_path / "progress.csv"
+    write_csv([row("A", "1", "1"), row("A again", "1")], path, profile)
+
+    _, action = merge_file(path, [row("A", "1"), row("B", "2")], profile)
+
+    assert action == "appended"
+    assert [(r["id"], r["seen"]) for r in read(path)] == [("1", "1"), ("1", ""), ("2", "")]
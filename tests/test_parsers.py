@@ -0,0 +1,74 @@
+# Every installed --parser backend (and the stream engine) must give the same rows, for both profiles
+import pytest
+from benchmarks import synth_mylist
+from flix2flix import core, get_profile, parse_html
+
+EDGE_CASES = {
+    # no card with a link: the Spanish profile falls back to the page's /watch/ anchors
+    "watch links only": '<html><body><p>x<a href="/watch/123?x=1" aria-label=" A "><img src=" s.jpg "></a>'
+                        '<a href="/browse">no</a><a href="/watch/456">  Some <b>text</b>\n here</a><br/><div/>'
+                        '<a href="/watch/abc">z</a></body>',
+    "odd cards": '<div class="title-card" id="tc-1"><div data-ui-tracking-context="%7B%22video_id%22%3A7%7D" '
+                 'data-unified-entity-id="Video:7" hidden><a href="/title/7" aria-label="Tom &amp; Jerry &#233;">'
+                 '<img alt="x"></a></div></div>'
+                 '<div data-ui-tracking-context="{broken"><a href="/watch/8?tctx=1%2C2"><div class="fallback-text-container">'
+                 '<p class="fallback-text"> Fall &lt;back&gt; </p></div></a></div>'
+                 '<span data-ui-tracking-context=""><a>no href</a></span>'
+                 '<div data-ui-tracking-context="%7B%7D"></div>'
+                 '<div class="title-card outer"><div class="x"><div data-ui-tracking-context="%7B%7D" '
+                 'data-unified-entity-id="Video:9"><a href="/watch/9"><img src="p.jpg" alt=" Alt "></a></div></div></div>',
+}
+CARD = '<div data-ui-tracking-context="%7B%22video_id%22%3A{0}%7D"><a href="/title/{0}" aria-label="T{0}"></a></div>'
+PREFILTER_CASES = {
+    # where --prefilter has to look back past something for the card's div.title-card
+    "script in the wrapper": '<div class="title-card" id="tc1"><script>var s = "<div>";</script>' + CARD.format(11)
+                             + '</div>',
+    "comment in the wrapper": '<div class="title-card" id="tc1"><!-- <div class="title-card" id="no"> -->'
+                              + CARD.format(12) + '</div>',
+    "far wrapper": '<div class="title-card" id="tc1"><div class="pad">' + "x" * 10000 + "</div>" + CARD.format(13)
+                   + "</div>",
+    "wrapper in a script": '<script>"<div class=\'title-card\' id=\'no\'>"</script>' + CARD.format(14),
+    "marker first": 'data-ui-tracking-context <div class="title-card" id="tc1">' + CARD.format(15) + '</div>',
+    "two cards": '<div class="title-card" id="tc1"><style>p{}</style>' + CARD.format(16) + '</div>'
+                 + '<div class="title-card" id="tc2"><script></script>' + CARD.format(17) + '</div>',
+}
+PAGES = {"synthetic": "".join(synth_mylist.iter_page(500, dup_every=7)), **EDGE_CASES, **PREFILTER_CASES}
+BACKENDS = ["stream"] + core.available_parsers()
+
+def rows(html: str, lang: str, backend: str, path=None) -> list:
+    """Rows of html; with path, written there and read with --prefilter."""
+    engine, parser = ("stream", "auto") if backend == "stream" else ("bs4", backend)
+    profile = get_profile(lang)
+    if path is not None: path.write_text(html, encoding="utf-8")
+    cards = core.iter_page_cards(path, html=None if path else html, engine=engine, parser=parser,
+                                 watch_fallback=profile.watch_fallback, prefilter=path is not None)
+    return list(profile.iter_items(cards))
+
+@pytest.mark.parametrize("backend", BACKENDS[1:])
+@pytest.mark.parametrize("page", PAGES)
+@pytest.mark.parametrize("lang", ["en", "es"])
+def test_backend_matches_stream(lang, page, backend):
+    assert rows(PAGES[page], lang, backend) == rows(PAGES[page], lang, "stream")
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("page", PAGES)
+@pytest.mark.parametrize("lang", ["en", "es"])
+def test_prefilter_matches_the_whole_page(tmp_path, lang, page, backend):
+    assert rows(PAGES[page], lang, backend, tmp_path / "list.html") == rows(PAGES[page], lang, "stream")
+
+def test_prefilter_cases_have_their_wrapper():
+    for page, html in PREFILTER_CASES.items():
+        got = [r["container_id"] for r in rows(html, "es", "stream")]
+        assert got == (["tc1", "tc2"] if page == "two cards" else [""] if page == "wrapper in a script" else ["tc1"])
+
+@pytest.mark.parametrize("lang", ["en", "es"])
+def test_pages_yield_rows(lang):
+    assert len(rows(PAGES["synthetic"], lang, "stream")) == 500
+    assert rows(EDGE_CASES["odd cards"], lang, "stream")
+
+def test_watch_fallback_is_spanish_only():
+    assert rows(EDGE_CASES["watch links only"], "en", "stream") == []
+    assert [r["id"] for r in rows(EDGE_CASES["watch links only"], "es", "stream")] == ["123", "456"]
+
+def test_parse_html_is_the_same_pipeline():
+    assert parse_html(PAGES["odd cards"], get_profile("es")) == rows(PAGES["odd cards"], "es", "stream")
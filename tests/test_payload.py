@@ -0,0 +1,24 @@
+import json, shutil, subprocess
+import pytest
+from flix2flix.payload import DECODER_JS, MAX_SAFE_INTEGER, ColumnarPayload
+
+NODE = shutil.which("node") or shutil.which("nodejs")
+IDS = ["80000001", "0", "007", "", "9007199254740991", "9007199254740992", "123456789012345678901", "-5", "١٢"]
+
+def payload():
+    p = ColumnarPayload({"id": "int", "url": "url"})
+    for vid in IDS:
+        p.add({"id": vid, "url": f"https://www.netflix.com/watch/{vid}" if vid else ""})
+    return p
+
+def test_only_safe_integers_become_numbers():
+    ids = payload().to_dict()["cols"]["id"]
+    assert ids == [80000001, 0, "007", "", MAX_SAFE_INTEGER, "9007199254740992", "123456789012345678901", "-5", "١٢"]
+
+@pytest.mark.skipif(NODE is None, reason="node not installed")
+def test_ids_and_urls_survive_json_parse():
+    js = DECODER_JS + "const d = decodePayload(JSON.parse(%s));\n" % json.dumps(payload().to_json())
+    js += "console.log(JSON.stringify(Array.from({length: d.n}, (_, i) => [String(d.col('id')[i]), d.url('url', i)])));"
+    run = subprocess.run([NODE, "-e", js], capture_output=True, text=True, timeout=60)
+    assert run.returncode == 0, run.stderr
+    assert json.loads(run.stdout) == [[v, f"https://www.netflix.com/watch/{v}" if v else ""] for v in IDS]
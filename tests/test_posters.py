@@ -0,0 +1,82 @@
+import hashlib, json, threading
+import pytest
+from benchmarks.bench_posters import StandIn, make_jpeg
+from flix2flix import posters
+from flix2flix.posters import INDEX_NAME, VALIDATORS_NAME, PosterCache, url_key
+
+PILLOW = pytest.mark.skipif(posters.Image is None, reason="Pillow not installed")
+
+@pytest.fixture
+def server():
+    srv = StandIn({f"/k/{i}.jpg": make_jpeg(i % 3, size=(640, 360)) for i in range(6)}, latency=0)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    srv.origin = f"http://127.0.0.1:{srv.server_address[1]}"
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+def items(server, missing=1):
+    out = [{"id": str(i), "image_url": f"{server.origin}/k/{i}.jpg?r={i % 2}"} for i in range(6)]
+    return out + [{"id": f"x{i}", "image_url": f"{server.origin}/k/missing{i}.jpg"} for i in range(missing)]
+
+def run(server, cache_dir, **kw):
+    server.requests = server.connections = server.not_modified = 0
+    cache = PosterCache(cache_dir, jobs=kw.pop("jobs", 3), **kw)
+    return cache, list(cache.localize(items(server), cache_dir.parent))
+
+def test_cold_then_warm(server, tmp_path):
+    cache_dir = tmp_path / "posters"
+    cache, out = run(server, cache_dir)
+    assert (cache.fetched, cache.cached, cache.failed) == (6, 0, 1)
+    assert [it["id"] for it in out] == ["0", "1", "2", "3", "4", "5", "x0"]
+    assert all(it["image_local"].startswith("posters/") for it in out[:6]) and "image_local" not in out[6]
+    assert server.connections <= 3  # one kept-alive connection per worker
+    index = json.loads((cache_dir / INDEX_NAME).read_text(encoding="utf-8"))
+    assert sorted(index) == sorted(f"{cache.variant} {url_key(it['image_url'])}" for it in out[:6])
+    assert out[0]["image_local"] == out[3]["image_local"]  # same image, same file
+    assert len({it["image_local"] for it in out[:6]}) == 3
+    warm, again = run(server, cache_dir)
+    assert (warm.fetched, warm.cached, warm.failed) == (0, 6, 1) and server.requests == 1  # only the failure
+    assert again == out
+
+@PILLOW
+def test_thumbnails_are_content_addressed_webp(server, tmp_path):
+    cache, out = run(server, tmp_path / "posters", width=160)
+    assert cache.variant == "webp160q75"
+    for it in out[:6]:
+        path = tmp_path / it["image_local"]
+        data = path.read_bytes()
+        assert path.name == hashlib.sha256(data).hexdigest()[:32] + ".webp"
+        with posters.Image.open(path) as im:
+            assert im.format == "WEBP" and im.size == (160, 90)
+    other, out2 = run(server, tmp_path / "posters", width=200)  # another size: other files
+    assert other.fetched == 6 and not {it["image_local"] for it in out[:6]} & {it["image_local"] for it in out2[:6]}
+
+def test_refresh_sends_conditional_requests(server, tmp_path):
+    cache_dir = tmp_path / "posters"
+    _, out = run(server, cache_dir)
+    validators = json.loads((cache_dir / VALIDATORS_NAME).read_text(encoding="utf-8"))
+    assert len(validators) == 6 and all(etag.startswith('"') for etag, _ in validators.values())
+    before = sorted(p.name for p in cache_dir.iterdir())
+    cache, again = run(server, cache_dir, refresh=True)
+    assert server.not_modified == 6 and (cache.fetched, cache.revalidated, cache.failed) == (0, 6, 1)
+    assert again == out and sorted(p.name for p in cache_dir.iterdir()) == before
+
+def test_refresh_downloads_a_changed_poster(server, tmp_path):
+    cache_dir = tmp_path / "posters"
+    _, out = run(server, cache_dir)
+    server.images["/k/0.jpg"] = make_jpeg(7, size=(640, 360))
+    cache, again = run(server, cache_dir, refresh=True)
+    assert server.not_modified == 5 and (cache.fetched, cache.revalidated) == (1, 5)
+    assert again[0]["image_local"] != out[0]["image_local"] and again[1:] == out[1:]
+    assert (tmp_path / again[0]["image_local"]).exists()
+
+def test_failures_keep_what_is_cached(server, tmp_path):
+    cache_dir = tmp_path / "posters"
+    _, out = run(server, cache_dir)
+    del server.images["/k/1.jpg"]
+    cache, again = run(server, cache_dir, refresh=True)  # a 404 on revalidation keeps the cached file
+    assert (cache.revalidated, cache.failed) == (5, 2) and again[1]["image_local"] == out[1]["image_local"]
+    (tmp_path / out[2]["image_local"]).unlink()  # shared by items 2 and 5: both are fetched again
+    cache, again = run(server, cache_dir)
+    assert (cache.fetched, cache.cached, cache.failed) == (2, 4, 1) and again == out
@@ -0,0 +1,50 @@
+import json, shutil, subprocess
+import pytest
+from flix2flix import get_profile
+from flix2flix.seen import seen_js, store_name
+from flix2flix.viewer import write_viewer_html
+
+EN, ES = get_profile("en"), get_profile("es")
+NODE = shutil.which("node") or shutil.which("nodejs")
+
+def test_every_viewer_file_has_its_own_store(tmp_path):
+    names = {store_name(str(tmp_path / "a.html"), EN), store_name(str(tmp_path / "b.html"), EN),
+             store_name(str(tmp_path / "a.html"), ES)}
+    assert len(names) == 3
+    rows = [{"title": "Dark", "id": "1", "url": "", "seen": ""}]
+    for name in ("ana.html", "bea.html"):
+        write_viewer_html(rows, tmp_path / name, EN)
+    ana, bea = ((tmp_path / n).read_text(encoding="utf-8") for n in ("ana.html", "bea.html"))
+    assert json.dumps(store_name(str((tmp_path / "ana.html").resolve()), EN)) in ana
+    assert ana != bea
+
+# openSeenStore under Node: no IndexedDB there, so it runs on the localStorage fallback
+HARNESS = r"""
+const box = {};
+globalThis.localStorage = {getItem: k => box[k] ?? null, setItem: (k, v) => { box[k] = v; },
+                           removeItem: k => { delete box[k]; }};
+globalThis.window = {addEventListener() {}};
+globalThis.document = {addEventListener() {}, getElementById: () => null};
+const open = {};
+%s
+const got = [];
+(async () => {
+  const a = await open.ana(), b = await open.bea();
+  a.set("1", true, false); a.flush();
+  got.push(b.get("1", false) ?? null);        // another viewer's store
+  got.push((await open.ana()).get("1", false));  // this viewer, reloaded
+  const c = await open.ana();
+  got.push(c.get("1", true) ?? null);  // regenerated with the title seen: the file wins
+  c.flush();
+  got.push((await open.ana()).get("1", false) ?? null);  // and the old mark is gone
+  console.log(JSON.stringify(got));
+})();
+"""
+
+@pytest.mark.skipif(NODE is None, reason="node not installed")
+def test_stores_are_separate_and_the_file_wins_once_changed():
+    opener = "open.%s = () => { %s; return openSeenStore(); };"
+    js = HARNESS % "\n".join(opener % (name, seen_js(name)) for name in ("ana", "bea"))
+    run = subprocess.run([NODE, "-e", js], capture_output=True, text=True, timeout=60)
+    assert run.returncode == 0, run.stderr
+    assert json.loads(run.stdout) == [None, True, None, None]
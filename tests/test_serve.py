@@ -0,0 +1,118 @@
+import json, threading
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+import pytest
+from flix2flix import get_profile
+from flix2flix.serve import API, CatalogProgress, CsvProgress, SeenState, SyncServer, Writer
+from flix2flix.store import CatalogStore
+
+ROWS = [{"title": "Taxi", "id": "1", "url": "", "seen": ""},
+        {"title": "Taxi again", "id": "1", "url": "", "seen": ""},
+        {"title": "No id", "id": "", "url": "", "seen": "1"}]
+
+@pytest.fixture
+def progress(tmp_path):
+    path = tmp_path / "list.csv"
+    path.write_text("title,id,url,seen,note\nTaxi,1,,,keep me\nTaxi again,1,,,\nNo id,,,1,\n", encoding="utf-8")
+    return path
+
+@pytest.fixture
+def server(tmp_path, progress):
+    posters = tmp_path / "posters"
+    posters.mkdir()
+    (posters / "abc.webp").write_bytes(b"RIFF")
+    (posters / "index.json").write_text("{}")
+    srv = SyncServer(CsvProgress(progress, get_profile("en")), get_profile("en"), port=0, posters=posters)
+    thread = threading.Thread(target=srv.httpd.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.httpd.shutdown()
+    srv.close()
+
+def status(url, data=None, headers=None):
+    try:
+        with urlopen(Request(url, data=data, headers=headers or {}), timeout=5) as r:
+            return r.status, r.read()
+    except HTTPError as e:
+        return e.code, b""
+
+def test_serves_only_the_viewer_api_and_posters(server):
+    base = server.url
+    assert status(base)[0] == 200
+    assert status(base + API.lstrip("/") + "?since=0")[0] == 200
+    assert status(base + "posters/abc.webp") == (200, b"RIFF")
+    assert status(base + "?C=M")[1] == status(base)[1]  # the viewer, not a directory listing
+    for path in ("list.csv", "posters/", "posters/index.json", "posters/..%2Flist.csv",
+                 "posters/../list.csv", "posters", "index.html/../list.csv"):
+        assert status(base + path)[0] == 404, path
+
+def test_toggles_are_written_back_keeping_other_columns(server, progress):
+    body = json.dumps({"changes": {"1": True, "No id": False, "unknown": True}}).encode()
+    assert status(server.url + API.lstrip("/"), body)[0] == 200
+    server.httpd.shutdown()
+    server.close()  # saves what is pending
+    assert progress.read_text(encoding="utf-8").splitlines() == [
+        "title,id,url,seen,note", "Taxi,1,,1,keep me", "Taxi again,1,,1,", "No id,,,,"]
+
+def test_posts_from_other_origins_are_refused(server):
+    api, body = server.url + API.lstrip("/"), json.dumps({"changes": {"1": True}}).encode()
+    assert status(api, body, {"Origin": "https://evil.example"})[0] == 403
+    assert status(api, body, {"Origin": "null"})[0] == 403  # sandboxed iframes, data: pages
+    assert status(api, body, {"Origin": server.url.rstrip("/")})[0] == 200
+
+def test_cached_posters_are_served_locally(tmp_path):
+    from flix2flix.posters import PosterCache
+    posters = tmp_path / "posters"
+    posters.mkdir()
+    (posters / "abc.webp").write_bytes(b"RIFF")
+    cache = PosterCache(posters)
+    cache.index[f"{cache.variant} img.test/a.jpg"] = "abc.webp"
+    cache.index[f"{cache.variant} img.test/gone.jpg"] = "gone.webp"
+    cache.save_index()
+    rows = [{"titulo": t, "id": str(i), "image_url": f"https://img.test/{t}.jpg?r=1", "visto": ""}
+            for i, t in enumerate(["a", "gone", "b"])]
+    state = SeenState(rows, get_profile("es"), posters=posters)
+    assert [it.get("image_local") for it in state.items] == ["/posters/abc.webp", None, None]
+    page = state.page()
+    assert b'"prefixes":["/posters/"' in page and b'"abc.webp"' in page
+
+def test_seen_state_versions():
+    state = SeenState([dict(r) for r in ROWS], get_profile("en"))
+    assert state.apply({"1": True, "No id": True, "x": True, "bad": "yes"}) == {"1": True}
+    assert state.since(0, state.boot) == {"version": 1, "changes": {"1": True}}
+    assert state.since(1, state.boot)["changes"] == {}
+    assert state.since(0, "another boot") == {"reload": True}
+    assert [r["seen"] for r in state.items] == ["1", "1", "1"]
+
+def test_writer_coalesces_a_burst():
+    saved = []
+    class Target:
+        def save(self, changes, rows_by_key): saved.append(dict(changes))
+        def close(self): pass
+    writer = Writer(Target(), {}, delay=0.2)
+    writer.start()
+    for i in range(5): writer.submit({str(i): True})
+    writer.submit({"0": False})
+    writer.close()
+    assert saved == [{"0": False, "1": True, "2": True, "3": True, "4": True}]
+
+def test_csv_progress_adds_a_missing_seen_column(tmp_path):
+    path = tmp_path / "lista.csv"
+    path.write_text("titulo,id\nCafé,7\n", encoding="utf-8-sig")
+    target = CsvProgress(path, get_profile("es"))
+    items = target.load()
+    target.save({"7": True}, {"7": [0]})
+    assert items[0]["titulo"] == "Café"
+    assert path.read_text(encoding="utf-8-sig").splitlines() == ["titulo,id,visto", "Café,7,1"]
+
+def test_catalog_progress_save(tmp_path):
+    profile = get_profile("en")
+    db = tmp_path / "mylist.db"
+    with CatalogStore(db) as store:
+        store.sync([ROWS[0], {"title": "Dark", "id": "2", "url": "", "seen": ""}], account="ana")
+    target = CatalogProgress(db, "ana", profile)
+    state = SeenState(target.load(), profile)
+    target.save(state.apply({"2": True}), state.rows_by_key)
+    target.close()
+    with CatalogStore(db) as store:
+        assert {it["id"]: it["seen"] for it in store.iter_items("ana")} == {"1": "", "2": "1"}
@@ -0,0 +1,78 @@
+import csv
+import pytest
+from flix2flix.store import CatalogStore, seen_value
+
+def row(title, vid, seen=""):
+    return {"title": title, "id": vid, "url": f"https://www.netflix.com/watch/{vid}", "seen": seen}
+
+@pytest.fixture
+def store(tmp_path):
+    with CatalogStore(tmp_path / "mylist.db") as s:
+        yield s
+
+def test_first_sync_adds_everything_once(store):
+    stats = store.sync([row("A", "1", "1"), row("B", "2"), row("A again", "1"), {"title": "", "id": ""}])
+    assert (stats.added, stats.unchanged, stats.removed) == (2, 0, 0)
+    assert [(it["id"], it["seen"], it["removed"]) for it in store.iter_items()] == [("1", "1", ""), ("2", "", "")]
+
+def test_resync_keeps_seen_and_flags_removed(store):
+    store.sync([row("A", "1"), row("B", "2"), row("C", "3")])
+    store.set_seen_many({"1": True, "2": True})
+
+    stats = store.sync([row("A renamed", "1"), row("B", "2", "0"), row("D", "4")])
+
+    assert (stats.added, stats.unchanged, stats.removed) == (1, 2, 1)
+    got = {it["id"]: (it["title"], it["seen"], it["removed"]) for it in store.iter_items()}
+    assert got == {"1": ("A renamed", "1", ""), "2": ("B", "", ""), "3": ("C", "", "1"), "4": ("D", "", "")}
+    assert [it["id"] for it in store.iter_items(include_removed=False)] == ["1", "2", "4"]
+
+def test_removed_titles_come_back(store):
+    store.sync([row("A", "1"), row("B", "2")])
+    store.sync([row("A", "1")])
+    stats = store.sync([row("A", "1"), row("B", "2")])
+    assert stats.restored == 1 and store.get("2")["removed"] == ""
+
+def test_accounts_are_separate(store):
+    store.sync([row("A", "1"), row("B", "2")], account="ana")
+    store.sync([row("B", "2", "1")], account="bea")
+    assert store.accounts() == ["ana", "bea"]
+    assert store.get("2", account="ana")["seen"] == "" and store.get("2", account="bea")["seen"] == "1"
+    assert store.get("1", account="bea") is None
+
+def test_batches_larger_than_the_parameter_limit(store):
+    items = [row(f"T{i}", str(i)) for i in range(2500)]
+    assert store.sync(items, batch_size=1200).added == 2500
+    assert store.sync(items[:1000], batch_size=1200).removed == 1500
+
+def test_spanish_schema_round_trips(tmp_path):
+    with CatalogStore(tmp_path / "es.db", seen_field="visto", removed_field="eliminado", title_field="titulo") as s:
+        s.sync([{"titulo": "Café", "id": "7", "url": "", "rank": "3", "visto": "sí"}])
+        assert list(s.iter_items()) == [{"titulo": "Café", "id": "7", "url": "", "rank": "3", "visto": "1",
+                                         "eliminado": ""}]
+
+@pytest.mark.parametrize("value, expected", [("", None), (None, None), ("1", 1), ("Sí", 1), ("x", 1), ("0", 0),
+                                             ("no", 0)])
+def test_seen_value(value, expected):
+    assert seen_value(value) == expected
+
+def test_synced_with_one_profile_exported_with_the_other(tmp_path):
+    db = tmp_path / "mylist.db"
+    with CatalogStore(db, seen_field="visto", removed_field="eliminado", title_field="titulo") as s:
+        s.sync([{"titulo": "Café", "id": "7", "url": "u7", "visto": "1"}])
+    with CatalogStore(db) as s:
+        it = s.get("7")
+        assert (it["title"], it["id"], it["url"], it["seen"], it["removed"]) == ("Café", "7", "u7", "1", "")
+        s.sync([row("Dark", "8")], account="en")
+    with CatalogStore(db, seen_field="visto", removed_field="eliminado", title_field="titulo") as s:
+        assert s.get("8", account="en")["titulo"] == "Dark"
+
+def test_cli_export_in_the_other_language(tmp_path):
+    from benchmarks import synth_mylist
+    from flix2flix.cli import main
+    page, db, out = tmp_path / "lista.html", tmp_path / "mylist.db", tmp_path / "list.csv"
+    page.write_text("".join(synth_mylist.iter_page(4)), encoding="utf-8")
+    main("es", [str(page), "--db", str(db), "--no-cache", "--viewer-out", str(tmp_path / "es.html")])
+    main("en", ["--db", str(db), "--export-csv", "--out", str(out), "--viewer-out", str(tmp_path / "en.html")])
+    with open(out, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 4 and all(r["title"] and r["id"] for r in rows)
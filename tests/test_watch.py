@@ -0,0 +1,94 @@
+import csv, os
+from benchmarks import synth_mylist
+from flix2flix.cli import main
+from flix2flix.watch import FolderWatch, WatchState
+
+def page(n, seed=0):
+    return "".join(synth_mylist.iter_page(n, seed=seed))
+
+def touch(path, text, mtime=None):
+    path.write_text(text, encoding="utf-8")
+    if mtime is not None: os.utime(path, (mtime, mtime))
+
+def test_files_are_handed_out_once_settled(tmp_path):
+    watch = FolderWatch(tmp_path, settle=5, inotify=False)
+    a = tmp_path / "a.html"
+    touch(a, "<html>", 1000)
+    (tmp_path / "notes.txt").write_text("x")
+    assert watch.changes(0) == ([], []) and a in watch.pending
+    assert watch.changes(4) == ([], [])
+    touch(a, "<html><body>", 1001)  # still being written: the clock starts again
+    assert watch.changes(6) == ([], [])
+    assert watch.changes(11) == ([a], [])
+    assert watch.changes(20) == ([], []) and not watch.pending
+
+def test_changed_recheck_and_removed(tmp_path):
+    watch = FolderWatch(tmp_path, settle=0, inotify=False)
+    a = tmp_path / "a.html"
+    touch(a, "<html>", 1000)
+    watch.changes(0)
+    assert watch.changes(0) == ([a], [])
+    touch(a, "<html> again", 1001)
+    watch.changes(1)
+    assert watch.changes(1) == ([a], [])
+    watch.recheck([a])
+    watch.changes(2)
+    assert watch.changes(2) == ([a], [])
+    a.unlink()
+    assert watch.changes(3) == ([], [a])
+    assert watch.changes(4) == ([], [])
+
+def test_a_file_deleted_before_it_settles_is_dropped(tmp_path):
+    watch = FolderWatch(tmp_path, settle=5, inotify=False)
+    a = tmp_path / "a.html"
+    touch(a, "<html>")
+    watch.changes(0)
+    a.unlink()
+    assert watch.changes(1) == ([], []) and not watch.pending
+
+def test_state_round_trip_and_copies(tmp_path):
+    a, b = tmp_path / "a.html", tmp_path / "b.html"
+    state = WatchState(tmp_path / "state" / "watch.json")
+    state.record(a, "d1")
+    state.merged.append("d0")
+    state.save()
+
+    state = WatchState.load(tmp_path / "state" / "watch.json")
+    assert state.processed(a, "d1") and not state.processed(a, "d2")
+    assert state.processed(b, "d1")  # a copy of a
+    assert not state.processed(b, "d0") and state.processed(b, "d0", merged=True)
+    assert state.forget(a) and not state.forget(a)
+    assert not state.processed(b, "d1")
+
+def test_state_ignores_other_versions(tmp_path):
+    path = tmp_path / "watch.json"
+    path.write_text('{"version": 0, "files": {"x": "d"}}')
+    assert WatchState.load(path).files == {}
+    path.write_text("{broken")
+    assert WatchState.load(path).files == {}
+
+def run_once(folder, out, state):
+    main("en", ["watch", str(folder), "--once", "--settle", "0", "--poll", "0.01", "--jobs", "1", "--no-cache",
+                "--out", str(out), "--viewer-out", str(out.with_suffix(".html")), "--state", str(state)])
+    if not out.exists(): return None
+    with open(out, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+def test_watch_once_reprocesses_only_what_changed(tmp_path, capsys):
+    folder, out, state = tmp_path / "in", tmp_path / "list.csv", tmp_path / "watch.json"
+    folder.mkdir()
+    touch(folder / "a.html", page(3, seed=1))
+    touch(folder / "b.html", page(2, seed=2))
+    touch(folder / "copy.html", page(3, seed=1))
+    rows = run_once(folder, out, state)
+    assert len(rows) == 5 and {r["source_file"] for r in rows} == {str(folder / "a.html"), str(folder / "b.html")}
+    assert "copy.html: already processed" in capsys.readouterr().out
+
+    out.unlink()
+    assert run_once(folder, out, state) is None  # nothing new since the last run
+    assert "0 files processed" in capsys.readouterr().out
+
+    touch(folder / "b.html", page(4, seed=3))
+    (folder / "a.html").unlink()
+    rows = run_once(folder, out, state)  # the copy of the deleted a.html takes its place
+    assert len(rows) == 7 and {r["source_file"] for r in rows} == {str(folder / "b.html"), str(folder / "copy.html")}